@@ -1,8 +1,25 @@
+import hashlib
+import itertools
 import json
+import logging
 import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, replace
+from functools import partial
 from pathlib import Path
-from threading import Lock
-from typing import Any, Dict, List, Optional
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Generic, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from . import snapshot_file, spatial
+from .records import Alert, Destination, Record, ScrapedPost, Spot
+from .search import SearchDocument, SearchIndex
+from .spatial import SpatialIndex, SpotPoint
+from .spot_columns import SpotColumns
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 
 def _default_data_dir() -> Path:
@@ -20,61 +37,577 @@ def _default_data_dir() -> Path:
 
 
 DATA_DIR = Path(os.getenv("TRAVEL_DATA_DIR", _default_data_dir()))
+SNAPSHOT_PATH = Path(os.getenv("TRAVEL_DATA_SNAPSHOT", DATA_DIR / "snapshot.bin"))
+SPOT_SHARD_DIR = DATA_DIR / "spots"
+SPOT_SHARD_CACHE_SIZE = int(os.getenv("TRAVEL_SPOT_SHARD_CACHE", "32"))
+# "memory" (JSON parsed into RAM) or "sqlite" (see backend/sqlite_store.py).
+DATA_BACKEND = os.getenv("TRAVEL_DATA_BACKEND", "memory").lower()
+DATABASE_PATH = Path(os.getenv("TRAVEL_DATA_DB", DATA_DIR / "travel.db"))
+
+# Destination served by the legacy shimla_spots.json when it has no shard.
+LEGACY_SPOTS_DESTINATION = "shimla"
+
+# Collection name -> file under DATA_DIR that feeds it.
+SOURCE_FILES: Dict[str, str] = {
+    "spots": "shimla_spots.json",
+    "blog_posts": "scraped/blog_posts.json",
+    "insta_posts": "scraped/insta_posts.json",
+    "alerts": "scraped/alerts.json",
+    "destinations": "destinations_catalog.json",
+}
+
+RECORD_TYPES: Dict[str, Type[Record]] = {
+    "spots": Spot,
+    "blog_posts": ScrapedPost,
+    "insta_posts": ScrapedPost,
+    "alerts": Alert,
+    "destinations": Destination,
+}
+
+# Scraped feeds in admin display order, with the sourceType label for each.
+SCRAPED_SOURCES: Tuple[Tuple[str, str], ...] = (
+    ("blog_posts", "blog"),
+    ("insta_posts", "instagram"),
+    ("alerts", "alert"),
+)
+
+# Scraped feeds covered by the full-text search index.
+SEARCH_FEEDS: Tuple[str, ...] = ("blog_posts", "insta_posts")
+
+# Scraped feed -> key it is returned under by /api/admin/scraped.
+SCRAPED_FEED_KEYS: Dict[str, str] = {
+    "blog_posts": "blogs",
+    "insta_posts": "insta",
+    "alerts": "alerts",
+}
+
+
+@dataclass(frozen=True)
+class SourceState:
+    """Fingerprint of a source file as of its last successful parse."""
+
+    mtime_ns: int
+    size: int
+    digest: str
+
+
+@dataclass(frozen=True)
+class SourceData:
+    """One parsed source file plus the indexes derived from it alone."""
+
+    records: List[Record]
+    state: SourceState
+    indexes: Dict[str, Any] = field(default_factory=dict)
+
+
+_EMPTY_SOURCE = SourceData(records=[], state=SourceState(0, 0, ""))
+
+_CATALOG_VERSIONS = itertools.count(1)
+
+
+def next_catalog_version() -> int:
+    """A catalog version no store in this process has handed out yet."""
+    return next(_CATALOG_VERSIONS)
+
+
+class Lazy(Generic[T]):
+    """Value materialized on first ``get()``, under its own lock.
+
+    Each collection gets its own ``Lazy`` so loading the blog feed never
+    waits behind the catalog, and snapshots can share unchanged ones.
+    """
+
+    __slots__ = ("_loader", "_lock", "_value", "_resident")
 
+    def __init__(self, loader: Callable[[], T]) -> None:
+        self._loader: Optional[Callable[[], T]] = loader
+        self._lock = Lock()
+        self._value: Optional[T] = None
+        self._resident = False
+
+    @classmethod
+    def of(cls, value: T) -> "Lazy[T]":
+        lazy: Lazy[T] = cls(lambda: value)
+        lazy.get()
+        return lazy
+
+    @property
+    def resident(self) -> bool:
+        return self._resident
+
+    def get(self) -> T:
+        if not self._resident:
+            with self._lock:
+                if not self._resident:
+                    assert self._loader is not None
+                    self._value = self._loader()
+                    self._resident = True
+                    self._loader = None
+        return self._value  # type: ignore[return-value]
+
+
+def _stat_source(path: Path) -> os.stat_result:
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Mock data file missing: {path}") from None
+
+
+def _read_file(path: Path) -> Tuple[bytes, SourceState]:
+    stat = _stat_source(path)
+    raw = path.read_bytes()
+    return raw, SourceState(stat.st_mtime_ns, len(raw), hashlib.sha256(raw).hexdigest())
+
+
+def _read_source(name: str) -> Tuple[bytes, SourceState]:
+    return _read_file(DATA_DIR / SOURCE_FILES[name])
+
+
+def _parse_source(name: str, raw: bytes, state: SourceState) -> SourceData:
+    records = RECORD_TYPES[name].from_list(json.loads(raw))
+    return SourceData(records=records, state=state, indexes=_build_indexes(name, records))
 
-def _load_json(path: Path) -> Any:
+
+def _load_source(name: str) -> SourceData:
+    return _parse_source(name, *_read_source(name))
+
+
+def _compiled_state(path: Path, state: SourceState) -> Optional[SourceState]:
+    """``state`` (with the file's mtime) if ``path`` still holds that content.
+
+    None if the file moved on. A missing file keeps ``state``, so deploys
+    can ship the compiled snapshot alone.
+    """
     if not path.exists():
-        raise FileNotFoundError(f"Mock data file missing: {path}")
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+        return state
+    stat = path.stat()
+    if stat.st_size != state.size:
+        return None
+    if stat.st_mtime_ns != state.mtime_ns:
+        # Same size but touched (e.g. fresh checkout): compare content.
+        if hashlib.sha256(path.read_bytes()).hexdigest() != state.digest:
+            return None
+        state = replace(state, mtime_ns=stat.st_mtime_ns)
+    return state
 
 
-class DataStore:
-    """In-memory cache for mock travel data with lightweight mutation helpers."""
+def _load_compiled_section(
+    compiled: snapshot_file.CompiledSnapshot, name: str, state: SourceState
+) -> SourceData:
+    # The file may have been edited since startup; the compiled copy only
+    # stands in for it while the content still matches.
+    current = _compiled_state(DATA_DIR / SOURCE_FILES[name], state)
+    if current is None:
+        return _load_source(name)
+    return replace(compiled.load(name), state=current)
+
+
+def _normalize_destination_key(value: str) -> str:
+    return value.replace("_", "-").replace(" ", "-").lower()
+
+
+def _index_destinations(destinations: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    index: Dict[str, Dict[str, Any]] = {}
+    for record in destinations:
+        index[record["id"]] = record
+        index[_normalize_destination_key(record["name"])] = record
+    return index
 
-    def __init__(self) -> None:
+
+def _index_spots(spots: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    index: Dict[str, Dict[str, Any]] = {}
+    for spot in spots:
+        # First match wins, mirroring the old linear scan.
+        index.setdefault(spot["name"].lower(), spot)
+        index.setdefault(spot["id"].lower(), spot)
+    return index
+
+
+def _group_by_destination(records: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Bucket feed records under both their destinationId and destination keys."""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        keys = {record.get("destinationId"), record.get("destination")}
+        for key in keys:
+            if key:
+                groups.setdefault(key, []).append(record)
+    return groups
+
+
+def _tag_key(tag: str) -> str:
+    return tag.strip().lstrip("#").lower()
+
+
+def _build_indexes(name: str, records: List[Record]) -> Dict[str, Any]:
+    if name == "destinations":
+        return {"destination_index": _index_destinations(records)}
+    if name == "spots":
+        return {"spot_index": _index_spots(records), "columns": SpotColumns(records)}
+    return {"by_destination": _group_by_destination(records)}
+
+
+def _index_scraped(
+    feeds: Dict[str, List[Dict[str, Any]]]
+) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+    index: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    for name, source in SCRAPED_SOURCES:
+        for item in feeds[name]:
+            index.setdefault(item["id"], (source, item))
+    return index
+
+
+def _lazy_scraped_index(sources: Dict[str, Lazy[SourceData]]) -> Lazy[Dict[str, Any]]:
+    # The id index spans all three feeds, so it is derived per snapshot
+    # rather than stored with any one source.
+    return Lazy(
+        lambda: _index_scraped(
+            {name: sources[name].get().records for name, _ in SCRAPED_SOURCES}
+        )
+    )
+
+
+def _search_posts(
+    feeds: Dict[str, List[Record]]
+) -> Iterator[Tuple[SearchDocument, Record]]:
+    for name, source in SCRAPED_SOURCES:
+        if name in SEARCH_FEEDS:
+            for post in feeds[name]:
+                destination = post.get("destinationId") or post.get("destination")
+                yield SearchDocument(source, destination, post), post
+
+
+def _lazy_search_index(sources: Dict[str, Lazy[SourceData]]) -> Lazy[SearchIndex]:
+    return Lazy(
+        lambda: SearchIndex(
+            _search_posts({name: sources[name].get().records for name in SEARCH_FEEDS})
+        )
+    )
+
+
+def _spot_points(destination_id: str, records: List[Record]) -> Iterator[SpotPoint]:
+    for position, spot in enumerate(records):
+        if spot.get("lat") is not None and spot.get("lng") is not None:
+            yield SpotPoint(spot["lat"], spot["lng"], destination_id, spot["id"], position)
+
+
+def _lazy_spatial_index(
+    sources: Dict[str, Lazy[SourceData]], shards: Optional["SpotShards"]
+) -> Lazy[SpatialIndex]:
+    # Covers the legacy spots file and every shard; shards are parsed once
+    # for the build without entering the LRU.
+    def build() -> SpatialIndex:
+        shard_ids = shards.ids() if shards is not None else []
+        points: List[SpotPoint] = []
+        states: Dict[str, Tuple[int, int]] = {}
+        for destination_id in shard_ids:
+            data = shards.peek(destination_id)  # type: ignore[union-attr]
+            if data is not None:
+                points.extend(_spot_points(destination_id, data.records))
+                states[destination_id] = (data.state.mtime_ns, data.state.size)
+        if LEGACY_SPOTS_DESTINATION not in shard_ids and "spots" in sources:
+            points.extend(
+                _spot_points(LEGACY_SPOTS_DESTINATION, sources["spots"].get().records)
+            )
+        return SpatialIndex(points, sources=states)
+
+    return Lazy(build)
+
+
+class SpotShards:
+    """Size-bounded LRU of per-destination spot files (``spots/<id>.json``).
+
+    Shards load on first request for their destination and the least
+    recently used ones are dropped once more than ``capacity`` are resident.
+    A shard cache belongs to the snapshots of one data version: ``refreshed``
+    never changes it, but returns a successor without the shards whose file
+    changed, which the store publishes with the next snapshot. Requests
+    pinned to an older snapshot keep reading the shards they had.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        capacity: int = SPOT_SHARD_CACHE_SIZE,
+        available: Optional[frozenset] = None,
+    ) -> None:
+        self.directory = directory
+        self.capacity = max(1, capacity)
         self._lock = Lock()
-        self.spots: List[Dict[str, Any]] = []
-        self.blog_posts: List[Dict[str, Any]] = []
-        self.insta_posts: List[Dict[str, Any]] = []
-        self.alerts: List[Dict[str, Any]] = []
-        self.destinations: List[Dict[str, Any]] = []
-        self._destination_index: Dict[str, Dict[str, Any]] = {}
-        self.tagged_hidden_gems: Dict[str, List[str]] = {}
-        self.refresh()
-
-    def refresh(self) -> None:
-        """Reload all mock files from disk."""
+        self._load_locks: Dict[str, Lock] = {}
+        self._resident: "OrderedDict[str, SourceData]" = OrderedDict()
+        self._available = self._scan() if available is None else available
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _scan(self) -> frozenset:
+        if not self.directory.is_dir():
+            return frozenset()
+        return frozenset(path.stem for path in self.directory.glob("*.json"))
+
+    def __contains__(self, destination_id: object) -> bool:
+        return destination_id in self._available
+
+    def ids(self) -> List[str]:
+        return sorted(self._available)
+
+    def peek(self, destination_id: str) -> Optional[SourceData]:
+        """Resident shard, or a one-off parse that is not cached or counted."""
+        if destination_id not in self._available:
+            return None
+        with self._lock:
+            data = self._resident.get(destination_id)
+        if data is None:
+            data = _parse_source("spots", *_read_file(self.directory / f"{destination_id}.json"))
+        return data
+
+    def get(self, destination_id: str) -> Optional[SourceData]:
+        """Resident or freshly loaded shard, or None when none exists."""
+        if destination_id not in self._available:
+            return None
+        with self._lock:
+            data = self._resident.get(destination_id)
+            if data is not None:
+                self._resident.move_to_end(destination_id)
+                self.hits += 1
+                return data
+            self.misses += 1
+            load_lock = self._load_locks.setdefault(destination_id, Lock())
+        with load_lock:
+            # Another thread may have loaded it while we waited.
+            with self._lock:
+                data = self._resident.get(destination_id)
+            if data is None:
+                raw, state = _read_file(self.directory / f"{destination_id}.json")
+                data = _parse_source("spots", raw, state)
+                with self._lock:
+                    self._resident[destination_id] = data
+                    while len(self._resident) > self.capacity:
+                        self._resident.popitem(last=False)
+                        self.evictions += 1
+        return data
+
+    def changed(self) -> Tuple[Tuple[str, int, int], ...]:
+        """Stat-only probe: added/removed shards and resident shards that moved."""
+        changed = [(f"spots/{name}", 0, 0) for name in self._scan() ^ self._available]
+        with self._lock:
+            resident = list(self._resident.items())
+        for name, data in resident:
+            path = self.directory / f"{name}.json"
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # reported by the directory diff above
+            if stat.st_mtime_ns != data.state.mtime_ns or stat.st_size != data.state.size:
+                changed.append((f"spots/{name}", stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(changed))
+
+    def refreshed(self, force: bool = False) -> Tuple[List[str], Optional["SpotShards"]]:
+        """Re-list shards and compare resident ones with their files.
+
+        Returns the changed ``spots/<id>`` names and, when anything differs,
+        the successor cache for the next snapshot (unchanged resident shards
+        carried over, changed ones left to reload). ``force`` drops them all.
+        """
+        available = self._scan()
+        changed = {f"spots/{name}" for name in available ^ self._available}
+        with self._lock:
+            resident = list(self._resident.items())
+        stale = set()
+        touched: Dict[str, SourceData] = {}
+        for name, data in resident:
+            path = self.directory / f"{name}.json"
+            if force or name not in available:
+                stale.add(name)
+                continue
+            stat = path.stat()
+            if stat.st_mtime_ns == data.state.mtime_ns and stat.st_size == data.state.size:
+                continue
+            raw, state = _read_file(path)
+            if state.digest != data.state.digest:
+                stale.add(name)
+            else:
+                touched[name] = replace(data, state=state)
+        if not changed and not stale and not touched:
+            return [], None
+        successor = SpotShards(self.directory, self.capacity, available)
+        with self._lock:
+            successor._resident = OrderedDict(
+                (name, touched.get(name, data))
+                for name, data in self._resident.items()
+                if name not in stale
+            )
+            successor.hits, successor.misses = self.hits, self.misses
+            successor.evictions = self.evictions
+        changed.update(f"spots/{name}" for name in stale)
+        return sorted(changed), successor
+
+    def stats(self) -> Dict[str, Any]:
         with self._lock:
-            self.spots = _load_json(DATA_DIR / "shimla_spots.json")
-            scraped_dir = DATA_DIR / "scraped"
-            self.blog_posts = _load_json(scraped_dir / "blog_posts.json")
-            self.insta_posts = _load_json(scraped_dir / "insta_posts.json")
-            self.alerts = _load_json(scraped_dir / "alerts.json")
-            catalog_path = DATA_DIR / "destinations_catalog.json"
-            self.destinations = _load_json(catalog_path)
-            self._destination_index = {}
-            for record in self.destinations:
-                self._destination_index[record["id"]] = record
-                normalized_name = self._normalize_destination_key(record["name"])
-                self._destination_index[normalized_name] = record
-            self.tagged_hidden_gems = {}
+            return {
+                "available": len(self._available),
+                "resident": list(self._resident),
+                "capacity": self.capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+@dataclass(frozen=True)
+class DataSnapshot:
+    """Immutable, fully indexed view of the mock data at one data version.
+
+    Snapshots are never mutated after publication: ``DataStore`` builds a new
+    one off to the side and swaps it in, so a request that pins a snapshot
+    sees catalog, spots, alerts and tags from the same version. Collections
+    are ``Lazy`` and materialize on first access; unchanged ones are shared
+    between consecutive snapshots.
+    """
+
+    version: int = 0
+    # Like ``version`` but unmoved by hidden gem tags: caches of results that
+    # never read the tags are keyed on it, so tagging does not flush them.
+    # Unique across stores in the process, since those caches are shared.
+    catalog_version: int = 0
+    sources: Dict[str, Lazy[SourceData]] = field(default_factory=dict)
+    scraped: Lazy[Dict[str, Tuple[str, Dict[str, Any]]]] = field(
+        default_factory=lambda: Lazy.of({})
+    )
+    tagged_hidden_gems: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    shards: Optional[SpotShards] = None
+    spatial: Lazy[SpatialIndex] = field(default_factory=lambda: Lazy.of(SpatialIndex(())))
+    search: Lazy[SearchIndex] = field(default_factory=lambda: Lazy.of(SearchIndex(())))
+
+    def snapshot(self) -> "DataSnapshot":
+        """Snapshots are already pinned; lets services accept either type."""
+        return self
+
+    def _data(self, name: str) -> SourceData:
+        lazy = self.sources.get(name)
+        return lazy.get() if lazy is not None else _EMPTY_SOURCE
+
+    def residency(self) -> Dict[str, bool]:
+        """Which collections have been materialized, without loading any."""
+        resident = {name: lazy.resident for name, lazy in self.sources.items()}
+        resident["scraped_index"] = self.scraped.resident
+        resident["spatial_index"] = self.spatial.resident
+        resident["search_index"] = self.search.resident
+        return resident
+
+    @property
+    def spots(self) -> List[Dict[str, Any]]:
+        return self._data("spots").records
+
+    @property
+    def blog_posts(self) -> List[Dict[str, Any]]:
+        return self._data("blog_posts").records
+
+    @property
+    def insta_posts(self) -> List[Dict[str, Any]]:
+        return self._data("insta_posts").records
+
+    @property
+    def alerts(self) -> List[Dict[str, Any]]:
+        return self._data("alerts").records
+
+    @property
+    def destinations(self) -> List[Dict[str, Any]]:
+        return self._data("destinations").records
+
+    @property
+    def destination_index(self) -> Dict[str, Dict[str, Any]]:
+        return self._data("destinations").indexes.get("destination_index", {})
+
+    @property
+    def spot_index(self) -> Dict[str, Dict[str, Any]]:
+        return self._data("spots").indexes.get("spot_index", {})
+
+    @property
+    def scraped_index(self) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        return self.scraped.get()
+
+    def _by_destination(self, name: str) -> Dict[str, List[Dict[str, Any]]]:
+        return self._data(name).indexes.get("by_destination", {})
 
     @property
     def scraped_items(self) -> List[Dict[str, Any]]:
         """Flatten scraped content for admin UI."""
         flattened: List[Dict[str, Any]] = []
-        for source, collection in [
-            ("blog", self.blog_posts),
-            ("instagram", self.insta_posts),
-            ("alert", self.alerts),
-        ]:
-            for item in collection:
+        for name, source in SCRAPED_SOURCES:
+            for item in getattr(self, name):
                 flattened.append({**item, "sourceType": source})
         return flattened
 
-    def _normalize_destination_key(self, value: str) -> str:
-        return value.replace("_", "-").replace(" ", "-").lower()
+    def get_scraped_item(self, item_id: str) -> Optional[Dict[str, Any]]:
+        entry = self.scraped_index.get(item_id)
+        if not entry:
+            return None
+        source, item = entry
+        return {**item, "sourceType": source}
+
+    def scraped_for_destination(self, destination: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Feed records whose destinationId or destination equals ``destination``."""
+        return {
+            "blogs": self._by_destination("blog_posts").get(destination, []),
+            "insta": self._by_destination("insta_posts").get(destination, []),
+            "alerts": self._by_destination("alerts").get(destination, []),
+        }
+
+    def query_scraped(
+        self,
+        destination: Optional[str] = None,
+        tag: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """Filter and page each scraped feed for the admin UI.
+
+        ``tag`` matches post tags case-insensitively, ``since`` keeps items
+        whose ISO timestamp is at or after it. Paging applies per feed; when
+        requested, per-feed match counts are returned under ``total``.
+        """
+        tag_key = _tag_key(tag) if tag else None
+        result: Dict[str, Any] = {}
+        totals: Dict[str, int] = {}
+        for name, key in SCRAPED_FEED_KEYS.items():
+            items = (
+                self._by_destination(name).get(destination, [])
+                if destination
+                else getattr(self, name)
+            )
+            if tag_key:
+                items = [
+                    item
+                    for item in items
+                    if any(_tag_key(value) == tag_key for value in item.get("tags") or ())
+                ]
+            if since:
+                items = [item for item in items if (item.get("timestamp") or "") >= since]
+            totals[key] = len(items)
+            result[key] = items[offset : offset + limit if limit is not None else None]
+        if limit is not None or offset:
+            result["total"] = totals
+        return result
+
+    def insta_post_geotagged(self, place: str) -> Optional[Dict[str, Any]]:
+        """First Instagram post geotagged with ``place``."""
+        return next(
+            (post for post in self.insta_posts if place in post.get("geoTags", [])), None
+        )
+
+    def search_posts(
+        self, query: str, destination: Optional[str] = None, k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Blog and Instagram posts best matching ``query`` (BM25), best first."""
+        return [
+            {**hit.document.ref, "sourceType": hit.document.source, "score": round(hit.score, 4)}
+            for hit in self.search.get().search(query, destination, k)
+        ]
+
+    def alerts_for(self, destination_id: str) -> List[Dict[str, Any]]:
+        return self._by_destination("alerts").get(destination_id, [])
 
     def list_destinations(self) -> List[Dict[str, Any]]:
         return self.destinations
@@ -82,31 +615,314 @@ class DataStore:
     def get_destination(self, identifier: str) -> Optional[Dict[str, Any]]:
         if not identifier:
             return None
-        normalized = self._normalize_destination_key(identifier)
-        return self._destination_index.get(normalized)
+        normalized = _normalize_destination_key(identifier)
+        return self.destination_index.get(normalized)
+
+    def get_spot_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.spot_index.get(name.strip().lower())
+
+    def _spot_data(self, destination_id: str) -> Optional[SourceData]:
+        shard = self.shards.get(destination_id) if self.shards is not None else None
+        if shard is not None:
+            return shard
+        if destination_id == LEGACY_SPOTS_DESTINATION:
+            return self._data("spots")
+        return None
+
+    def spots_for(self, destination_id: str) -> List[Dict[str, Any]]:
+        """Spots for one destination; empty when it has no spot data yet."""
+        data = self._spot_data(destination_id)
+        return data.records if data is not None else []
+
+    def spot_index_for(self, destination_id: str) -> Dict[str, Dict[str, Any]]:
+        data = self._spot_data(destination_id)
+        return data.indexes.get("spot_index", {}) if data is not None else {}
+
+    def spot_columns_for(self, destination_id: str) -> SpotColumns:
+        """Columnar scoring view of ``spots_for``, built when the shard loads."""
+        data = self._spot_data(destination_id)
+        if data is None:
+            return SpotColumns([])
+        columns = data.indexes.get("columns")
+        return columns if columns is not None else SpotColumns(data.records)
+
+    def spots_in_bbox(
+        self, min_lat: float, min_lng: float, max_lat: float, max_lng: float, limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        return spatial.spots_in_bbox(
+            self, self.spatial.get(), min_lat, min_lng, max_lat, max_lng, limit
+        )
+
+    def spots_nearby(
+        self, lat: float, lng: float, radius_km: float = 10.0, k: int = 10
+    ) -> List[Dict[str, Any]]:
+        return spatial.spots_nearby(self, self.spatial.get(), lat, lng, radius_km, k)
+
+
+class DataStore:
+    """In-memory cache for mock travel data with lightweight mutation helpers.
+
+    Readers call ``snapshot()`` once per request and work off that immutable
+    view without locking. Writers (``refresh`` and ``mark_hidden_gem``)
+    serialize on ``_lock``, build a replacement snapshot and publish it with a
+    single reference swap, bumping ``version`` each time.
+
+    Nothing is parsed at construction: each collection loads on first access
+    (``eager=True`` or ``warm()`` loads everything up front). ``refresh`` is
+    incremental: loaded files are fingerprinted by mtime, size and SHA-256,
+    and only files whose content changed are re-parsed. Parsing happens under
+    ``_refresh_lock`` so tagging is only blocked for the final swap.
+
+    A compiled snapshot at ``snapshot_path`` (see ``scripts/build_snapshot.py``)
+    is adopted when it matches the JSON files; its sections then stand in for
+    JSON parsing and index builds.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: Optional[Path] = SNAPSHOT_PATH,
+        eager: bool = False,
+        shard_capacity: int = SPOT_SHARD_CACHE_SIZE,
+    ) -> None:
+        self._lock = Lock()
+        self._refresh_lock = Lock()
+        self._compiled: Optional[snapshot_file.CompiledSnapshot] = None
+        shards = SpotShards(SPOT_SHARD_DIR, shard_capacity)
+        sources = self._open_compiled(snapshot_path) if snapshot_path else None
+        if sources is None:
+            sources = {name: Lazy(partial(_load_source, name)) for name in SOURCE_FILES}
+        self._snapshot = DataSnapshot(
+            version=1,
+            catalog_version=next_catalog_version(),
+            sources=sources,
+            scraped=_lazy_scraped_index(sources),
+            shards=shards,
+            spatial=_lazy_spatial_index(sources, shards),
+            search=_lazy_search_index(sources),
+        )
+        if eager:
+            self.warm()
+
+    def _open_compiled(self, path: Path) -> Optional[Dict[str, Lazy[SourceData]]]:
+        if not path.exists():
+            return None
+        try:
+            compiled = snapshot_file.CompiledSnapshot(path)
+        except Exception:  # any unreadable snapshot just means a JSON cold start
+            logger.warning("Ignoring unreadable compiled snapshot %s", path, exc_info=True)
+            return None
+        states = self._verify_sources(compiled.sources)
+        if states is None:
+            logger.info("Compiled snapshot %s is stale; loading JSON", path)
+            compiled.close()
+            return None
+        self._compiled = compiled
+        return {
+            name: Lazy(partial(_load_compiled_section, compiled, name, state))
+            for name, state in states.items()
+        }
+
+    def _verify_sources(self, recorded: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, SourceState]]:
+        """Match compiled fingerprints against disk; None if any source moved on.
+
+        Sources missing from disk are accepted so deploys can ship the
+        snapshot alone.
+        """
+        verified: Dict[str, SourceState] = {}
+        for name, relative in SOURCE_FILES.items():
+            if name not in recorded:
+                return None
+            state = _compiled_state(DATA_DIR / relative, SourceState(**recorded[name]))
+            if state is None:
+                return None
+            verified[name] = state
+        return verified
+
+    def compile_snapshot(self, path: Path = SNAPSHOT_PATH) -> int:
+        """Write the current data and indexes as a compiled snapshot."""
+        with self._refresh_lock:
+            current = self._snapshot
+            sections = {name: lazy.get() for name, lazy in current.sources.items()}
+            sources = {name: asdict(data.state) for name, data in sections.items()}
+            return snapshot_file.write(path, sections, sources)
+
+    def warm(self) -> None:
+        """Materialize every collection and index now instead of on demand."""
+        current = self._snapshot
+        for lazy in current.sources.values():
+            lazy.get()
+        current.scraped.get()
+        current.spatial.get()
+        current.search.get()
+
+    def snapshot(self) -> DataSnapshot:
+        """Return the current snapshot; hold on to it for a consistent view."""
+        return self._snapshot
+
+    def residency(self) -> Dict[str, bool]:
+        return self._snapshot.residency()
+
+    @property
+    def shards(self) -> SpotShards:
+        """Shard cache of the current snapshot."""
+        return self._snapshot.shards  # type: ignore[return-value]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", "spotShards": self.shards.stats()}
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    @property
+    def spots(self) -> List[Dict[str, Any]]:
+        return self._snapshot.spots
+
+    @property
+    def blog_posts(self) -> List[Dict[str, Any]]:
+        return self._snapshot.blog_posts
+
+    @property
+    def insta_posts(self) -> List[Dict[str, Any]]:
+        return self._snapshot.insta_posts
+
+    @property
+    def alerts(self) -> List[Dict[str, Any]]:
+        return self._snapshot.alerts
+
+    @property
+    def destinations(self) -> List[Dict[str, Any]]:
+        return self._snapshot.destinations
+
+    @property
+    def tagged_hidden_gems(self) -> Dict[str, Tuple[str, ...]]:
+        return self._snapshot.tagged_hidden_gems
+
+    @property
+    def scraped_items(self) -> List[Dict[str, Any]]:
+        return self._snapshot.scraped_items
+
+    def refresh(self, force: bool = False, keep_tags: bool = False) -> List[str]:
+        """Reload changed mock files and publish them as a new snapshot.
+
+        Returns the collections (and ``spots/<id>`` shards) that were
+        reloaded or evicted. Collections nobody has touched yet are skipped;
+        they read the file as-is on first access, falling back from the
+        compiled snapshot to JSON if the file changed since startup.
+        ``force`` re-parses every file now. Hidden gem tags are cleared, as
+        a reload always has, unless ``keep_tags`` is set.
+        """
+        with self._refresh_lock:
+            current = self._snapshot
+            changed: Dict[str, Lazy[SourceData]] = {}
+            touched: Dict[str, Lazy[SourceData]] = {}
+            for name, relative in SOURCE_FILES.items():
+                lazy = current.sources.get(name)
+                previous = lazy.get() if lazy is not None and lazy.resident else None
+                if not force:
+                    if previous is None:
+                        continue
+                    stat = _stat_source(DATA_DIR / relative)
+                    if (
+                        previous.state.mtime_ns == stat.st_mtime_ns
+                        and previous.state.size == stat.st_size
+                    ):
+                        continue
+                raw, state = _read_source(name)
+                if not force and previous is not None and previous.state.digest == state.digest:
+                    # Touched but identical: remember the new mtime, keep the data.
+                    touched[name] = Lazy.of(replace(previous, state=state))
+                    continue
+                changed[name] = Lazy.of(_parse_source(name, raw, state))
+            shard_changes, shards = current.shards.refreshed(force=force)  # type: ignore[union-attr]
+            if not shard_changes and current.spatial.resident:
+                # Shards outside the LRU can change without an eviction.
+                shard_changes = self._stale_spatial_shards(current.spatial.get())
+            clear_tags = not keep_tags and bool(current.tagged_hidden_gems)
+            if not (changed or touched or shard_changes or shards or clear_tags):
+                return []
+            search = None
+            if any(name in changed for name in SEARCH_FEEDS):
+                search = _lazy_search_index({**current.sources, **touched, **changed})
+                if current.search.resident:
+                    # Index in use: build the new one before the swap, not on a query.
+                    search.get()
+            with self._lock:
+                latest = self._snapshot
+                sources = {**latest.sources, **touched, **changed}
+                updates: Dict[str, Any] = {"sources": sources}
+                if shards is not None:
+                    # Published with the snapshot, so pinned requests keep the old shards.
+                    updates["shards"] = shards
+                if changed or shard_changes or clear_tags:
+                    updates["version"] = latest.version + 1
+                if changed or shard_changes:
+                    updates["catalog_version"] = next_catalog_version()
+                if any(name in changed for name, _ in SCRAPED_SOURCES):
+                    updates["scraped"] = _lazy_scraped_index(sources)
+                if "spots" in changed or shard_changes:
+                    updates["spatial"] = _lazy_spatial_index(sources, shards or latest.shards)
+                if search is not None:
+                    updates["search"] = search
+                if not keep_tags:
+                    updates["tagged_hidden_gems"] = {}
+                self._snapshot = replace(latest, **updates)
+            return sorted(changed) + shard_changes
+
+    def _stale_spatial_shards(self, index: SpatialIndex) -> List[str]:
+        stale = []
+        for destination_id, (mtime_ns, size) in index.sources.items():
+            try:
+                stat = (self.shards.directory / f"{destination_id}.json").stat()
+            except FileNotFoundError:
+                continue  # removal is reported by the shard directory scan
+            if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+                stale.append(f"spots/{destination_id}")
+        return stale
+
+    def changed_sources(self) -> Tuple[Tuple[str, int, int], ...]:
+        """Cheap stat-only probe: loaded sources whose mtime or size moved."""
+        changed = []
+        for name, lazy in self._snapshot.sources.items():
+            if not lazy.resident:
+                continue
+            state = lazy.get().state
+            stat = _stat_source(DATA_DIR / SOURCE_FILES[name])
+            if state.mtime_ns != stat.st_mtime_ns or state.size != stat.st_size:
+                changed.append((name, stat.st_mtime_ns, stat.st_size))
+        return tuple(changed) + self.shards.changed()
+
+    def list_destinations(self) -> List[Dict[str, Any]]:
+        return self._snapshot.list_destinations()
+
+    def get_destination(self, identifier: str) -> Optional[Dict[str, Any]]:
+        return self._snapshot.get_destination(identifier)
 
     def mark_hidden_gem(
         self, item_id: str, destination_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Tag a destination so itineraries elevate hidden gems."""
         with self._lock:
-            candidate = next(
-                (item for item in self.scraped_items if item["id"] == item_id), None
-            )
+            current = self._snapshot
+            candidate = current.get_scraped_item(item_id)
             if not candidate:
                 raise ValueError(f"No scraped item with id '{item_id}'")
             target_destination = destination_id or candidate.get("destinationId")
             if not target_destination and candidate.get("destination"):
                 target_destination = candidate["destination"]
             destination = (
-                self.get_destination(target_destination) if target_destination else None
+                current.get_destination(target_destination) if target_destination else None
             )
             if not destination:
                 raise ValueError(
                     "Destination not resolved for hidden gem tagging; provide destinationId."
                 )
             dest_id = destination["id"]
-            self.tagged_hidden_gems.setdefault(dest_id, []).append(item_id)
+            tagged = dict(current.tagged_hidden_gems)
+            tagged[dest_id] = tagged.get(dest_id, ()) + (item_id,)
+            self._snapshot = replace(
+                current, version=current.version + 1, tagged_hidden_gems=tagged
+            )
             return {
                 "taggedItemId": item_id,
                 "destinationId": dest_id,
@@ -114,12 +930,72 @@ class DataStore:
             }
 
     def get_spot_by_name(self, name: str) -> Optional[Dict[str, Any]]:
-        search = name.strip().lower()
-        for spot in self.spots:
-            if spot["name"].lower() == search or spot["id"].lower() == search:
-                return spot
-        return None
+        return self._snapshot.get_spot_by_name(name)
+
+
+class DataWatcher:
+    """Background poller that reloads the store once source files settle.
+
+    Every ``interval`` seconds the watcher stats the source files. A reload is
+    triggered only after the same set of changes has been observed for at
+    least ``debounce`` seconds, so a scraper rewriting a feed in several
+    passes causes a single refresh.
+    """
+
+    def __init__(self, store: DataStore, interval: float = 2.0, debounce: float = 1.0) -> None:
+        self.store = store
+        self.interval = interval
+        self.debounce = debounce
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name="data-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        pending: Tuple[Tuple[str, int, int], ...] = ()
+        settled_since = 0.0
+        while not self._stop.wait(self.interval):
+            try:
+                observed = self.store.changed_sources()
+            except OSError:
+                # File is mid-replace; look again on the next tick.
+                continue
+            now = time.monotonic()
+            if observed != pending:
+                pending = observed
+                settled_since = now
+                continue
+            if not pending or now - settled_since < self.debounce:
+                continue
+            try:
+                # File edits must not drop tags applied through the admin API.
+                changed = self.store.refresh(keep_tags=True)
+                logger.info("Data watcher reloaded %s (version %s)", changed, self.store.version)
+            except (OSError, ValueError):
+                logger.exception("Data watcher reload failed; will retry")
+            pending = ()
+
+
+def create_store() -> Any:
+    """Build the store selected by ``TRAVEL_DATA_BACKEND``."""
+    if DATA_BACKEND == "sqlite":
+        from .sqlite_store import SQLiteDataStore
 
+        return SQLiteDataStore(DATABASE_PATH)
+    if DATA_BACKEND != "memory":
+        raise ValueError(f"Unknown TRAVEL_DATA_BACKEND '{DATA_BACKEND}'")
+    return DataStore()
 
-DATA_STORE = DataStore()
 
+DATA_STORE = create_store()
@@ -0,0 +1,72 @@
+"""Multi-keyword substring matcher (Aho-Corasick automaton).
+
+All keywords are compiled into one trie with failure links, so a single
+left-to-right pass over a text reports every occurrence of every keyword,
+overlapping ones included. A scan costs time proportional to the length
+of the text plus the number of hits, however many keywords are loaded.
+Matching is exact; callers lowercase keywords and text alike.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Generic, Iterable, Iterator, List, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class KeywordMatcher(Generic[V]):
+    """Every (start, end, value) where a keyword occurs in a text."""
+
+    def __init__(self, keywords: Iterable[Tuple[str, V]]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[Tuple[int, V], ...]] = [()]
+        self.size = 0
+        for keyword, value in keywords:
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                following = goto[state].get(char)
+                if following is None:
+                    following = len(goto)
+                    goto[state][char] = following
+                    goto.append({})
+                    outputs.append(())
+                state = following
+            outputs[state] += ((len(keyword), value),)
+            self.size += 1
+
+        # Breadth-first, so a state's failure target (always shallower) is
+        # complete before the state inherits its outputs.
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in goto[state].items():
+                queue.append(following)
+                target = fail[state]
+                while target and char not in goto[target]:
+                    target = fail[target]
+                fail[following] = goto[target].get(char, 0)
+                outputs[following] += outputs[fail[following]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def __len__(self) -> int:
+        return self.size
+
+    def find(self, text: str) -> Iterator[Tuple[int, int, V]]:
+        """Hits in order of where they end; ``text[start:end]`` is the keyword."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                end = index + 1
+                for length, value in outputs[state]:
+                    yield end - length, end, value
@@ -1,19 +1,52 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+import gc
+import json
+import logging
+import os
+from contextlib import asynccontextmanager, suppress
+from itertools import chain
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
 
-from .data_loader import DATA_STORE
-from .services.chat import ChatRequest, ChatResponse, ChatService
+from .data_loader import DATA_STORE, DataSnapshot, DataWatcher
+from .services.batch import BatchItineraryRequest, BatchItineraryResponse, ItineraryBatcher
+from .services.cache import SingleFlight
+from .services.chat import ChatEvent, ChatRequest, ChatResponse, ChatService
+from .services.sessions import CHAT_SESSIONS
+from .services.llm import LLM_CLIENT, LLMError
+from .services.serialization import FastJSONResponse, ModelResponse, dumps
 from .services.itinerary import (
     ItineraryRequest,
+    ITINERARY_CACHE,
+    ITINERARY_FLIGHTS,
+    LLM_CACHE,
     ItineraryResponse,
     destination_profile,
-    generate_itinerary_local,
+    echo_request,
+    generate_itinerary_cached,
+    itinerary_cache_key,
     generate_itinerary_with_llm,
+    stream_itinerary,
 )
-from .services.alerts import generate_destination_alerts
+from .services.alerts import ALERT_REGISTRY, destination_alerts
+
+logger = logging.getLogger(__name__)
 
 
 class TagRequest(BaseModel):
@@ -21,10 +54,36 @@ class TagRequest(BaseModel):
     destinationId: Optional[str] = None
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Opt-in eager warm so the first request doesn't pay lazy load costs.
+    if os.getenv("TRAVEL_DATA_EAGER", "").lower() in ("1", "true", "yes"):
+        DATA_STORE.warm()
+        # Everything loaded so far lives as long as the process: move it to
+        # the permanent generation (once, before serving) so collections
+        # stop rescanning it.
+        gc.freeze()
+        itinerary_batcher.start()
+    # Opt-in hot reload: poll DATA_DIR every N seconds when configured.
+    interval = float(os.getenv("TRAVEL_DATA_WATCH_INTERVAL", "0") or 0)
+    watcher = DataWatcher(DATA_STORE, interval=interval) if interval > 0 else None
+    if watcher:
+        watcher.start()
+    try:
+        yield
+    finally:
+        if watcher:
+            watcher.stop()
+        itinerary_batcher.shutdown()
+        await LLM_CLIENT.aclose()
+
+
 app = FastAPI(
     title="India Travel Intelligence POC",
     description="FastAPI backend that powers itinerary generation, chat support, and admin tooling for Indian destinations.",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 app.add_middleware(
@@ -36,17 +95,35 @@ app.add_middleware(
 )
 
 chat_service = ChatService(DATA_STORE)
+# Identical requests arriving together share one handler computation.
+REQUEST_FLIGHTS = SingleFlight()
+itinerary_batcher = ItineraryBatcher(DATA_STORE)
 
 
 @app.get("/api/health")
 def health() -> Dict[str, Any]:
     """Health check endpoint for deployment monitoring."""
     try:
+        snapshot = DATA_STORE.snapshot()
+        # Report residency without forcing lazy collections to load.
+        resident = snapshot.residency()
         return {
             "status": "ok",
             "primaryDestination": "Shimla",
-            "spotsLoaded": len(DATA_STORE.spots) if hasattr(DATA_STORE, "spots") else 0,
-            "destinationsLoaded": len(DATA_STORE.destinations) if hasattr(DATA_STORE, "destinations") else 0,
+            "spotsLoaded": len(snapshot.spots) if resident.get("spots") else 0,
+            "destinationsLoaded": len(snapshot.destinations) if resident.get("destinations") else 0,
+            "dataVersion": snapshot.version,
+            "resident": resident,
+            "storage": DATA_STORE.stats(),
+            "itineraryCache": ITINERARY_CACHE.stats(),
+            "llm": LLM_CLIENT.stats(),
+            "llmCache": LLM_CACHE.stats(),
+            "chatSessions": CHAT_SESSIONS.stats(),
+            "alerts": ALERT_REGISTRY.stats(),
+            "singleFlight": {
+                "requests": REQUEST_FLIGHTS.stats(),
+                "itineraryBuilds": ITINERARY_FLIGHTS.stats(),
+            },
         }
     except Exception as e:
         return {
@@ -62,15 +139,24 @@ def list_destinations() -> Dict[str, Any]:
 
 @app.get("/api/destination/{slug}")
 def destination_snapshot(slug: str) -> Dict[str, Any]:
-    destination = DATA_STORE.get_destination(slug)
+    snapshot = DATA_STORE.snapshot()
+    destination = snapshot.get_destination(slug)
     if not destination:
         raise HTTPException(status_code=404, detail="Destination not found")
+    return REQUEST_FLIGHTS.do(
+        ("destination", snapshot.version, destination["id"]),
+        lambda: _destination_payload(snapshot, destination),
+    )
+
+
+def _destination_payload(snapshot: DataSnapshot, destination: Dict[str, Any]) -> Dict[str, Any]:
     profile = destination_profile(destination)
-    alerts = generate_destination_alerts(destination, DATA_STORE.alerts)
-    top_spots = DATA_STORE.spots[:5] if destination["id"] == "shimla" else []
+    alerts = destination_alerts(snapshot, destination)
+    spots = snapshot.spots_for(destination["id"])
+    top_spots = spots[:5]
     experiences = (
         [f"{interest.title()} block" for interest in destination.get("interests", [])]
-        if destination["id"] != "shimla"
+        if not spots
         else []
     )
     return {
@@ -91,40 +177,274 @@ def destination_snapshot(slug: str) -> Dict[str, Any]:
     }
 
 
+def _parse_bbox(bbox: str) -> Tuple[float, float, float, float]:
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="bbox must be minLng,minLat,maxLng,maxLat"
+        ) from None
+    if min_lat > max_lat or min_lng > max_lng:
+        raise HTTPException(status_code=400, detail="bbox minimums exceed maximums")
+    return min_lat, min_lng, max_lat, max_lng
+
+
+@app.get("/api/spots")
+def spots_in_bbox(
+    bbox: str = Query(..., description="minLng,minLat,maxLng,maxLat"),
+    limit: int = Query(default=500, ge=1, le=5000),
+) -> Dict[str, Any]:
+    spots = DATA_STORE.snapshot().spots_in_bbox(*_parse_bbox(bbox), limit=limit)
+    return {"spots": spots, "count": len(spots)}
+
+
+@app.get("/api/spots/nearby")
+def spots_nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radiusKm: float = Query(default=10.0, gt=0, le=500),
+    k: int = Query(default=10, ge=1, le=100),
+) -> Dict[str, Any]:
+    spots = DATA_STORE.snapshot().spots_nearby(lat, lng, radius_km=radiusKm, k=k)
+    return {"spots": spots, "count": len(spots)}
+
+
+@app.get("/api/search")
+def search_posts(
+    q: str = Query(..., min_length=1, description="Free-text query"),
+    destination: Optional[str] = Query(default=None, description="Destination slug or name"),
+    k: int = Query(default=10, ge=1, le=50),
+) -> Dict[str, Any]:
+    """Blog and Instagram posts ranked by BM25 relevance to ``q``."""
+    snapshot = DATA_STORE.snapshot()
+    if destination:
+        resolved = snapshot.get_destination(destination)
+        destination = resolved["id"] if resolved else destination
+    results = snapshot.search_posts(q, destination=destination, k=k)
+    return {"query": q, "destination": destination, "count": len(results), "results": results}
+
+
 @app.post("/api/itinerary", response_model=ItineraryResponse)
-def create_itinerary(payload: ItineraryRequest) -> ItineraryResponse:
+async def create_itinerary(payload: ItineraryRequest) -> ModelResponse:
+    return ModelResponse(await _itinerary(payload))
+
+
+async def _itinerary(payload: ItineraryRequest) -> ItineraryResponse:
+    # Async so a slow LLM holds a coroutine, not a threadpool slot; the
+    # CPU-bound local builder still runs in the threadpool.
+    snapshot = DATA_STORE.snapshot()
     try:
         if payload.use_llm:
             try:
-                return generate_itinerary_with_llm(DATA_STORE, payload)
+                return await generate_itinerary_with_llm(snapshot, payload)
+            except LLMError as exc:
+                raise HTTPException(status_code=503, detail=str(exc)) from exc
             except RuntimeError:
-                return generate_itinerary_local(DATA_STORE, payload)
-        return generate_itinerary_local(DATA_STORE, payload)
+                pass
+        key = itinerary_cache_key(snapshot, payload)
+        if key is None:
+            return await run_in_threadpool(generate_itinerary_cached, snapshot, payload)
+        # Followers of an identical in-flight request wait without a thread.
+        response = await REQUEST_FLIGHTS.do_async(
+            ("itinerary", key),
+            lambda: run_in_threadpool(generate_itinerary_cached, snapshot, payload),
+        )
+        return echo_request(response, payload)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+ItineraryEvents = Iterator[Tuple[str, Dict[str, Any]]]
+
+
+def _guard_stream(events: ItineraryEvents) -> ItineraryEvents:
+    # Headers are already sent, so a late failure becomes a final event.
+    try:
+        yield from events
+    except Exception:
+        logger.exception("Itinerary stream failed")
+        yield "error", {"detail": "Itinerary generation failed."}
+
+
+def _ndjson_line(event: str, data: Dict[str, Any]) -> bytes:
+    return dumps({"type": event, "data": data}) + b"\n"
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+EventEncoder = Callable[[str, Dict[str, Any]], bytes]
+
+
+def _event_encoder(request: Request) -> EventEncoder:
+    """Server-Sent Events when the client accepts them, NDJSON otherwise."""
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return _sse_event
+    return _ndjson_line
+
+
+def _event_response(
+    encode: EventEncoder, body: Union[Iterable[bytes], AsyncIterator[bytes]]
+) -> StreamingResponse:
+    if encode is _sse_event:
+        return StreamingResponse(
+            body,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    return StreamingResponse(body, media_type="application/x-ndjson")
+
+
+@app.post("/api/itinerary/stream")
+def create_itinerary_stream(payload: ItineraryRequest, request: Request) -> StreamingResponse:
+    """Itinerary sent day by day as each is built, then the summary.
+
+    Newline-delimited JSON (``{"type", "data"}`` per line) by default;
+    Server-Sent Events when the client accepts ``text/event-stream``.
+    """
+    events = stream_itinerary(DATA_STORE.snapshot(), payload)
+    try:
+        # Resolve the destination before committing to a 200.
+        events = chain([next(events)], events)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    encode = _event_encoder(request)
+    return _event_response(encode, (encode(event, data) for event, data in _guard_stream(events)))
+
+
+@app.post("/api/itinerary/batch", response_model=BatchItineraryResponse)
+def create_itinerary_batch(payload: BatchItineraryRequest) -> ModelResponse:
+    """Many itineraries in one call; per-item results and errors in input order."""
+    return ModelResponse(itinerary_batcher.run(payload.requests))
 
 
 @app.post("/api/chat", response_model=ChatResponse)
-def chat(payload: ChatRequest) -> ChatResponse:
-    return chat_service.respond(payload.message, payload.context)
+def chat(payload: ChatRequest) -> ModelResponse:
+    return ModelResponse(
+        chat_service.respond(payload.message, payload.context, payload.sessionId)
+    )
 
 
-@app.get("/api/admin/scraped")
-def scraped_feed(destination: Optional[str] = Query(default=None)) -> Dict[str, Any]:
-    def _filter(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        if not destination:
-            return records
-        return [
-            item
-            for item in records
-            if item.get("destinationId") == destination or item.get("destination") == destination
-        ]
+async def _guard_chat(events: AsyncGenerator[ChatEvent, None]) -> AsyncGenerator[ChatEvent, None]:
+    try:
+        async for event in events:
+            yield event
+    except Exception:
+        logger.exception("Chat stream failed")
+        yield "error", {"detail": "Chat reply failed."}
+    finally:
+        # Close the model now, not whenever the abandoned stream is collected.
+        await events.aclose()
 
-    return {
-        "blogs": _filter(DATA_STORE.blog_posts),
-        "insta": _filter(DATA_STORE.insta_posts),
-        "alerts": _filter(DATA_STORE.alerts),
-    }
+
+@app.post("/api/chat/stream")
+async def chat_stream(payload: ChatRequest, request: Request) -> StreamingResponse:
+    """Chat reply streamed as ``delta`` text chunks, then ``done`` with sources.
+
+    NDJSON by default, Server-Sent Events for ``text/event-stream``. Each
+    chunk is written before the next is produced, so a slow client paces
+    the reply; a client that disconnects cancels it.
+    """
+    encode = _event_encoder(request)
+    events = _guard_chat(
+        chat_service.stream(payload.message, payload.context, payload.sessionId)
+    )
+
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            async for event, data in events:
+                yield encode(event, data)
+        finally:
+            await events.aclose()
+
+    return _event_response(encode, body())
+
+
+async def _send_reply(websocket: WebSocket, payload: ChatRequest) -> None:
+    events = _guard_chat(
+        chat_service.stream(payload.message, payload.context, payload.sessionId)
+    )
+    try:
+        async for event, data in events:
+            # Waits for the socket to drain, so the reply is produced at the
+            # pace the client reads it.
+            await websocket.send_bytes(_ndjson_line(event, data))
+    finally:
+        await events.aclose()
+
+
+@app.websocket("/api/chat/ws")
+async def chat_socket(websocket: WebSocket) -> None:
+    """Multi-turn chat over one socket, replies streamed like ``/api/chat/stream``.
+
+    Each client frame is a ``ChatRequest`` JSON object; each server frame is
+    one ``{"type", "data"}`` event. ``{"type": "cancel"}`` stops the reply
+    being streamed, and a new message sent mid-reply replaces it. Both end
+    the old reply with a ``cancelled`` event.
+    """
+    await websocket.accept()
+    pending: Optional[str] = None
+    try:
+        while True:
+            frame = pending if pending is not None else await websocket.receive_text()
+            pending = None
+            try:
+                message = json.loads(frame)
+                if isinstance(message, dict) and message.get("type") == "cancel":
+                    continue
+                payload = ChatRequest.model_validate(message)
+            except ValidationError as exc:
+                await websocket.send_bytes(
+                    _ndjson_line("error", {"detail": exc.errors(include_url=False)})
+                )
+                continue
+            except ValueError:
+                await websocket.send_bytes(_ndjson_line("error", {"detail": "Invalid JSON frame."}))
+                continue
+            reply = asyncio.ensure_future(_send_reply(websocket, payload))
+            listen = asyncio.ensure_future(websocket.receive_text())
+            await asyncio.wait({reply, listen}, return_when=asyncio.FIRST_COMPLETED)
+            if not listen.done():
+                listen.cancel()
+                reply.result()
+                continue
+            reply.cancel()
+            with suppress(asyncio.CancelledError):
+                await reply
+            # Raises WebSocketDisconnect if the client went away mid-reply.
+            pending = listen.result()
+            if reply.cancelled():
+                await websocket.send_bytes(_ndjson_line("cancelled", {}))
+    except WebSocketDisconnect:
+        return
+
+
+@app.get("/api/chat/session/{session_id}")
+def chat_session(session_id: str) -> Dict[str, Any]:
+    session = CHAT_SESSIONS.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return session.summary()
+
+
+@app.delete("/api/chat/session/{session_id}")
+def end_chat_session(session_id: str) -> Dict[str, Any]:
+    """Forget a conversation now instead of waiting for its idle TTL."""
+    return {"sessionId": session_id, "ended": CHAT_SESSIONS.discard(session_id)}
+
+
+@app.get("/api/admin/scraped")
+def scraped_feed(
+    destination: Optional[str] = Query(default=None),
+    tag: Optional[str] = Query(default=None),
+    since: Optional[str] = Query(default=None, description="ISO timestamp lower bound"),
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+) -> Dict[str, Any]:
+    return DATA_STORE.snapshot().query_scraped(
+        destination=destination, tag=tag, since=since, limit=limit, offset=offset
+    )
 
 
 @app.post("/api/admin/tag")
@@ -136,7 +456,14 @@ def tag_hidden_gem(payload: TagRequest) -> Dict[str, Any]:
 
 
 @app.post("/api/admin/refresh")
-def refresh_data() -> Dict[str, Any]:
-    DATA_STORE.refresh()
-    return {"status": "reloaded"}
+def refresh_data(
+    full: bool = Query(default=False),
+    keepTags: bool = Query(default=False),
+) -> Dict[str, Any]:
+    """Reload changed data files and clear hidden gem tags.
+
+    ``full`` re-parses every file; ``keepTags`` keeps the admin tags.
+    """
+    changed = DATA_STORE.refresh(force=full, keep_tags=keepTags)
+    return {"status": "reloaded", "changed": changed, "dataVersion": DATA_STORE.version}
 
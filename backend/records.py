@@ -0,0 +1,202 @@
+"""Compact record types for the catalog, spots and scraped feeds.
+
+Each record stores its known fields in ``__slots__`` instead of a per-item
+dict, and interns repeated categorical strings (regions, categories, tags,
+sources) so every worker holds one copy of each. Records are read-only
+mappings, so existing ``record["name"]`` / ``record.get(...)`` / ``{**record}``
+call sites and FastAPI's JSON encoding keep working unchanged.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, Iterator, List, Tuple
+
+from pydantic_core import SchemaSerializer, core_schema
+
+
+def _intern(value: Any) -> Any:
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return tuple(_intern(item) for item in value)
+    return value
+
+
+def _freeze(value: Any) -> Any:
+    # Lists become tuples: smaller, and safe to share across snapshots.
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def _restore_record(
+    cls: type, values: Tuple[Any, ...], keys: Any = None, extra: Any = None
+) -> "Record":
+    """Unpickle hook: refill slots directly, skipping ``__init__`` re-interning."""
+    record = object.__new__(cls)
+    for key, value in zip(keys or cls.FIELDS, values):
+        object.__setattr__(record, key, value)
+    object.__setattr__(record, "_extra", extra)
+    return record
+
+
+class Record(Mapping):
+    """Read-only mapping backed by ``__slots__``.
+
+    Subclasses list their JSON keys in ``FIELDS`` (which double as slot names)
+    and the categorical ones in ``INTERNED``. Keys absent from the source are
+    left unset and are not reported by the mapping; unknown keys are kept in
+    a small overflow dict so nothing in the source file is dropped.
+    """
+
+    __slots__ = ("_extra",)
+
+    # Lets pydantic (and so FastAPI responses typed ``Any``) serialize records.
+    __pydantic_serializer__ = SchemaSerializer(
+        core_schema.any_schema(
+            serialization=core_schema.plain_serializer_function_ser_schema(dict)
+        )
+    )
+
+    FIELDS: Tuple[str, ...] = ()
+    INTERNED: FrozenSet[str] = frozenset()
+    _FIELD_SET: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        extra = None
+        for key, value in data.items():
+            if key in self._FIELD_SET:
+                value = _intern(value) if key in self.INTERNED else _freeze(value)
+                object.__setattr__(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        object.__setattr__(self, "_extra", extra)
+
+    @classmethod
+    def from_list(cls, rows: List[Dict[str, Any]]) -> List["Record"]:
+        return [cls(row) for row in rows]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} records are read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]  # type: ignore[index]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        keys = tuple(key for key in self.FIELDS if hasattr(self, key))
+        values = tuple(getattr(self, key) for key in keys)
+        # Records with every field set (the common case) skip the key list.
+        return (
+            _restore_record,
+            (type(self), values, None if keys == self.FIELDS else keys, self._extra),
+        )
+
+
+class Destination(Record):
+    FIELDS = (
+        "id",
+        "name",
+        "region",
+        "state",
+        "primaryCategory",
+        "categories",
+        "interests",
+        "bestTime",
+        "summary",
+    )
+    INTERNED = frozenset({"region", "state", "primaryCategory", "categories", "interests"})
+    __slots__ = FIELDS
+
+
+class Spot(Record):
+    FIELDS = (
+        "id",
+        "name",
+        "description",
+        "lat",
+        "lng",
+        "bestTime",
+        "entryFee",
+        "openingHours",
+        "crowdScore",
+        "tags",
+        "instagramCaptions",
+        "imageUrl",
+        "isHiddenGem",
+    )
+    INTERNED = frozenset({"entryFee", "openingHours", "tags"})
+    __slots__ = FIELDS
+
+
+class ScrapedPost(Record):
+    """Blog or Instagram post from the scraped feeds."""
+
+    FIELDS = (
+        "id",
+        "source",
+        "title",
+        "destinationId",
+        "content",
+        "geoTags",
+        "tags",
+        "url",
+        "timestamp",
+    )
+    INTERNED = frozenset({"source", "destinationId", "geoTags", "tags"})
+    __slots__ = FIELDS
+
+
+class Alert(Record):
+    FIELDS = (
+        "id",
+        "type",
+        "severity",
+        "title",
+        "description",
+        "affectedAreas",
+        "timestamp",
+        "destinationId",
+    )
+    INTERNED = frozenset({"type", "severity", "affectedAreas", "destinationId"})
+    __slots__ = FIELDS
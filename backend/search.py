@@ -0,0 +1,324 @@
+"""BM25 full-text index over the scraped blog and Instagram feeds.
+
+Built once per data version: every post's title, content, tags and
+geotags are tokenized into one inverted index. Each posting stores its
+final BM25 contribution, so a query only sums the postings of its own
+terms. Documents are numbered destination by destination, so one
+destination's postings are a contiguous run of every list and a filtered
+query reads just that run.
+
+With NumPy the postings are flat arrays. Large global queries use MaxScore
+pruning: a score threshold is taken from each term's highest-impact
+postings, terms too weak to lift a document past it are only looked up for
+the surviving candidates, and candidates that can no longer reach it are
+dropped as terms are added. Without NumPy the same layout is kept in lists
+and every matching posting is scored.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from collections import Counter, defaultdict
+from bisect import bisect_left, bisect_right
+from math import log
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional speed-up
+    np = None
+
+# Okapi BM25 parameters.
+K1 = 1.2
+B = 0.75
+
+# Term-frequency weight of a match in each field (BM25F-style).
+FIELD_WEIGHTS: Sequence[Tuple[str, float]] = (
+    ("title", 2.0),
+    ("geoTags", 2.0),
+    ("tags", 1.5),
+    ("content", 1.0),
+)
+
+STOPWORDS = frozenset(
+    """a about an and any are as at be but by can do for from get go has have how i if in
+    into is it its me my near of on or our so than that the their then there these this
+    to too us was we what when where which who will with you your""".split()
+)
+
+# Postings per document above which a query scores into a dense array.
+DENSE_RATIO = 8
+# Below this many matching postings a query is scored exhaustively.
+PRUNE_MIN_POSTINGS = 20_000
+# Highest-impact postings kept per term to seed the pruning threshold.
+CHAMPIONS = 64
+
+_TOKEN = re.compile(r"[^\W_]{2,}")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens, without stopwords and single characters."""
+    return [
+        token
+        for token in _TOKEN.findall(text.lower())
+        if token not in STOPWORDS
+    ]
+
+
+class SearchDocument(NamedTuple):
+    source: str
+    destination: Optional[str]
+    # Whatever the owning snapshot needs to fetch the record back.
+    ref: Any
+
+
+class SearchHit(NamedTuple):
+    score: float
+    document: SearchDocument
+
+
+def _field_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return " ".join(str(item) for item in value)
+
+
+class SearchIndex:
+    """Immutable BM25 inverted index built once per data version."""
+
+    def __init__(self, posts: Iterable[Tuple[SearchDocument, Mapping[str, Any]]]) -> None:
+        documents: List[SearchDocument] = []
+        codes: Dict[Optional[str], int] = {}
+        # Unseen tokens get the next term id on first lookup.
+        term_ids: Dict[str, int] = defaultdict()
+        term_ids.default_factory = term_ids.__len__  # type: ignore[attr-defined]
+        # One (term, weighted tf) entry per distinct term of each document,
+        # in feed order; ``postings`` counts them per document.
+        terms: List[int] = []
+        frequencies: List[float] = []
+        postings: List[int] = []
+        doc_codes: List[int] = []
+        lengths: List[float] = []
+        for document, post in posts:
+            documents.append(document)
+            doc_codes.append(codes.setdefault(document.destination, len(codes)))
+            counts: Counter = Counter()
+            length = 0.0
+            for name, weight in FIELD_WEIGHTS:
+                tokens = tokenize(_field_text(post.get(name)))
+                length += weight * len(tokens)
+                if weight == 1:
+                    counts.update(tokens)
+                else:
+                    for token, count in Counter(tokens).items():
+                        counts[token] += weight * count
+            lengths.append(length)
+            terms.extend(map(term_ids.__getitem__, counts))
+            frequencies.extend(counts.values())
+            postings.append(len(counts))
+
+        self.size = len(documents)
+        self.terms = dict(term_ids)
+        # Documents renumbered destination by destination, feed order within.
+        renumbered = sorted(range(self.size), key=doc_codes.__getitem__)
+        self.documents = [documents[doc] for doc in renumbered]
+        self._feed_order = renumbered
+        self.destinations: Dict[Optional[str], Tuple[int, int]] = {}
+        for doc, original in enumerate(renumbered):
+            start, _ = self.destinations.get(documents[original].destination, (doc, doc))
+            self.destinations[documents[original].destination] = (start, doc + 1)
+        self._champions: Dict[int, Any] = {}
+
+        self.vectorized = np is not None
+        if self.vectorized:
+            self._finish_vectorized(terms, frequencies, postings, renumbered, lengths)
+        else:
+            self._finish_python(terms, frequencies, postings, renumbered, lengths)
+
+    def _finish_vectorized(
+        self,
+        terms: List[int],
+        frequencies: List[float],
+        postings: List[int],
+        renumbered: List[int],
+        lengths: List[float],
+    ) -> None:
+        term_array = np.array(terms, dtype=np.int32)
+        tf = np.array(frequencies, dtype=np.float64)
+        feed_docs = np.repeat(np.arange(self.size, dtype=np.int32), postings)
+        df = np.bincount(term_array, minlength=len(self.terms))
+        idf = np.log(1 + (self.size - df + 0.5) / (df + 0.5))
+        length_array = np.array(lengths, dtype=np.float64)
+        norm = K1 * (1 - B + B * length_array / (length_array.mean() if self.size else 1.0))
+        impacts = idf[term_array] * tf * (K1 + 1) / (tf + norm[feed_docs])
+        numbers = np.empty(self.size, dtype=np.int32)
+        numbers[np.array(renumbered, dtype=np.int64)] = np.arange(self.size, dtype=np.int32)
+        docs = numbers[feed_docs]
+        order = np.lexsort((docs, term_array))
+        self._offsets: Any = np.concatenate(([0], np.cumsum(df)))
+        self._docs: Any = docs[order]
+        self._impacts: Any = impacts[order]
+        self._bounds: Any = (
+            np.maximum.reduceat(self._impacts, self._offsets[:-1])
+            if len(self._impacts)
+            else np.zeros(0)
+        )
+        self._feed_order = np.array(self._feed_order, dtype=np.int64)
+        for term in np.flatnonzero(df > CHAMPIONS):
+            start, end = self._offsets[term], self._offsets[term + 1]
+            top = np.argpartition(-self._impacts[start:end], CHAMPIONS - 1)[:CHAMPIONS]
+            self._champions[int(term)] = self._docs[start:end][top]
+
+    def _finish_python(
+        self,
+        terms: List[int],
+        frequencies: List[float],
+        postings: List[int],
+        renumbered: List[int],
+        lengths: List[float],
+    ) -> None:
+        average = sum(lengths) / self.size if self.size else 1.0
+        numbers = [0] * self.size
+        for doc, original in enumerate(renumbered):
+            numbers[original] = doc
+        by_term: List[List[Tuple[int, float, int]]] = [[] for _ in self.terms]
+        entry = 0
+        for original, count in enumerate(postings):
+            for _ in range(count):
+                by_term[terms[entry]].append((numbers[original], frequencies[entry], original))
+                entry += 1
+        self._offsets, self._docs, self._impacts = [0], [], []
+        for entries in by_term:
+            idf = log(1 + (self.size - len(entries) + 0.5) / (len(entries) + 0.5))
+            for doc, frequency, original in sorted(entries):
+                norm = K1 * (1 - B + B * lengths[original] / average)
+                self._docs.append(doc)
+                self._impacts.append(idf * frequency * (K1 + 1) / (frequency + norm))
+            self._offsets.append(len(self._docs))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _slice(self, term: int, docs: Optional[Tuple[int, int]]) -> Tuple[int, int]:
+        start, end = int(self._offsets[term]), int(self._offsets[term + 1])
+        if docs is None:
+            return start, end
+        if self.vectorized:
+            first, last = np.searchsorted(self._docs[start:end], docs)
+            return start + int(first), start + int(last)
+        return (
+            bisect_left(self._docs, docs[0], start, end),
+            bisect_left(self._docs, docs[1], start, end),
+        )
+
+    def search(
+        self, query: str, destination: Optional[str] = None, k: int = 10
+    ) -> List[SearchHit]:
+        """Top ``k`` documents for ``query``, best first (ties in feed order).
+
+        ``destination`` keeps only posts filed under that destination key.
+        """
+        if k <= 0:
+            return []
+        docs: Optional[Tuple[int, int]] = None
+        if destination is not None:
+            docs = self.destinations.get(destination)
+            if docs is None:
+                return []
+        terms = sorted({self.terms[token] for token in tokenize(query) if token in self.terms})
+        slices = [(term, *self._slice(term, docs)) for term in terms]
+        slices = [(term, start, end) for term, start, end in slices if end > start]
+        if not slices:
+            return []
+        if not self.vectorized:
+            ranked = self._ranked_python(slices, k)
+        elif (
+            docs is None
+            and len(slices) > 1
+            and sum(end - start for _, start, end in slices) > PRUNE_MIN_POSTINGS
+        ):
+            ranked = self._ranked_pruned(slices, k)
+        else:
+            ranked = self._top(*self._accumulate(slices), k)
+        return [SearchHit(score, self.documents[doc]) for doc, score in ranked]
+
+    def _accumulate(self, slices: List[Tuple[int, int, int]]) -> Tuple[Any, Any]:
+        """Every document in ``slices`` with the sum of its impacts."""
+        if len(slices) == 1:
+            _, start, end = slices[0]
+            return self._docs[start:end], self._impacts[start:end]
+        if sum(end - start for _, start, end in slices) * DENSE_RATIO < self.size:
+            matched = np.concatenate([self._docs[start:end] for _, start, end in slices])
+            docs, inverse = np.unique(matched, return_inverse=True)
+            weights = np.concatenate([self._impacts[start:end] for _, start, end in slices])
+            return docs, np.bincount(inverse, weights=weights)
+        # Long posting lists: add into one dense row instead of sorting them.
+        # A doc appears at most once per term, so the fancy-index adds are safe.
+        totals = np.zeros(self.size)
+        for _, start, end in slices:
+            totals[self._docs[start:end]] += self._impacts[start:end]
+        docs = np.flatnonzero(totals)
+        return docs, totals[docs]
+
+    def _lookup(self, start: int, end: int, docs: Any) -> Any:
+        """Impact of one term's slice for each of ``docs`` (0 where absent)."""
+        term_docs = self._docs[start:end]
+        positions = np.minimum(np.searchsorted(term_docs, docs), end - start - 1)
+        return np.where(term_docs[positions] == docs, self._impacts[start:end][positions], 0.0)
+
+    def _kth(self, scores: Any, k: int) -> float:
+        return float(np.partition(scores, len(scores) - k)[len(scores) - k]) if len(scores) >= k else 0.0
+
+    def _ranked_pruned(self, slices: List[Tuple[int, int, int]], k: int) -> List[Tuple[int, float]]:
+        by_term = slices
+        slices = sorted(slices, key=lambda entry: -self._bounds[entry[0]])
+        bounds = [float(self._bounds[term]) for term, _, _ in slices]
+
+        # Any k real documents give a lower bound on the k-th best score.
+        seeds = np.unique(
+            np.concatenate(
+                [self._champions.get(term, self._docs[start:end]) for term, start, end in slices]
+            )
+        )
+        seed_scores = sum(self._lookup(start, end, seeds) for _, start, end in slices)
+        threshold = self._kth(seed_scores, k)
+
+        # Terms whose upper bounds together stay below the threshold can't
+        # qualify a document alone: candidates come from the others.
+        essential = len(slices)
+        while essential > 1 and sum(bounds[essential - 1 :]) < threshold:
+            essential -= 1
+        docs, scores = self._accumulate(slices[:essential])
+        remaining = sum(bounds[essential:])
+        for (_, start, end), bound in zip(slices[essential:], bounds[essential:]):
+            threshold = max(threshold, self._kth(scores, k))
+            # Small slack so float summation order can't drop a tie.
+            keep = scores + remaining >= threshold - 1e-9
+            docs, scores = docs[keep], scores[keep]
+            scores = scores + self._lookup(start, end, docs)
+            remaining -= bound
+        # Re-add the finalists' impacts in term order, as exhaustive scoring
+        # does, so both paths agree to the last bit and break ties alike.
+        docs = docs[scores >= self._kth(scores, k) - 1e-9]
+        scores = sum(self._lookup(start, end, docs) for _, start, end in by_term)
+        return self._top(docs, scores, k)
+
+    def _top(self, docs: Any, scores: Any, k: int) -> List[Tuple[int, float]]:
+        if len(docs) > k:
+            # Everything tied with the k-th best stays in, so ties break by feed order.
+            keep = scores >= self._kth(scores, k)
+            docs, scores = docs[keep], scores[keep]
+        order = np.lexsort((self._feed_order[docs], -scores))[:k]
+        return [(int(docs[i]), float(scores[i])) for i in order]
+
+    def _ranked_python(self, slices: List[Tuple[int, int, int]], k: int) -> List[Tuple[int, float]]:
+        scores: Dict[int, float] = {}
+        for _, start, end in slices:
+            for doc, impact in zip(self._docs[start:end], self._impacts[start:end]):
+                scores[doc] = scores.get(doc, 0.0) + impact
+        return heapq.nsmallest(
+            k, scores.items(), key=lambda item: (-item[1], self._feed_order[item[0]])
+        )
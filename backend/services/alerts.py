@@ -1,7 +1,19 @@
 from __future__ import annotations
 
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from ..data_loader import DataSnapshot
+
+# Seconds between re-stamps of the synthetic alerts' timestamps.
+ALERT_REFRESH_SECONDS = float(os.getenv("TRAVEL_ALERT_REFRESH", "300"))
+# Synthetic alert kinds, in the order they are listed, and how many hours
+# after the stamp time each one is dated.
+SYNTHETIC_OFFSETS = {"road": 0, "weather": 1, "event": 2}
 
 
 CATEGORY_ALERT_TEMPLATES = {
@@ -68,41 +80,167 @@ CATEGORY_ALERT_TEMPLATES = {
 }
 
 
-def _synthesize_alert(kind: str, text: str, destination: Dict[str, str]) -> Dict[str, str]:
-    now = datetime.utcnow()
-    offset = {"road": 0, "weather": 1, "event": 2}.get(kind, 0)
-    timestamp = (now + timedelta(hours=offset)).isoformat() + "Z"
+def _synthesize_alert(kind: str, text: str, destination: Dict[str, str]) -> Dict[str, Any]:
+    """An undated synthetic alert; ``_stamp`` fills in its timestamp."""
     return {
         "id": f"synthetic-{destination['id']}-{kind}",
-        "type": kind if kind != "event" else "event",
+        "type": kind,
         "severity": "medium" if kind != "event" else "low",
         "title": text.split(".")[0],
         "description": text,
         "affectedAreas": [destination["name"]],
-        "timestamp": timestamp,
+        "timestamp": None,
         "destinationId": destination["id"],
     }
 
 
+def _synthetic_alerts(destination: Dict[str, str]) -> List[Dict[str, Any]]:
+    profile = CATEGORY_ALERT_TEMPLATES.get(
+        destination.get("primaryCategory", ""), CATEGORY_ALERT_TEMPLATES["default"]
+    )
+    return [
+        _synthesize_alert(
+            kind,
+            profile.get(kind, CATEGORY_ALERT_TEMPLATES["default"][kind]).format(
+                name=destination["name"]
+            ),
+            destination,
+        )
+        for kind in SYNTHETIC_OFFSETS
+    ]
+
+
+def _stamp(alerts: List[Dict[str, Any]], now: datetime) -> List[Dict[str, Any]]:
+    return [
+        {
+            **alert,
+            "timestamp": (now + timedelta(hours=SYNTHETIC_OFFSETS[alert["type"]])).isoformat() + "Z",
+        }
+        for alert in alerts
+    ]
+
+
+def _scraped_alerts(
+    destination: Dict[str, str], base_alerts: List[Dict[str, str]]
+) -> List[Dict[str, str]]:
+    return [alert for alert in base_alerts if alert.get("destinationId") == destination["id"]]
+
+
 def generate_destination_alerts(
     destination: Dict[str, str], base_alerts: List[Dict[str, str]]
 ) -> List[Dict[str, str]]:
-    filtered = [
-        alert for alert in base_alerts if alert.get("destinationId") == destination["id"]
-    ]
-    if filtered:
-        return filtered
+    """Scraped alerts for ``destination``, else its category's synthetic ones.
 
-    profile = CATEGORY_ALERT_TEMPLATES.get(
-        destination.get("primaryCategory", ""), CATEGORY_ALERT_TEMPLATES["default"]
+    Built from scratch on every call; ``destination_alerts`` serves the same
+    alerts precomputed.
+    """
+    return _scraped_alerts(destination, base_alerts) or _stamp(
+        _synthetic_alerts(destination), datetime.utcnow()
     )
-    synthetic = []
-    for key in ("road", "weather", "event"):
-        text = profile.get(key, CATEGORY_ALERT_TEMPLATES["default"][key]).format(
-            name=destination["name"]
-        )
-        synthetic.append(_synthesize_alert(key if key != "event" else "event", text, destination))
-    return synthetic
+
+
+class AlertRegistry:
+    """Active alerts per destination id, precomputed once per catalog version.
+
+    The first lookup for a newer catalog version maps every catalog
+    destination to its scraped alerts or, failing those, to its synthetic
+    ones, rendered once. Synthetic timestamps are re-stamped every
+    ``refresh_interval`` seconds (checked on lookup) instead of per call,
+    so they trail the clock by at most that long. Each build or re-stamp
+    swaps in a new map, so returned lists are never changed under a
+    caller; callers must not change them either.
+
+    Lookups from a snapshot older than the registry's are built on the fly
+    rather than rolling the registry back.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = ALERT_REFRESH_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        now: Callable[[], datetime] = datetime.utcnow,
+    ) -> None:
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._now = now
+        self._lock = Lock()
+        self.generation: Optional[int] = None
+        self._scraped: Dict[str, List[Dict[str, Any]]] = {}
+        self._synthetic: Dict[str, List[Dict[str, Any]]] = {}
+        self._alerts: Dict[str, List[Dict[str, Any]]] = {}
+        self._next_stamp = 0.0
+        self.stamped_at: Optional[datetime] = None
+        self.builds = 0
+        self.stamps = 0
+
+    def alerts_for(
+        self, snapshot: "DataSnapshot", destination: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        version = snapshot.catalog_version
+        if self.generation is None or version > self.generation:
+            self._build(snapshot)
+        elif version < self.generation:
+            return generate_destination_alerts(destination, snapshot.alerts_for(destination["id"]))
+        elif self._clock() >= self._next_stamp:
+            self._restamp(version)
+        alerts = self._alerts.get(destination["id"])
+        if alerts is None:
+            return generate_destination_alerts(destination, snapshot.alerts_for(destination["id"]))
+        return alerts
+
+    def _build(self, snapshot: "DataSnapshot") -> None:
+        with self._lock:
+            if self.generation is not None and snapshot.catalog_version <= self.generation:
+                return
+            scraped: Dict[str, List[Dict[str, Any]]] = {}
+            synthetic: Dict[str, List[Dict[str, Any]]] = {}
+            for destination in snapshot.destinations:
+                alerts = _scraped_alerts(destination, snapshot.alerts_for(destination["id"]))
+                if alerts:
+                    scraped[destination["id"]] = alerts
+                else:
+                    synthetic[destination["id"]] = _synthetic_alerts(destination)
+            self._scraped = scraped
+            self._synthetic = synthetic
+            self._stamp_all()
+            self.generation = snapshot.catalog_version
+            self.builds += 1
+
+    def _restamp(self, version: int) -> None:
+        with self._lock:
+            if version == self.generation and self._clock() >= self._next_stamp:
+                self._stamp_all()
+
+    def _stamp_all(self) -> None:
+        now = self._now()
+        alerts = dict(self._scraped)
+        for destination_id, undated in self._synthetic.items():
+            alerts[destination_id] = _stamp(undated, now)
+        self._alerts = alerts
+        self.stamped_at = now
+        self._next_stamp = self._clock() + self.refresh_interval
+        self.stamps += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "dataVersion": self.generation,
+            "destinations": len(self._alerts),
+            "synthetic": len(self._synthetic),
+            "refreshSeconds": self.refresh_interval,
+            "stampedAt": self.stamped_at.isoformat() + "Z" if self.stamped_at else None,
+            "builds": self.builds,
+            "stamps": self.stamps,
+        }
+
+
+ALERT_REGISTRY = AlertRegistry()
+
+
+def destination_alerts(
+    snapshot: "DataSnapshot", destination: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """``destination``'s active alerts from the shared registry."""
+    return ALERT_REGISTRY.alerts_for(snapshot, destination)
 
 
 def summarize_alerts(alerts: List[Dict[str, str]]) -> str:
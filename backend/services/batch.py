@@ -0,0 +1,271 @@
+"""Batch itinerary generation fanned out over a process pool.
+
+Itinerary building is CPU-bound pure Python, so threads can't use more than
+one core. A batch is deduplicated by ``itinerary_cache_key``, answered from
+``ITINERARY_CACHE`` where possible, and the remaining distinct requests are
+built by ``generate_itinerary_local`` in worker processes.
+
+Workers are started through a fork server (or spawned where there is none)
+rather than forked from the server, whose threads may hold locks a forked
+child would inherit. Each worker opens the store itself, from the compiled
+snapshot when it matches the JSON or from the shared SQLite database, and
+warms only what itineraries read: destinations, spots and compiled
+profiles. The pool is recycled whenever the catalog version moves on, and
+is skipped while the data files are ahead of the server's snapshot. Hidden
+gem tags travel with each request, since the in-memory store keeps them
+only in the server process.
+"""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor
+from dataclasses import replace
+from threading import Lock
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, conlist
+
+from .. import data_loader
+from ..data_loader import DataSnapshot, DataStore
+from .itinerary import (
+    ITINERARY_CACHE,
+    ItineraryRequest,
+    ItineraryResponse,
+    cache_request,
+    compiled_profile,
+    echo_request,
+    generate_itinerary_local,
+    itinerary_cache_key,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_MAX_ITEMS = int(os.getenv("TRAVEL_BATCH_MAX_ITEMS", "500"))
+BATCH_WORKERS = int(os.getenv("TRAVEL_BATCH_WORKERS", str(os.cpu_count() or 1)))
+# Batches with at most this many uncached requests are built in-process:
+# shipping them to workers costs more than it saves.
+BATCH_INLINE_MAX = int(os.getenv("TRAVEL_BATCH_INLINE_MAX", "4"))
+# Seconds to wait on the pool before finishing a batch in-process.
+BATCH_TIMEOUT = float(os.getenv("TRAVEL_BATCH_TIMEOUT", "60"))
+
+
+class BatchItineraryRequest(BaseModel):
+    requests: conlist(ItineraryRequest, min_length=1, max_length=BATCH_MAX_ITEMS)
+
+
+class BatchItineraryResult(BaseModel):
+    index: int
+    status: int
+    itinerary: Optional[ItineraryResponse] = None
+    error: Optional[str] = None
+
+
+class BatchItineraryResponse(BaseModel):
+    results: List[BatchItineraryResult]
+    summary: Dict[str, Any]
+
+
+# (HTTP status, response or error message)
+Outcome = Tuple[int, Union[ItineraryResponse, str]]
+# A request with the destination id and hidden gem tags it was keyed on.
+Task = Tuple[ItineraryRequest, Optional[str], Tuple[str, ...]]
+
+# Groups requests whose destination isn't in the catalog (they fail fast).
+_UNRESOLVED = "unresolved"
+
+_worker_store: Optional[DataStore] = None
+
+
+def _init_worker() -> None:
+    """Open this worker's store and load what itinerary builds read."""
+    global _worker_store
+    _worker_store = data_loader.DATA_STORE
+    snapshot = _worker_store.snapshot()
+    for destination in snapshot.destinations:
+        snapshot.spots_for(destination["id"])
+        compiled_profile(snapshot, destination)
+
+
+def _build(snapshot: DataSnapshot, request: ItineraryRequest) -> Outcome:
+    try:
+        return 200, generate_itinerary_local(snapshot, request)
+    except ValueError as exc:
+        return 400, str(exc)
+    except Exception:
+        logger.exception("Batch itinerary failed for %s", request.destination)
+        return 500, "Itinerary generation failed."
+
+
+def _build_in_worker(task: Task) -> Outcome:
+    request, destination_id, tags = task
+    snapshot = _worker_store.snapshot()
+    if destination_id is not None and isinstance(snapshot, DataSnapshot):
+        # In-memory tags exist only in the server; use the ones it keyed on.
+        tagged = {
+            key: value
+            for key, value in snapshot.tagged_hidden_gems.items()
+            if key != destination_id
+        }
+        if tags:
+            tagged[destination_id] = tags
+        snapshot = replace(snapshot, tagged_hidden_gems=tagged)
+    return _build(snapshot, request)
+
+
+def _ready() -> None:
+    """No-op task that makes the pool start a worker."""
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+class ItineraryBatcher:
+    """Runs itinerary batches, owning the worker pool they fan out to.
+
+    ``workers=0`` builds everything in-process.
+    """
+
+    def __init__(
+        self,
+        store: DataStore,
+        workers: int = BATCH_WORKERS,
+        inline_max: int = BATCH_INLINE_MAX,
+        timeout: float = BATCH_TIMEOUT,
+    ) -> None:
+        self.store = store
+        self._context = _worker_context()
+        self.workers = workers
+        self.inline_max = inline_max
+        self.timeout = timeout
+        self._lock = Lock()
+        self._pool: Optional[Executor] = None
+        self._pool_version = 0
+
+    def _executor(self, version: int) -> Executor:
+        with self._lock:
+            if self._pool is not None and self._pool_version != version:
+                # In-flight batches finish on the old workers.
+                self._pool.shutdown(wait=False)
+                self._pool = None
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=self._context,
+                    initializer=_init_worker,
+                )
+                self._pool_version = version
+            return self._pool
+
+    def start(self) -> None:
+        """Start the workers now instead of on the first large batch."""
+        if self.workers:
+            pool = self._executor(self.store.snapshot().catalog_version)
+            for _ in range(self.workers):
+                pool.submit(_ready)
+
+    def _discard(self, pool: Executor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _build_in_pool(self, version: int, tasks: List[Task]) -> List[Outcome]:
+        """Outcomes in order; shorter than ``tasks`` if the pool failed."""
+        pool = self._executor(version)
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+        built: List[Outcome] = []
+        try:
+            for outcome in pool.map(
+                _build_in_worker, tasks, chunksize=chunksize, timeout=self.timeout
+            ):
+                built.append(outcome)
+        except (TimeoutError, BrokenExecutor):
+            logger.warning(
+                "Batch workers failed after %d of %d itineraries; finishing in-process",
+                len(built),
+                len(tasks),
+                exc_info=True,
+            )
+            self._discard(pool)
+        return built
+
+    def run(self, requests: List[ItineraryRequest]) -> BatchItineraryResponse:
+        snapshot = self.store.snapshot()
+        ITINERARY_CACHE.advance(snapshot.catalog_version)
+
+        # Identical requests (same cache key) are built once.
+        groups: Dict[Hashable, List[int]] = {}
+        for index, request in enumerate(requests):
+            key = itinerary_cache_key(snapshot, request)
+            group = key if key is not None else (_UNRESOLVED, request.destination)
+            groups.setdefault(group, []).append(index)
+
+        outcomes: Dict[Hashable, Outcome] = {}
+        pending: List[Tuple[Hashable, ItineraryRequest]] = []
+        for group, indexes in groups.items():
+            cached = ITINERARY_CACHE.get(group) if group[0] is not _UNRESOLVED else None
+            if cached is not None:
+                outcomes[group] = (200, cached)
+            else:
+                pending.append((group, cache_request(requests[indexes[0]])))
+
+        # Workers read the data files themselves, so they only build while
+        # those still match this snapshot (no refresh pending).
+        workers = (
+            self.workers
+            if len(pending) > self.inline_max and not self.store.changed_sources()
+            else 0
+        )
+        built = (
+            self._build_in_pool(
+                snapshot.catalog_version,
+                [
+                    (request, None, ()) if group[0] is _UNRESOLVED else (request, group[1], group[2])
+                    for group, request in pending
+                ],
+            )
+            if workers
+            else []
+        )
+        built += [_build(snapshot, request) for _, request in pending[len(built) :]]
+        for (group, _), outcome in zip(pending, built):
+            outcomes[group] = outcome
+            status, payload = outcome
+            if status == 200:
+                ITINERARY_CACHE.put(group, payload, snapshot.catalog_version)
+
+        results: List[Optional[BatchItineraryResult]] = [None] * len(requests)
+        failed = 0
+        for group, indexes in groups.items():
+            status, payload = outcomes[group]
+            for index in indexes:
+                if status == 200:
+                    itinerary = echo_request(payload, requests[index])
+                    results[index] = BatchItineraryResult(
+                        index=index, status=status, itinerary=itinerary
+                    )
+                else:
+                    failed += 1
+                    results[index] = BatchItineraryResult(index=index, status=status, error=payload)
+
+        return BatchItineraryResponse(
+            results=results,
+            summary={
+                "total": len(requests),
+                "unique": len(groups),
+                "cached": len(groups) - len(pending),
+                "built": len(pending),
+                "failed": failed,
+                "workers": workers,
+                "dataVersion": snapshot.version,
+            },
+        )
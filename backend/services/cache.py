@@ -0,0 +1,200 @@
+"""Small in-process caches shared by the services."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from threading import Event, Lock
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Entries are stamped with the data version (``generation``) they were
+    computed from, and ``get`` with a generation treats an entry from any
+    other one as a miss, so a request pinned to an older snapshot never
+    reads values built from newer data (or the reverse). ``advance`` moves
+    the cache to a newer version and drops everything older at once, so a
+    data change frees the previous data's entries; puts from requests still
+    pinned to an older version are kept until then.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = max(0, capacity)
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, V]]" = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def advance(self, generation: int) -> None:
+        """Drop every entry if ``generation`` is newer than the cached one."""
+        if generation <= self.generation:
+            return
+        with self._lock:
+            if generation > self.generation:
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+                self.generation = generation
+
+    def get(self, key: Hashable, generation: Optional[int] = None) -> Optional[V]:
+        """Cached value for ``key``; only one built at ``generation``, if given."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (generation is not None and entry[1] != generation):
+                self.misses += 1
+                return None
+            expires_at, _, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: V, generation: int) -> None:
+        if not self.capacity:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "ttlSeconds": self.ttl,
+                "dataVersion": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent identical computations into one execution.
+
+    The first caller for a key runs the computation; callers arriving
+    while it is in flight wait for and share its result (or exception).
+    Nothing is kept afterwards, so this complements a cache rather than
+    replacing it: it only collapses a burst of simultaneous misses.
+
+    ``do`` is for threads (sync handlers, the threadpool); ``do_async`` is
+    for coroutines and shares one task per key and event loop, shielded so
+    a cancelled waiter doesn't cancel it for the others.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._tasks: Dict[Tuple[int, Hashable], "asyncio.Future[Any]"] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def do(self, key: Hashable, compute: Callable[[], V]) -> V:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = compute()
+        except BaseException as exc:
+            flight.error = exc
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.value
+
+    async def do_async(self, key: Hashable, compute: Callable[[], Awaitable[V]]) -> V:
+        loop_key = (id(asyncio.get_running_loop()), key)
+        # Only touched from the loop's own thread, so no lock is needed.
+        task = self._tasks.get(loop_key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._tasks[loop_key] = task
+            task.add_done_callback(lambda done: self._finish(loop_key, done))
+            with self._lock:
+                self.executions += 1
+        else:
+            with self._lock:
+                self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, loop_key: Tuple[int, Hashable], task: "asyncio.Future[Any]") -> None:
+        self._tasks.pop(loop_key, None)
+        if task.cancelled() or task.exception() is not None:
+            with self._lock:
+                self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self.executions + self.coalesced
+            return {
+                "inFlight": len(self._flights) + len(self._tasks),
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "coalescedRate": round(self.coalesced / calls, 4) if calls else 0.0,
+                "errors": self.errors,
+            }
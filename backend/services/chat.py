@@ -1,92 +1,317 @@
-from typing import Any, Dict, List, Optional
+import asyncio
+import re
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from ..data_loader import DataStore
-from .alerts import generate_destination_alerts
+from ..data_loader import DataSnapshot, DataStore
+from ..keyword_matcher import KeywordMatcher
+from .alerts import destination_alerts
+from .cache import TTLCache
+from .sessions import CHAT_SESSIONS, SESSION_ID_MAX_LENGTH, ChatSession, SessionStore
 
 
 class ChatRequest(BaseModel):
     message: str
     context: Optional[Dict[str, Any]] = None
+    # Opt-in server-side session: later turns may omit what earlier ones set.
+    sessionId: Optional[str] = Field(default=None, min_length=1, max_length=SESSION_ID_MAX_LENGTH)
 
 
 class ChatResponse(BaseModel):
     reply: str
     sources: List[Dict[str, str]]
     confidence: float
+    sessionId: Optional[str] = None
+
+
+# Alternatives further than this from the asked-about spot rank last.
+ALTERNATIVE_RADIUS_KM = 15.0
+
+# Posts retrieved from the search index as supporting sources per reply.
+CHAT_SEARCH_SOURCES = 3
+
+# Search sourceType -> chat source type.
+POST_SOURCE_TYPES = {"blog": "blog", "instagram": "insta"}
+
+# Intents in priority order: the first one a message mentions is answered.
+INTENT_KEYWORDS: Sequence[Tuple[str, Tuple[str, ...]]] = (
+    ("crowd", ("crowd", "busy")),
+    ("alternative", ("alternate", "instead", "option")),
+    ("weather", ("weather", "rain", "snow")),
+    ("road", ("road", "closure", "traffic")),
+    ("hidden_gem", ("hidden gem", "offbeat")),
+)
+
+# (kind, key): ("intent", name), ("spot", position in spots_for) or
+# ("destination", id).
+Keyword = Tuple[str, Any]
+
+
+@dataclass
+class MessageMatch:
+    """What one scan of a lowercased message found."""
+
+    intents: Set[str] = field(default_factory=set)
+    # Earliest spot in catalog order whose name or id appears anywhere.
+    spot_position: Optional[int] = None
+    # First destination named as a whole word.
+    destination_id: Optional[str] = None
+
+
+def compile_matcher(
+    snapshot: DataSnapshot, destination: Dict[str, Any]
+) -> KeywordMatcher[Keyword]:
+    """Intent keywords, every destination and ``destination``'s spots in one automaton."""
+    keywords: List[Tuple[str, Keyword]] = [
+        (keyword, ("intent", intent))
+        for intent, intent_keywords in INTENT_KEYWORDS
+        for keyword in intent_keywords
+    ]
+    for record in snapshot.destinations:
+        keywords.append((record["name"].lower(), ("destination", record["id"])))
+        keywords.append((record["id"].lower(), ("destination", record["id"])))
+    for position, spot in enumerate(snapshot.spots_for(destination["id"])):
+        keywords.append((spot["name"].lower(), ("spot", position)))
+        keywords.append((spot["id"].lower(), ("spot", position)))
+    return KeywordMatcher(keywords)
+
+
+# Compiled matchers keyed by destination id, stamped with their catalog version.
+MATCHER_CACHE: TTLCache[KeywordMatcher[Keyword]] = TTLCache(capacity=256, ttl=float("inf"))
+
+
+def chat_matcher(snapshot: DataSnapshot, destination: Dict[str, Any]) -> KeywordMatcher[Keyword]:
+    MATCHER_CACHE.advance(snapshot.catalog_version)
+    matcher = MATCHER_CACHE.get(destination["id"], snapshot.catalog_version)
+    if matcher is None:
+        matcher = compile_matcher(snapshot, destination)
+        MATCHER_CACHE.put(destination["id"], matcher, snapshot.catalog_version)
+    return matcher
+
+
+# Streamed chat: ``delta`` events carry reply text as it is produced, then
+# one ``done`` event carries the full reply, sources and confidence.
+ChatEvent = Tuple[str, Dict[str, Any]]
+
+# Produces reply text for a message, grounded on the rule-based answer.
+# A retrieval- or LLM-backed model streams its own tokens; the default
+# replays the rule-based reply.
+ReplyModel = Callable[[str, "ChatResponse"], AsyncGenerator[str, None]]
+
+# A sentence runs to terminal punctuation followed by whitespace (so "1.8"
+# stays whole), or to the end of the text.
+_SENTENCE = re.compile(r".*?(?:[.!?]+(?:\s+|$)|$)", re.S)
+
+
+async def sentence_chunks(message: str, grounding: "ChatResponse") -> AsyncGenerator[str, None]:
+    """The rule-based reply one sentence at a time; chunks join back to it exactly."""
+    for sentence in _SENTENCE.findall(grounding.reply):
+        if sentence:
+            yield sentence
+
+
+def _whole_word(text: str, start: int, end: int) -> bool:
+    return (start == 0 or not text[start - 1].isalnum()) and (
+        end == len(text) or not text[end].isalnum()
+    )
+
+
+def match_message(matcher: KeywordMatcher[Keyword], text: str) -> MessageMatch:
+    match = MessageMatch()
+    destination_start = len(text)
+    for start, end, (kind, key) in matcher.find(text):
+        if kind == "intent":
+            match.intents.add(key)
+        elif kind == "spot":
+            if match.spot_position is None or key < match.spot_position:
+                match.spot_position = key
+        elif start < destination_start and _whole_word(text, start, end):
+            destination_start = start
+            match.destination_id = key
+    return match
 
 
 class ChatService:
     """Rule-based travel assistant that leans on scraped intel."""
 
-    def __init__(self, store: DataStore) -> None:
+    def __init__(
+        self,
+        store: DataStore,
+        sessions: SessionStore = CHAT_SESSIONS,
+        model: ReplyModel = sentence_chunks,
+    ) -> None:
         self.store = store
+        self.sessions = sessions
+        self.model = model
 
-    def respond(self, message: str, context: Optional[Dict[str, Any]] = None) -> ChatResponse:
+    def respond(
+        self,
+        message: str,
+        context: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> ChatResponse:
         text = message.lower()
-        destination = self._resolve_destination(context)
-        alerts = generate_destination_alerts(destination, self.store.alerts)
-        spot = self._detect_spot(text) if destination["id"] == "shimla" else None
-        sources: List[Dict[str, str]] = []
-
-        if "crowd" in text or "busy" in text:
-            reply, source = self._crowd_update(destination, spot)
-            if source:
-                sources.append(source)
-            return ChatResponse(reply=reply, sources=sources, confidence=0.84)
-
-        if "alternate" in text or "instead" in text or "option" in text:
-            reply, source = self._suggest_alternative(destination, spot, context)
-            if source:
-                sources.append(source)
-            return ChatResponse(reply=reply, sources=sources, confidence=0.8)
-
-        if "weather" in text or "rain" in text or "snow" in text:
-            reply, source = self._weather_brief(destination, alerts)
-            if source:
-                sources.append(source)
-            return ChatResponse(reply=reply, sources=sources, confidence=0.78)
-
-        if "road" in text or "closure" in text or "traffic" in text:
-            reply, source = self._road_status(destination, alerts)
-            if source:
-                sources.append(source)
-            return ChatResponse(reply=reply, sources=sources, confidence=0.82)
-
-        if "hidden gem" in text or "offbeat" in text:
-            reply, source = self._hidden_gem_tip(destination)
-            if source:
-                sources.append(source)
-            return ChatResponse(reply=reply, sources=sources, confidence=0.76)
-
-        reply = self._general_answer(destination, spot)
-        return ChatResponse(reply=reply, sources=sources, confidence=0.7)
-
-    def _resolve_destination(self, context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
-        candidate = "shimla"
-        if context:
-            candidate = (
-                context.get("destinationId")
-                or context.get("destination")
-                or context.get("destination_id")
-                or candidate
+        snapshot = self.store.snapshot()
+        session = self.sessions.get(session_id) if session_id else None
+        destination = self._resolve_destination(snapshot, context, session)
+        match = match_message(chat_matcher(snapshot, destination), text)
+        if (
+            match.destination_id not in (None, destination["id"])
+            and self._context_destination(context) is None
+        ):
+            # No destination in context, but the message names one.
+            destination = snapshot.get_destination(match.destination_id)
+            match = match_message(chat_matcher(snapshot, destination), text)
+        spots = snapshot.spots_for(destination["id"])
+        if match.spot_position is not None:
+            spot = spots[match.spot_position]
+        else:
+            spot = self._session_spot(snapshot, destination, session)
+        interests = self._interests(context, session)
+        intents = match.intents
+        source: Optional[Dict[str, str]] = None
+
+        if "crowd" in intents:
+            reply, source = self._crowd_update(snapshot, destination, spot)
+            confidence = 0.84
+        elif "alternative" in intents:
+            reply, source = self._suggest_alternative(snapshot, spots, destination, spot, interests)
+            confidence = 0.8
+        elif "weather" in intents:
+            reply, source = self._weather_brief(destination, self._alerts(snapshot, destination))
+            confidence = 0.78
+        elif "road" in intents:
+            reply, source = self._road_status(destination, self._alerts(snapshot, destination))
+            confidence = 0.82
+        elif "hidden_gem" in intents:
+            reply, source = self._hidden_gem_tip(spots, destination)
+            confidence = 0.76
+        else:
+            reply = self._general_answer(destination, spot)
+            confidence = 0.7
+
+        sources = self._ranked_sources(snapshot, destination, message, source)
+        if session_id:
+            session = session or ChatSession(session_id)
+            self.sessions.put(
+                session.advance(destination["id"], spot["id"] if spot else None, interests, sources)
             )
-        destination = self.store.get_destination(candidate)
+        return ChatResponse(
+            reply=reply, sources=sources, confidence=confidence, sessionId=session_id
+        )
+
+    async def stream(
+        self,
+        message: str,
+        context: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+        model: Optional[ReplyModel] = None,
+    ) -> AsyncGenerator[ChatEvent, None]:
+        """``respond`` as events, so a client can render the reply as it arrives.
+
+        The rule-based answer is computed off the event loop first; ``model``
+        (default ``self.model``) then streams the reply text, grounded on it. Each chunk is yielded
+        as soon as the model produces it and the model is only resumed
+        when the consumer asks for more, so a slow reader throttles the
+        model instead of the reply piling up in memory. Closing the stream
+        early (client gone, reply cancelled) closes the model with it.
+        """
+        grounding = await asyncio.to_thread(self.respond, message, context, session_id)
+        parts: List[str] = []
+        chunks = (model or self.model)(message, grounding)
+        try:
+            async for text in chunks:
+                parts.append(text)
+                yield "delta", {"text": text}
+        finally:
+            await chunks.aclose()
+        yield "done", {
+            "reply": "".join(parts),
+            "sources": grounding.sources,
+            "confidence": grounding.confidence,
+            "sessionId": session_id,
+        }
+
+    @staticmethod
+    def _alerts(snapshot: DataSnapshot, destination: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return destination_alerts(snapshot, destination)
+
+    def _ranked_sources(
+        self,
+        snapshot: DataSnapshot,
+        destination: Dict[str, Any],
+        message: str,
+        source: Optional[Dict[str, str]],
+    ) -> List[Dict[str, str]]:
+        """The reply's own source, then the posts that best match the message."""
+        sources = [source] if source else []
+        for post in snapshot.search_posts(message, destination["id"], k=CHAT_SEARCH_SOURCES):
+            evidence = {"type": POST_SOURCE_TYPES[post["sourceType"]], "id": post["id"]}
+            if evidence not in sources:
+                sources.append(evidence)
+        return sources
+
+    @staticmethod
+    def _context_destination(context: Optional[Dict[str, Any]]) -> Optional[str]:
+        if not context:
+            return None
+        return (
+            context.get("destinationId")
+            or context.get("destination")
+            or context.get("destination_id")
+        )
+
+    def _resolve_destination(
+        self,
+        snapshot: DataSnapshot,
+        context: Optional[Dict[str, Any]],
+        session: Optional[ChatSession] = None,
+    ) -> Dict[str, Any]:
+        candidate = (
+            self._context_destination(context)
+            or (session.destination_id if session else None)
+            or "shimla"
+        )
+        destination = snapshot.get_destination(candidate)
         if not destination:
-            destination = self.store.get_destination("shimla") or self.store.destinations[0]
+            destination = snapshot.get_destination("shimla") or snapshot.destinations[0]
         return destination
 
-    def _detect_spot(self, text: str) -> Optional[Dict[str, Any]]:
-        for spot in self.store.spots:
-            if spot["name"].lower() in text or spot["id"].lower() in text:
-                return spot
-        return None
+    @staticmethod
+    def _session_spot(
+        snapshot: DataSnapshot, destination: Dict[str, Any], session: Optional[ChatSession]
+    ) -> Optional[Dict[str, Any]]:
+        """The spot an earlier turn was about, if the destination is unchanged."""
+        if not session or session.destination_id != destination["id"] or not session.last_spot_id:
+            return None
+        return snapshot.spot_index_for(destination["id"]).get(session.last_spot_id)
+
+    @staticmethod
+    def _interests(context: Optional[Dict[str, Any]], session: Optional[ChatSession]) -> List[str]:
+        interests = (context or {}).get("interests")
+        if interests is None and session:
+            return list(session.interests)
+        return [str(interest).lower() for interest in interests or []]
 
     def _crowd_update(
-        self, destination: Dict[str, Any], spot: Optional[Dict[str, Any]]
+        self,
+        snapshot: DataSnapshot,
+        destination: Dict[str, Any],
+        spot: Optional[Dict[str, Any]],
     ) -> tuple[str, Optional[Dict[str, str]]]:
-        if destination["id"] != "shimla" or not spot:
+        if not spot:
             best_time = destination.get("bestTime", "typical shoulder months")
             reply = (
                 f"{destination['name']} is calmest on weekday mornings before 10 AM. "
@@ -94,10 +319,7 @@ class ChatService:
                 "Book key attractions in advance and keep a backup cafe/park in mind."
             )
             return reply, {"type": "destination", "id": destination["id"]}
-        related_post = next(
-            (post for post in self.store.insta_posts if spot["name"] in post.get("geoTags", [])),
-            None,
-        )
+        related_post = snapshot.insta_post_geotagged(spot["name"])
         crowd_level = spot.get("crowdScore", 6)
         reply = (
             f"{spot['name']} is currently rated {crowd_level}/10 on crowd scale. "
@@ -108,24 +330,51 @@ class ChatService:
             return reply, {"type": "insta", "id": related_post["id"]}
         return reply, None
 
+    def _nearest_first(
+        self,
+        snapshot: DataSnapshot,
+        spots: List[Dict[str, Any]],
+        destination: Dict[str, Any],
+        spot: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """``spots`` reordered closest-first around ``spot`` via the spatial index."""
+        if not spot or spot.get("lat") is None or spot.get("lng") is None:
+            return spots
+        nearby = snapshot.spots_nearby(
+            spot["lat"], spot["lng"], radius_km=ALTERNATIVE_RADIUS_KM, k=len(spots)
+        )
+        order = {
+            hit["id"]: rank
+            for rank, hit in enumerate(nearby)
+            if hit["destinationId"] == destination["id"]
+        }
+        return sorted(spots, key=lambda candidate: order.get(candidate["id"], len(order)))
+
     def _suggest_alternative(
         self,
+        snapshot: DataSnapshot,
+        spots: List[Dict[str, Any]],
         destination: Dict[str, Any],
         spot: Optional[Dict[str, Any]],
-        context: Optional[Dict[str, Any]],
+        interests: List[str],
     ) -> tuple[str, Optional[Dict[str, str]]]:
-        interests = [interest.lower() for interest in (context or {}).get("interests", [])]
-        if destination["id"] == "shimla":
+        # Never suggest the spot the traveller is trying to swap out.
+        others = [
+            s
+            for s in (self._nearest_first(snapshot, spots, destination, spot) if spots else [])
+            if not spot or s["id"] != spot["id"]
+        ]
+        if others:
             candidate = next(
                 (
                     s
-                    for s in self.store.spots
-                    if s != spot and s.get("isHiddenGem") and any(tag in interests for tag in s.get("tags", []))
+                    for s in others
+                    if s.get("isHiddenGem") and any(tag in interests for tag in s.get("tags", []))
                 ),
                 None,
             )
             if not candidate:
-                candidate = next((s for s in self.store.spots if s.get("isHiddenGem")), self.store.spots[0])
+                candidate = next((s for s in others if s.get("isHiddenGem")), others[0])
             reply = (
                 f"Swap {spot['name'] if spot else 'the busy stop'} for {candidate['name']} — "
                 f"{candidate['description']} Crowd score {candidate['crowdScore']}/10 with easier access."
@@ -162,12 +411,12 @@ class ChatService:
         )
 
     def _hidden_gem_tip(
-        self, destination: Dict[str, Any]
+        self, spots: List[Dict[str, Any]], destination: Dict[str, Any]
     ) -> tuple[str, Optional[Dict[str, str]]]:
-        if destination["id"] == "shimla":
-            gem = next((spot for spot in self.store.spots if spot.get("isHiddenGem")), None)
+        if spots:
+            gem = next((spot for spot in spots if spot.get("isHiddenGem")), None)
             if not gem:
-                gem = self.store.spots[0]
+                gem = spots[0]
             reply = f"Hidden gem pick: {gem['name']} — {gem['description']}"
             return reply, {"type": "spot", "id": gem["id"]}
         reply = (
@@ -178,7 +427,7 @@ class ChatService:
     def _general_answer(
         self, destination: Dict[str, Any], spot: Optional[Dict[str, Any]]
     ) -> str:
-        if destination["id"] == "shimla" and spot:
+        if spot:
             return (
                 f"{spot['name']} opens {spot['openingHours']} with entry fee {spot.get('entryFee', 'Free')}."
                 f" Best window: {spot.get('bestTime', 'early morning')}."
@@ -1,12 +1,21 @@
+import asyncio
+import hashlib
+import json
 import os
 from dataclasses import dataclass
 from math import asin, cos, radians, sin, sqrt
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
-from pydantic import BaseModel, Field, conlist
+from pydantic import BaseModel, Field, ValidationError, conlist
 
-from ..data_loader import DataStore
-from .alerts import generate_destination_alerts, summarize_alerts
+from ..data_loader import DATA_DIR, DataSnapshot, DataStore
+from ..spot_columns import SpotColumns
+from .alerts import destination_alerts, summarize_alerts
+from .cache import SingleFlight, TTLCache
+from .llm import LLM_CLIENT, LLMClient, LLMError
+from .llm_cache import LLMResponseCache
+from .routing import RouteMatrix
 
 
 class ItineraryRequest(BaseModel):
@@ -17,8 +26,13 @@ class ItineraryRequest(BaseModel):
     interests: conlist(str, min_length=1)
     month: Optional[str] = None
     use_llm: bool = False
+    optimize_route: bool = Field(
+        default=False, description="Order each day's spots to minimise travel distance"
+    )
 
 
+# The local builders fill these from already-typed catalog data with
+# ``model_construct`` (no validation); LLM replies are always validated.
 class ItinerarySegment(BaseModel):
     timeOfDay: str
     startTime: str
@@ -227,6 +241,45 @@ def _normalize_interests(interests: Sequence[str]) -> List[str]:
     return ordered or ["culture"]
 
 
+# Free-text interests folded onto the builder's interest vocabulary.
+INTEREST_SYNONYMS: Dict[str, str] = {
+    "trek": "trekking",
+    "treks": "trekking",
+    "hike": "trekking",
+    "hikes": "trekking",
+    "hiking": "trekking",
+    "foodie": "food",
+    "cuisine": "food",
+    "street food": "food",
+    "food tour": "food",
+    "eating": "food",
+    "photo": "photography",
+    "photos": "photography",
+    "photo walk": "photography",
+    "relax": "relaxation",
+    "wellness": "relaxation",
+    "spa": "relaxation",
+    "heritage": "culture",
+    "history": "culture",
+    "temples": "culture",
+    "museums": "culture",
+    "adventure sports": "adventure",
+    "rafting": "adventure",
+    "paragliding": "adventure",
+    "wildlife": "nature",
+    "outdoors": "nature",
+    "nature walks": "nature",
+    "markets": "shopping",
+    "shop": "shopping",
+}
+
+
+def canonical_interests(interests: Sequence[str]) -> Tuple[str, ...]:
+    """Interests as an order-free set of canonical names, synonyms folded."""
+    normalized = _normalize_interests(interests)
+    return tuple(sorted({INTEREST_SYNONYMS.get(interest, interest) for interest in normalized}))
+
+
 def _profile_for_category(destination: Dict[str, Any]) -> Dict[str, Any]:
     profile = dict(DEFAULT_PROFILE)
     category = destination.get("primaryCategory")
@@ -279,65 +332,147 @@ def _daily_theme(day_idx: int, destination_name: str, interests: Sequence[str])
     return f"{destination_name} · {focus} (Day {day_idx + 1})"
 
 
-def _build_interest_segment(
+@dataclass(frozen=True)
+class SegmentTemplate:
+    """Pre-rendered text and numbers for one (interest, slot) catalog segment."""
+
+    title: str
+    description: str
+    note: str
+    hidden_note: str
+    start_time: str
+    duration: float
+    distances: Tuple[float, float]
+    travel_tips: Tuple[str, str]
+    entry_fee: str
+
+
+@dataclass(frozen=True)
+class CompiledProfile:
+    """Category profile merged and rendered once for one destination."""
+
+    profile: Dict[str, Any]
+    road_trip: str
+    bike_route: str
+    templates: Dict[Tuple[str, str], SegmentTemplate]
+
+    def template(self, interest: str, slot: str) -> SegmentTemplate:
+        template = self.templates.get((interest, slot))
+        return template if template is not None else self.templates[("culture", slot)]
+
+
+def _compile_template(
     destination: Dict[str, Any],
     profile: Dict[str, Any],
+    behavior: Dict[str, Any],
+    slot: str,
+    start_time: str,
+) -> SegmentTemplate:
+    distance = behavior["distance"].get(slot, list(behavior["distance"].values())[0])
+    # Odd sequence numbers nudge the hop 400 m further.
+    distances = (round(distance, 1), round(distance + 0.4, 1))
+    note = behavior["note"]
+    return SegmentTemplate(
+        title=behavior["title"].format(
+            slot=_slot_label(slot).title(),
+            name=destination["name"],
+            terrain=profile["terrain"],
+        ),
+        description=behavior["description"].format(
+            name=destination["name"],
+            terrain=profile["terrain"],
+            foodHighlights=profile["foodHighlights"],
+            adventureHighlights=profile["adventureHighlights"],
+            photoHighlights=profile["photoHighlights"],
+            natureHighlights=profile["natureHighlights"],
+            shoppingHighlights=profile["shoppingHighlights"],
+        ),
+        note=note,
+        hidden_note=f"{note} Hidden gem: {profile['hiddenGem']}.",
+        start_time=start_time,
+        duration=behavior["duration"].get(slot, list(behavior["duration"].values())[0]),
+        distances=distances,
+        travel_tips=(_travel_tip(distances[0]), _travel_tip(distances[1])),
+        entry_fee=behavior["entryFee"],
+    )
+
+
+def compile_profile(destination: Dict[str, Any]) -> CompiledProfile:
+    profile = _profile_for_category(destination)
+    return CompiledProfile(
+        profile=profile,
+        road_trip=profile["roadTrip"].format(name=destination["name"]),
+        bike_route=profile["bikeRoute"].format(name=destination["name"]),
+        templates={
+            (interest, slot): _compile_template(destination, profile, behavior, slot, start_time)
+            for interest, behavior in INTEREST_BEHAVIORS.items()
+            for slot, start_time, _ in TIME_SLOTS
+        },
+    )
+
+
+# Compiled profiles keyed by destination id, stamped with their catalog version.
+PROFILE_CACHE: TTLCache[CompiledProfile] = TTLCache(capacity=256, ttl=float("inf"))
+
+
+def compiled_profile(snapshot: DataSnapshot, destination: Dict[str, Any]) -> CompiledProfile:
+    PROFILE_CACHE.advance(snapshot.catalog_version)
+    compiled = PROFILE_CACHE.get(destination["id"], snapshot.catalog_version)
+    if compiled is None:
+        compiled = compile_profile(destination)
+        PROFILE_CACHE.put(destination["id"], compiled, snapshot.catalog_version)
+    return compiled
+
+
+def _build_interest_segment(
+    destination: Dict[str, Any],
+    compiled: CompiledProfile,
     interest: str,
     slot: str,
     sequence: int,
-    traveler_type: str,
+    tailored_note: str,
     highlight_hidden: bool,
 ) -> Dict[str, Any]:
-    behavior = INTEREST_BEHAVIORS.get(interest, INTEREST_BEHAVIORS["culture"])
-    slot_word = _slot_label(slot)
-    distance = behavior["distance"].get(slot, list(behavior["distance"].values())[0])
-    distance = round(distance + (sequence % 2) * 0.4, 1)
-    duration = behavior["duration"].get(slot, list(behavior["duration"].values())[0])
-    title = behavior["title"].format(
-        slot=slot_word.title(),
-        name=destination["name"],
-        terrain=profile["terrain"],
-    )
-    description = behavior["description"].format(
-        name=destination["name"],
-        terrain=profile["terrain"],
-        foodHighlights=profile["foodHighlights"],
-        adventureHighlights=profile["adventureHighlights"],
-        photoHighlights=profile["photoHighlights"],
-        natureHighlights=profile["natureHighlights"],
-        shoppingHighlights=profile["shoppingHighlights"],
-    )
-    note = behavior["note"]
-    if highlight_hidden:
-        note += f" Hidden gem: {profile['hiddenGem']}."
-    note += f" Tailored for {traveler_type.title()} pace."
-    food_stop = profile["foodStops"][sequence % len(profile["foodStops"])]
+    template = compiled.template(interest, slot)
+    food_stops = compiled.profile["foodStops"]
     return {
         "timeOfDay": slot,
-        "startTime": TIME_SLOTS[[s[0] for s in TIME_SLOTS].index(slot)][1],
-        "durationHours": duration,
+        "startTime": template.start_time,
+        "durationHours": template.duration,
         "spotId": f"{destination['id']}-{interest}-{slot.lower()}-{sequence}",
-        "title": title,
-        "description": description,
+        "title": template.title,
+        "description": template.description,
         "coordinates": {"lat": 0.0, "lng": 0.0},
-        "entryFee": behavior["entryFee"],
-        "travelDistanceKm": distance,
-        "travelSuggestion": _travel_tip(distance),
-        "foodStop": food_stop,
+        "entryFee": template.entry_fee,
+        "travelDistanceKm": template.distances[sequence % 2],
+        "travelSuggestion": template.travel_tips[sequence % 2],
+        "foodStop": food_stops[sequence % len(food_stops)],
         "interestMatchScore": min(10, 6 + sequence % 4),
-        "notes": note,
+        "notes": (template.hidden_note if highlight_hidden else template.note) + tailored_note,
     }
 
 
 def _build_catalog_days(
-    store: DataStore,
+    store: DataSnapshot,
     request: ItineraryRequest,
     destination: Dict[str, Any],
     interests: List[str],
     alerts: List[Dict[str, Any]],
-    profile: Dict[str, Any],
+    compiled: CompiledProfile,
 ) -> List[DayPlan]:
+    return list(_iter_catalog_days(store, request, destination, interests, alerts, compiled))
+
+
+def _iter_catalog_days(
+    store: DataSnapshot,
+    request: ItineraryRequest,
+    destination: Dict[str, Any],
+    interests: List[str],
+    alerts: List[Dict[str, Any]],
+    compiled: CompiledProfile,
+) -> Iterator[DayPlan]:
     hidden_tagged = destination["id"] in store.tagged_hidden_gems
+    tailored_note = f" Tailored for {request.traveler_type.title()} pace."
     segments_needed = request.days * len(TIME_SLOTS)
     pool: List[Dict[str, Any]] = []
     seq = 0
@@ -347,11 +482,11 @@ def _build_catalog_days(
                 pool.append(
                     _build_interest_segment(
                         destination,
-                        profile,
+                        compiled,
                         interest,
                         slot_name,
                         seq,
-                        request.traveler_type,
+                        tailored_note,
                         highlight_hidden=hidden_tagged and slot_name == "Evening",
                     )
                 )
@@ -361,7 +496,12 @@ def _build_catalog_days(
             if len(pool) >= segments_needed * 2:
                 break
 
-    days: List[DayPlan] = []
+    safety = summarize_alerts(alerts)
+    hidden_gem = (
+        compiled.profile["hiddenGem"]
+        if hidden_tagged
+        else "Hidden gem sourced from travel OS recommendations."
+    )
     pool_idx = 0
     for day_idx in range(request.days):
         day_segments: List[ItinerarySegment] = []
@@ -376,26 +516,23 @@ def _build_catalog_days(
             segment_data["interestMatchScore"] = min(
                 10, segment_data["interestMatchScore"] + (8 if segment_data["spotId"].split("-")[1] in interests else 0)
             )
-            day_segments.append(ItinerarySegment(**segment_data))
+            day_segments.append(ItinerarySegment.model_construct(**segment_data))
         why_plan = {
             "costEstimate": BUDGET_COSTS.get(request.budget, BUDGET_COSTS["medium"]),
-            "safety": summarize_alerts(alerts),
-            "roadTrip": profile["roadTrip"].format(name=destination["name"]),
-            "bikeRoute": profile["bikeRoute"].format(name=destination["name"]),
-            "hiddenGem": profile["hiddenGem"] if hidden_tagged else "Hidden gem sourced from travel OS recommendations.",
+            "safety": safety,
+            "roadTrip": compiled.road_trip,
+            "bikeRoute": compiled.bike_route,
+            "hiddenGem": hidden_gem,
         }
-        days.append(
-            DayPlan(
-                day=day_idx + 1,
-                theme=_daily_theme(day_idx, destination["name"], interests),
-                segments=day_segments,
-                whyPlan=why_plan,
-            )
+        yield DayPlan.model_construct(
+            day=day_idx + 1,
+            theme=_daily_theme(day_idx, destination["name"], interests),
+            segments=day_segments,
+            whyPlan=why_plan,
         )
-    return days
 
 
-# ---- Shimla-specific helpers (reuse rich spot data) ----
+# ---- Spot-backed helpers (destinations with rich spot data, e.g. Shimla) ----
 
 FOOD_DEFAULTS = [
     "Wake & Bake Café",
@@ -433,7 +570,14 @@ def _score_spot(
     traveler_type: str,
     budget: str,
 ) -> float:
-    overlap = _interest_overlap(spot, interests)
+    return _score_with_overlap(
+        spot, _interest_overlap(spot, interests), traveler_type, budget
+    )
+
+
+def _score_with_overlap(
+    spot: Dict[str, Any], overlap: int, traveler_type: str, budget: str
+) -> float:
     if overlap == 0:
         return 0.5
     crowd = spot.get("crowdScore", 5)
@@ -471,30 +615,38 @@ def _hidden_gem_highlight(segments: Sequence[ItinerarySegment]) -> str:
     return f"{gem.title} — linger 20 extra minutes for exclusive frames."
 
 
-def _build_shimla_days(
-    store: DataStore,
-    request: ItineraryRequest,
-    interests: List[str],
-    alerts: List[Dict[str, Any]],
-    profile: Dict[str, Any],
-) -> List[DayPlan]:
+# Spot distance matrices keyed by destination id, stamped with their catalog version.
+ROUTE_CACHE: TTLCache[RouteMatrix] = TTLCache(capacity=64, ttl=float("inf"))
+
+
+def route_matrix(
+    snapshot: DataSnapshot, destination_id: str, spots: List[Dict[str, Any]]
+) -> RouteMatrix:
+    ROUTE_CACHE.advance(snapshot.catalog_version)
+    route = ROUTE_CACHE.get(destination_id, snapshot.catalog_version)
+    if route is None:
+        route = RouteMatrix(spots)
+        ROUTE_CACHE.put(destination_id, route, snapshot.catalog_version)
+    return route
+
+
+def _select_spots_reference(
+    spots: List[Dict[str, Any]], interests: List[str], request: ItineraryRequest
+) -> List[List[Dict[str, Any]]]:
+    """Original per-slot linear scan, kept as the oracle for ``SpotSelector``."""
     scored_spots = sorted(
-        store.spots,
+        spots,
         key=lambda spot: _score_spot(spot, interests, request.traveler_type, request.budget),
         reverse=True,
     )
-    if not scored_spots:
-        raise ValueError("No Shimla spots available.")
-    days: List[DayPlan] = []
     available = scored_spots.copy()
     used_ids: set[str] = set()
-
-    for day_idx in range(request.days):
+    days: List[List[Dict[str, Any]]] = []
+    for _ in range(request.days):
         if not available:
             available = scored_spots.copy()
-        day_segments: List[ItinerarySegment] = []
-        prev_coords: Optional[Tuple[float, float]] = None
-        for slot_idx, (slot_name, start_time, duration) in enumerate(TIME_SLOTS):
+        picks: List[Dict[str, Any]] = []
+        for slot_idx in range(len(TIME_SLOTS)):
             candidate = next(
                 (
                     spot
@@ -505,15 +657,109 @@ def _build_shimla_days(
             )
             if not candidate:
                 candidate = next(
-                    (spot for spot in store.spots if spot["id"] not in used_ids),
-                    store.spots[slot_idx % len(store.spots)],
+                    (spot for spot in spots if spot["id"] not in used_ids),
+                    spots[slot_idx % len(spots)],
                 )
             available = [spot for spot in available if spot["id"] != candidate["id"]]
             used_ids.add(candidate["id"])
+            picks.append(candidate)
+        days.append(picks)
+    return days
+
+
+class SpotSelector:
+    """Hands out spots best score first, matching ``_select_spots_reference``.
+
+    Spots sharing an interest are ranked in one batch by ``SpotColumns``
+    (bitmask overlap, columnar scoring; ties keep catalog order). Spots
+    already used (by id) are dropped lazily when they surface. Once no
+    interest match is left, unused spots follow in catalog order, and after
+    that the catalog cycles by slot.
+    """
+
+    def __init__(
+        self,
+        spots: List[Dict[str, Any]],
+        interests: Sequence[str],
+        traveler_type: str,
+        budget: str,
+        columns: Optional[SpotColumns] = None,
+    ) -> None:
+        columns = columns if columns is not None else SpotColumns(spots)
+        self._ranked = columns.ranked(interests, traveler_type, budget)
+        self._spots = spots
+        self._used: set[str] = set()
+        self._next_unused = 0
+
+    def pick(self, slot_idx: int) -> Dict[str, Any]:
+        spots = self._spots
+        candidate = None
+        for position in self._ranked:
+            if spots[position]["id"] not in self._used:
+                candidate = spots[position]
+                break
+        if candidate is None:
+            while self._next_unused < len(spots) and spots[self._next_unused]["id"] in self._used:
+                self._next_unused += 1
+            if self._next_unused < len(spots):
+                candidate = spots[self._next_unused]
+            else:
+                candidate = spots[slot_idx % len(spots)]
+        self._used.add(candidate["id"])
+        return candidate
+
+
+def _build_spot_days(
+    request: ItineraryRequest,
+    destination: Dict[str, Any],
+    spots: List[Dict[str, Any]],
+    interests: List[str],
+    alerts: List[Dict[str, Any]],
+    compiled: CompiledProfile,
+    route: Optional[RouteMatrix] = None,
+    columns: Optional[SpotColumns] = None,
+) -> List[DayPlan]:
+    return list(
+        _iter_spot_days(request, destination, spots, interests, alerts, compiled, route, columns)
+    )
+
+
+def _iter_spot_days(
+    request: ItineraryRequest,
+    destination: Dict[str, Any],
+    spots: List[Dict[str, Any]],
+    interests: List[str],
+    alerts: List[Dict[str, Any]],
+    compiled: CompiledProfile,
+    route: Optional[RouteMatrix] = None,
+    columns: Optional[SpotColumns] = None,
+) -> Iterator[DayPlan]:
+    name = destination["name"]
+    if not spots:
+        raise ValueError(f"No {name} spots available.")
+    selector = SpotSelector(spots, interests, request.traveler_type, request.budget, columns)
+
+    for day_idx in range(request.days):
+        picks = [selector.pick(slot_idx) for slot_idx in range(len(TIME_SLOTS))]
+        if route is not None:
+            # Same picks (and scores), visited in the shortest order found.
+            by_id = {spot["id"]: spot for spot in picks}
+            picks = [by_id[spot_id] for spot_id in route.order([spot["id"] for spot in picks])]
+
+        day_segments: List[ItinerarySegment] = []
+        prev_coords: Optional[Tuple[float, float]] = None
+        prev_id: Optional[str] = None
+        for slot_idx, ((slot_name, start_time, duration), candidate) in enumerate(
+            zip(TIME_SLOTS, picks)
+        ):
             coords = (candidate["lat"], candidate["lng"])
-            travel_distance = haversine_km(prev_coords, coords) if prev_coords else 0.0
+            if route is not None:
+                travel_distance = route.distance(prev_id, candidate["id"]) if prev_id else 0.0
+            else:
+                travel_distance = haversine_km(prev_coords, coords) if prev_coords else 0.0
             prev_coords = coords
-            segment = ItinerarySegment(
+            prev_id = candidate["id"]
+            segment = ItinerarySegment.model_construct(
                 timeOfDay=slot_name,
                 startTime=start_time,
                 durationHours=duration,
@@ -535,19 +781,16 @@ def _build_shimla_days(
         why_plan = {
             "costEstimate": BUDGET_COSTS.get(request.budget, BUDGET_COSTS["medium"]),
             "safety": summarize_alerts(alerts),
-            "roadTrip": profile["roadTrip"].format(name="Shimla"),
-            "bikeRoute": profile["bikeRoute"].format(name="Shimla"),
+            "roadTrip": compiled.road_trip,
+            "bikeRoute": compiled.bike_route,
             "hiddenGem": _hidden_gem_highlight(day_segments),
         }
-        days.append(
-            DayPlan(
-                day=day_idx + 1,
-                theme=_daily_theme(day_idx, "Shimla", interests),
-                segments=day_segments,
-                whyPlan=why_plan,
-            )
+        yield DayPlan.model_construct(
+            day=day_idx + 1,
+            theme=_daily_theme(day_idx, name, interests),
+            segments=day_segments,
+            whyPlan=why_plan,
         )
-    return days
 
 
 def _build_summary(
@@ -555,9 +798,10 @@ def _build_summary(
     request: ItineraryRequest,
     alerts: List[Dict[str, Any]],
     days: List[DayPlan],
-    profile: Dict[str, Any],
-    store: DataStore,
+    compiled: CompiledProfile,
+    store: DataSnapshot,
 ) -> Dict[str, Any]:
+    profile = compiled.profile
     hidden_count = sum(
         1 for day in days for seg in day.segments if "hidden gem" in seg.notes.lower()
     )
@@ -568,8 +812,8 @@ def _build_summary(
         "budget": request.budget,
         "interests": request.interests,
         "costEstimate": _cost_estimate_total(request.budget, request.days),
-        "roadTripPlan": profile["roadTrip"].format(name=destination["name"]),
-        "bikePlan": profile["bikeRoute"].format(name=destination["name"]),
+        "roadTripPlan": compiled.road_trip,
+        "bikePlan": compiled.bike_route,
         "adventureHighlights": profile["adventureHighlights"],
         "foodHighlights": profile["foodHighlights"],
         "photoHighlights": profile["photoHighlights"],
@@ -582,41 +826,357 @@ def _build_summary(
     }
 
 
-def generate_itinerary_local(
-    store: DataStore, request: ItineraryRequest
-) -> ItineraryResponse:
-    destination = store.get_destination(request.destination)
+def _resolve_destination(snapshot: DataSnapshot, request: ItineraryRequest) -> Dict[str, Any]:
+    destination = snapshot.get_destination(request.destination)
     if not destination:
         raise ValueError(
             f"Destination '{request.destination}' not in catalog yet. Try one from the region guide."
         )
-    profile = _profile_for_category(destination)
-    normalized_interests = _normalize_interests(request.interests)
-    alerts = generate_destination_alerts(destination, store.alerts)
+    return destination
 
-    if destination["id"] == "shimla":
-        days = _build_shimla_days(store, request, normalized_interests, alerts, profile)
-    else:
-        days = _build_catalog_days(
-            store, request, destination, normalized_interests, alerts, profile
+
+class _Plan:
+    """Everything resolved up front for one itinerary, before any day is built."""
+
+    def __init__(self, store: Union[DataStore, DataSnapshot], request: ItineraryRequest) -> None:
+        # Pin one snapshot so a concurrent refresh can't mix catalog and alerts.
+        self.snapshot = snapshot = store.snapshot()
+        self.request = request
+        self.destination = destination = _resolve_destination(snapshot, request)
+        self.compiled = compiled_profile(snapshot, destination)
+        self.interests = _normalize_interests(request.interests)
+        self.alerts = destination_alerts(snapshot, destination)
+        self.spots = snapshot.spots_for(destination["id"])
+
+    @property
+    def title(self) -> str:
+        return f"{self.destination['name']} · {self.destination['region']}"
+
+    def days(self) -> Iterator[DayPlan]:
+        """Day plans in order, each built only when the previous one is taken."""
+        request, destination = self.request, self.destination
+        if not self.spots:
+            return _iter_catalog_days(
+                self.snapshot, request, destination, self.interests, self.alerts, self.compiled
+            )
+        route = (
+            route_matrix(self.snapshot, destination["id"], self.spots)
+            if request.optimize_route
+            else None
+        )
+        return _iter_spot_days(
+            request,
+            destination,
+            self.spots,
+            self.interests,
+            self.alerts,
+            self.compiled,
+            route,
+            self.snapshot.spot_columns_for(destination["id"]),
+        )
+
+    def summary(self, days: List[DayPlan]) -> Dict[str, Any]:
+        request = self.request
+        summary = _build_summary(
+            self.destination, request, self.alerts, days, self.compiled, self.snapshot
+        )
+        if request.optimize_route:
+            summary["routeOptimized"] = bool(self.spots)
+            summary["totalTravelKm"] = round(
+                sum(seg.travelDistanceKm for day in days for seg in day.segments), 2
+            )
+        return summary
+
+
+def generate_itinerary_local(
+    store: Union[DataStore, DataSnapshot], request: ItineraryRequest
+) -> ItineraryResponse:
+    plan = _Plan(store, request)
+    days = list(plan.days())
+    return ItineraryResponse.model_construct(
+        destination=plan.title, month=request.month, days=days, summary=plan.summary(days)
+    )
+
+
+ItineraryKey = Tuple[
+    int, str, Tuple[str, ...], int, str, str, Tuple[str, ...], Optional[str], bool
+]
+
+ITINERARY_CACHE: TTLCache[ItineraryResponse] = TTLCache(
+    capacity=int(os.getenv("TRAVEL_ITINERARY_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("TRAVEL_ITINERARY_CACHE_TTL", "300")),
+)
+
+ITINERARY_FLIGHTS = SingleFlight()
+
+
+def itinerary_cache_key(
+    snapshot: DataSnapshot, request: ItineraryRequest
+) -> Optional[ItineraryKey]:
+    """Everything the local builder's output depends on, or None if unresolvable.
+
+    Keyed on the catalog version plus this destination's hidden gem tags,
+    so tagging one destination leaves every other cached itinerary alone.
+    The traveler type and interests are trimmed and lowercased, interests
+    de-duplicated in order (the order picks segment rotation, so it stays
+    part of the key); misses are built from ``cache_request``.
+    """
+    destination = snapshot.get_destination(request.destination)
+    if not destination:
+        return None
+    normalized = cache_request(request)
+    return (
+        snapshot.catalog_version,
+        destination["id"],
+        snapshot.tagged_hidden_gems.get(destination["id"], ()),
+        request.days,
+        request.budget,
+        normalized.traveler_type,
+        tuple(dict.fromkeys(normalized.interests)),
+        request.month,
+        request.optimize_route,
+    )
+
+
+def cache_request(request: ItineraryRequest) -> ItineraryRequest:
+    """``request`` as cached itineraries are built: the key's normalization."""
+    traveler_type = request.traveler_type.strip().lower()
+    interests = [interest.strip().lower() for interest in request.interests]
+    if traveler_type == request.traveler_type and interests == request.interests:
+        return request
+    return request.model_copy(update={"traveler_type": traveler_type, "interests": interests})
+
+
+def generate_itinerary_cached(
+    store: Union[DataStore, DataSnapshot], request: ItineraryRequest
+) -> ItineraryResponse:
+    """``generate_itinerary_local`` memoized per catalog version in ``ITINERARY_CACHE``.
+
+    Cached responses are shared between requests and must not be mutated.
+    Synthetic alert timestamps are as old as the entry (at most the TTL).
+    """
+    snapshot = store.snapshot()
+    ITINERARY_CACHE.advance(snapshot.catalog_version)
+    key = itinerary_cache_key(snapshot, request)
+    if key is None:
+        return generate_itinerary_local(snapshot, request)
+    response = ITINERARY_CACHE.get(key)
+    if response is None:
+        # A burst of identical misses builds once; the rest share the result.
+        response = ITINERARY_FLIGHTS.do(
+            key, lambda: _build_and_cache(snapshot, cache_request(request), key)
         )
+    return echo_request(response, request)
+
+
+def _build_and_cache(
+    snapshot: DataSnapshot, request: ItineraryRequest, key: ItineraryKey
+) -> ItineraryResponse:
+    response = generate_itinerary_local(snapshot, request)
+    ITINERARY_CACHE.put(key, response, snapshot.catalog_version)
+    return response
+
+
+def echo_request(response: ItineraryResponse, request: ItineraryRequest) -> ItineraryResponse:
+    """``response`` (shared by every request with the same key) for ``request``.
+
+    The summary echoes the traveler type and interests verbatim; everything
+    else matches.
+    """
+    echoed = {"travelerType": request.traveler_type, "interests": request.interests}
+    if any(response.summary.get(field) != value for field, value in echoed.items()):
+        response = response.model_copy(update={"summary": {**response.summary, **echoed}})
+    return response
+
+
+def stream_itinerary(
+    store: Union[DataStore, DataSnapshot], request: ItineraryRequest
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """``generate_itinerary_cached`` as (event, payload) pairs, day by day.
+
+    Yields ``meta`` (title, month, day count), then one ``day`` per
+    ``DayPlan`` as soon as it is built, then ``summary``. An unknown
+    destination raises ``ValueError`` before anything is yielded. A cached
+    response streams straight from the cache; a fresh one is cached once
+    its last day is built.
+    """
+    snapshot = store.snapshot()
+    ITINERARY_CACHE.advance(snapshot.catalog_version)
+    key = itinerary_cache_key(snapshot, request)
+    cached = ITINERARY_CACHE.get(key) if key is not None else None
+    if cached is not None:
+        response = echo_request(cached, request)
+        yield "meta", {
+            "destination": response.destination,
+            "month": response.month,
+            "days": request.days,
+        }
+        for day in response.days:
+            yield "day", day.model_dump()
+        yield "summary", response.summary
+        return
+
+    plan = _Plan(snapshot, cache_request(request))
+    yield "meta", {"destination": plan.title, "month": request.month, "days": request.days}
+    days: List[DayPlan] = []
+    for day in plan.days():
+        days.append(day)
+        yield "day", day.model_dump()
+    response = ItineraryResponse.model_construct(
+        destination=plan.title, month=request.month, days=days, summary=plan.summary(days)
+    )
+    if key is not None:
+        ITINERARY_CACHE.put(key, response, snapshot.catalog_version)
+    yield "summary", echo_request(response, request).summary
+
+
+# Hedged: build the local plan alongside the LLM call and serve it if the
+# LLM misses its deadline or replies with something unusable.
+LLM_HEDGE = os.getenv("TRAVEL_LLM_HEDGE", "1").lower() in ("1", "true", "yes")
+# Spots offered to the LLM as candidates, in catalog order.
+LLM_SPOT_CONTEXT = 20
+
+LLM_CACHE = LLMResponseCache(
+    path=Path(os.getenv("TRAVEL_LLM_CACHE_DB", str(DATA_DIR / "llm_cache.db"))),
+    capacity=int(os.getenv("TRAVEL_LLM_CACHE_SIZE", "5000")),
+    ttl=float(os.getenv("TRAVEL_LLM_CACHE_TTL", str(7 * 24 * 3600))),
+)
+
+
+def llm_cache_key(
+    destination: Dict[str, Any], messages: List[Dict[str, str]], model: str
+) -> str:
+    """The model, destination and a SHA-256 digest of the rendered prompt.
 
-    summary = _build_summary(destination, request, alerts, days, profile, store)
-    return ItineraryResponse(
-        destination=f"{destination['name']} · {destination['region']}",
-        month=request.month,
-        days=days,
-        summary=summary,
+    The prompt holds the canonical request (interest order, casing,
+    duplicates and synonyms don't change it) and the spots and alerts the
+    reply is grounded on, so a data change the LLM would see misses the
+    cache instead of reusing days planned around old spots.
+    """
+    prompt = json.dumps(messages, ensure_ascii=False, sort_keys=True)
+    return json.dumps(
+        [model, destination["id"], hashlib.sha256(prompt.encode("utf-8")).hexdigest()]
     )
 
 
-def generate_itinerary_with_llm(
-    store: DataStore, request: ItineraryRequest
+LLM_SYSTEM_PROMPT = (
+    "You plan day-by-day Indian travel itineraries. Reply with a JSON object "
+    '{"days": [...]} holding exactly one entry per requested day. Each day has '
+    '"day", "theme", "whyPlan" (an object of short strings: costEstimate, safety, '
+    'roadTrip, bikeRoute, hiddenGem) and "segments": one per time of day (Morning, '
+    'Afternoon, Evening), each with "timeOfDay", "startTime", "durationHours", '
+    '"spotId", "title", "description", "coordinates" ({"lat", "lng"}), "entryFee", '
+    '"travelDistanceKm", "travelSuggestion", "foodStop", "interestMatchScore" '
+    '(1-10) and "notes". Prefer the listed spots and respect the active alerts.'
+)
+
+
+def _llm_messages(
+    snapshot: DataSnapshot, request: ItineraryRequest, destination: Dict[str, Any]
+) -> List[Dict[str, str]]:
+    spots = snapshot.spots_for(destination["id"])[:LLM_SPOT_CONTEXT]
+    alerts = destination_alerts(snapshot, destination)
+    trip = {
+        "destination": destination["name"],
+        "region": destination["region"],
+        "days": request.days,
+        "budget": request.budget,
+        "travelerType": request.traveler_type.strip().lower(),
+        "interests": list(canonical_interests(request.interests)),
+        "month": (request.month or "").strip().lower() or None,
+        "alerts": [alert["title"] for alert in alerts],
+        "spots": [
+            {
+                "id": spot["id"],
+                "name": spot["name"],
+                "lat": spot["lat"],
+                "lng": spot["lng"],
+                "entryFee": spot.get("entryFee", "Free"),
+                "tags": list(spot.get("tags", ())),
+            }
+            for spot in spots
+        ],
+    }
+    return [
+        {"role": "system", "content": LLM_SYSTEM_PROMPT},
+        {"role": "user", "content": json.dumps(trip, ensure_ascii=False)},
+    ]
+
+
+def _parse_llm_days(reply: Dict[str, Any], request: ItineraryRequest) -> List[DayPlan]:
+    try:
+        days = [DayPlan.model_validate(day) for day in reply["days"]]
+    except (KeyError, TypeError, ValidationError) as exc:
+        raise LLMError("LLM itinerary did not match the DayPlan schema") from exc
+    if len(days) != request.days:
+        raise LLMError(f"LLM planned {len(days)} days instead of {request.days}")
+    return days
+
+
+async def generate_itinerary_with_llm(
+    store: Union[DataStore, DataSnapshot],
+    request: ItineraryRequest,
+    client: LLMClient = LLM_CLIENT,
+    hedge: bool = LLM_HEDGE,
+    cache: Optional[LLMResponseCache] = LLM_CACHE,
 ) -> ItineraryResponse:
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
+    """LLM-written days on top of the deterministic plan's summary.
+
+    The local plan (needed for the summary anyway) is built in a worker
+    thread while the completion is in flight. With ``hedge`` it is served
+    instead when the LLM fails; otherwise the ``LLMError`` propagates. A
+    missing API key raises a plain ``RuntimeError`` before anything starts.
+    ``summary["generator"]`` says which plan was served.
+
+    Validated LLM responses are kept in ``cache`` under ``llm_cache_key``;
+    a hit reuses the cached days with a fresh summary and skips the call.
+    """
+    if not client.configured:
         raise RuntimeError("OPENAI_API_KEY missing — falling back to deterministic builder.")
-    return generate_itinerary_local(store, request)
+    snapshot = store.snapshot()
+    destination = _resolve_destination(snapshot, request)
+    messages = _llm_messages(snapshot, request, destination)
+    key = llm_cache_key(destination, messages, client.model)
+    cached = await asyncio.to_thread(cache.get, key) if cache is not None else None
+    if cached is not None:
+        days = ItineraryResponse.model_validate_json(cached).days
+    # Started only once nothing but the completion can raise and orphan it.
+    local = asyncio.ensure_future(asyncio.to_thread(generate_itinerary_cached, snapshot, request))
+    if cached is not None:
+        source = "cache"
+    else:
+        try:
+            days = _parse_llm_days(await client.complete_json(messages), request)
+        except LLMError as exc:
+            if not hedge:
+                local.cancel()
+                raise
+            response = await local
+            return response.model_copy(
+                update={
+                    "summary": {**response.summary, "generator": "local", "llmFallback": str(exc)}
+                }
+            )
+        except BaseException:
+            local.cancel()
+            raise
+        source = "upstream"
+    response = await local
+    response = response.model_copy(
+        update={
+            "days": days,
+            "summary": {
+                **response.summary,
+                "generator": "llm",
+                "model": client.model,
+                "llmSource": source,
+            },
+        }
+    )
+    if cache is not None and source == "upstream":
+        await asyncio.to_thread(cache.put, key, response.model_dump_json())
+    return response
+
 
 INTEREST_BEHAVIORS: Dict[str, Dict[str, Any]] = {
     "trekking": {
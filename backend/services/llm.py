@@ -0,0 +1,192 @@
+"""Async client for an OpenAI-compatible chat completions API.
+
+One pooled ``httpx.AsyncClient`` is shared by every request, and a global
+semaphore caps how many completions are in flight, so a slow upstream
+queues callers instead of exhausting connections or workers. Each call
+runs under a single deadline that covers queueing, every attempt and the
+backoff between them. Retryable failures (timeouts, connection errors,
+429 and 5xx) are retried with full-jitter exponential backoff while the
+deadline allows.
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+LLM_BASE_URL = os.getenv("TRAVEL_LLM_BASE_URL", "https://api.openai.com/v1")
+LLM_MODEL = os.getenv("TRAVEL_LLM_MODEL", "gpt-4o-mini")
+# Seconds one completion may take end to end, including queueing and retries.
+LLM_DEADLINE = float(os.getenv("TRAVEL_LLM_DEADLINE", "8"))
+LLM_CONCURRENCY = int(os.getenv("TRAVEL_LLM_CONCURRENCY", "8"))
+LLM_RETRIES = int(os.getenv("TRAVEL_LLM_RETRIES", "2"))
+
+RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504})
+BACKOFF_BASE = 0.2
+BACKOFF_CAP = 2.0
+
+
+class LLMError(RuntimeError):
+    """The completion failed, timed out or returned something unusable."""
+
+
+class LLMClient:
+    """Pooled, rate-limited chat completions with a per-call deadline."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = LLM_BASE_URL,
+        model: str = LLM_MODEL,
+        deadline: float = LLM_DEADLINE,
+        concurrency: int = LLM_CONCURRENCY,
+        retries: int = LLM_RETRIES,
+    ) -> None:
+        self.api_key = api_key if api_key is not None else os.getenv("OPENAI_API_KEY", "")
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.deadline = deadline
+        self.concurrency = max(1, concurrency)
+        self.retries = max(0, retries)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.calls = 0
+        self.attempts = 0
+        self.failures = 0
+        self.in_flight = 0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def _session(self) -> httpx.AsyncClient:
+        # The pool and semaphore belong to the loop that created them.
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._loop is not loop:
+            self._loop = loop
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                ),
+            )
+            self._slots = asyncio.Semaphore(self.concurrency)
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            self._loop = None
+
+    async def complete_json(
+        self, messages: List[Dict[str, str]], deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """The JSON object the model replied with.
+
+        Raises ``LLMError`` if the deadline passes or the reply isn't JSON.
+        """
+        content = await self.complete(
+            messages, deadline, response_format={"type": "json_object"}
+        )
+        try:
+            parsed = json.loads(content)
+        except ValueError as exc:
+            raise LLMError("LLM reply was not valid JSON") from exc
+        if not isinstance(parsed, dict):
+            raise LLMError("LLM reply was not a JSON object")
+        return parsed
+
+    async def complete(
+        self,
+        messages: List[Dict[str, str]],
+        deadline: Optional[float] = None,
+        **options: Any,
+    ) -> str:
+        """Text of the first choice, within ``deadline`` seconds (default ``self.deadline``)."""
+        if not self.configured:
+            raise LLMError("OPENAI_API_KEY missing — falling back to deterministic builder.")
+        budget = self.deadline if deadline is None else deadline
+        self.calls += 1
+        try:
+            return await asyncio.wait_for(self._complete(messages, budget, options), budget)
+        except asyncio.TimeoutError as exc:
+            self.failures += 1
+            raise LLMError(f"LLM missed its {budget:g}s deadline") from exc
+        except LLMError:
+            self.failures += 1
+            raise
+
+    async def _complete(
+        self, messages: List[Dict[str, str]], budget: float, options: Dict[str, Any]
+    ) -> str:
+        expires = time.monotonic() + budget
+        http = self._session()
+        payload = {"model": self.model, "messages": messages, **options}
+        async with self._slots:
+            self.in_flight += 1
+            try:
+                for attempt in range(self.retries + 1):
+                    self.attempts += 1
+                    remaining = max(expires - time.monotonic(), 0.001)
+                    try:
+                        response = await http.post(
+                            "/chat/completions", json=payload, timeout=remaining
+                        )
+                    except httpx.HTTPError as exc:
+                        error: Exception = exc
+                        retry_after = 0.0
+                    else:
+                        if response.status_code < 400:
+                            return _first_choice(response)
+                        if response.status_code not in RETRYABLE_STATUS:
+                            raise LLMError(f"LLM request rejected ({response.status_code})")
+                        error = LLMError(f"LLM upstream error ({response.status_code})")
+                        retry_after = _retry_after(response)
+                    if attempt == self.retries:
+                        raise LLMError(f"LLM failed after {attempt + 1} attempts") from error
+                    # Full jitter keeps retrying callers from stampeding in step.
+                    backoff = min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt)
+                    pause = max(retry_after, random.uniform(0, backoff))
+                    if time.monotonic() + pause >= expires:
+                        raise LLMError("LLM retry would overrun the deadline") from error
+                    await asyncio.sleep(pause)
+            finally:
+                self.in_flight -= 1
+        raise LLMError("LLM retries exhausted")  # pragma: no cover - loop always returns or raises
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "configured": self.configured,
+            "model": self.model,
+            "deadlineSeconds": self.deadline,
+            "concurrency": self.concurrency,
+            "inFlight": self.in_flight,
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "failures": self.failures,
+        }
+
+
+def _first_choice(response: httpx.Response) -> str:
+    try:
+        return response.json()["choices"][0]["message"]["content"]
+    except (ValueError, KeyError, IndexError, TypeError) as exc:
+        raise LLMError("LLM response had no message content") from exc
+
+
+def _retry_after(response: httpx.Response) -> float:
+    try:
+        return float(response.headers.get("retry-after", 0))
+    except ValueError:
+        return 0.0
+
+
+LLM_CLIENT = LLMClient()
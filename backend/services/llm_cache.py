@@ -0,0 +1,144 @@
+"""Disk-backed LRU cache for validated LLM itinerary responses.
+
+LLM completions are the slowest and only metered step of itinerary
+generation, and many trips share a shape. Response JSON is kept in a small
+SQLite database so it survives restarts and is shared by every worker
+process. Entries expire after ``ttl`` seconds; beyond ``capacity`` the
+least recently used ones are evicted.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from threading import Lock, local
+from typing import Any, Callable, Dict, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used);
+"""
+
+
+class LLMResponseCache:
+    """String-keyed, string-valued LRU table in SQLite with hit metrics.
+
+    The database is opened on first use, so merely configuring the cache
+    never touches the disk. Each thread gets its own connection. Hit and
+    miss counters are per process; ``stats`` adds the shared entry count.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        capacity: int,
+        ttl: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.capacity = max(0, capacity)
+        self.ttl = ttl
+        self._clock = clock
+        self._local = local()
+        self._lock = Lock()
+        self._ready = False
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with self._lock:
+                if not self._ready:
+                    connection.executescript(SCHEMA)
+                    self._ready = True
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.capacity:
+            return None
+        connection = self._connection()
+        now = self._clock()
+        row = connection.execute(
+            "SELECT response, created FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None and row[1] + self.ttl <= now:
+            connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            with self._lock:
+                self.expirations += 1
+            row = None
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        connection.execute(
+            "UPDATE llm_cache SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key)
+        )
+        with self._lock:
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        if not self.capacity:
+            return
+        connection = self._connection()
+        now = self._clock()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            size = connection.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            excess = size - self.capacity
+            if excess > 0:
+                connection.execute(
+                    "DELETE FROM llm_cache WHERE key IN"
+                    " (SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        with self._lock:
+            self.writes += 1
+            self.evictions += max(0, excess)
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        size = (
+            self._connection().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            if self.capacity and self.path.exists()
+            else 0
+        )
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": str(self.path),
+                "size": size,
+                "capacity": self.capacity,
+                "ttlSeconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,121 @@
+"""Distance matrices and stop ordering for spot-backed day plans.
+
+``RouteMatrix`` holds great-circle distances between every pair of a
+destination's spots, computed in one vectorized pass when NumPy is
+installed (pure Python otherwise). ``order_stops`` sequences a day's stops
+with nearest-neighbour construction followed by 2-opt, which is exact for
+the three stops of a normal day and cheap for longer ones.
+"""
+
+from __future__ import annotations
+
+from math import asin, cos, radians, sin, sqrt
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional speed-up
+    np = None
+
+EARTH_RADIUS_KM = 6371
+
+
+def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    d_lat = radians(lat2 - lat1)
+    d_lon = radians(lon2 - lon1)
+    a = sin(d_lat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lon / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * asin(sqrt(a))
+
+
+def distance_matrix(coords: Sequence[Tuple[float, float]]) -> List[List[float]]:
+    """Pairwise haversine distances in km, rounded like ``haversine_km``."""
+    if not coords:
+        return []
+    if np is None:
+        return [
+            [round(_haversine(lat1, lon1, lat2, lon2), 2) for lat2, lon2 in coords]
+            for lat1, lon1 in coords
+        ]
+    points = np.radians(np.asarray(coords, dtype=float))
+    lat = points[:, 0]
+    lon = points[:, 1]
+    d_lat = lat[:, None] - lat[None, :]
+    d_lon = lon[:, None] - lon[None, :]
+    cos_lat = np.cos(lat)
+    a = np.sin(d_lat / 2) ** 2 + cos_lat[:, None] * cos_lat[None, :] * np.sin(d_lon / 2) ** 2
+    km = EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    return np.round(km, 2).tolist()
+
+
+class RouteMatrix:
+    """Distances between one destination's spots, addressed by spot id."""
+
+    def __init__(self, spots: Sequence[Dict[str, float]]) -> None:
+        self.index: Dict[str, int] = {}
+        for position, spot in enumerate(spots):
+            self.index.setdefault(spot["id"], position)
+        self.distances = distance_matrix([(spot["lat"], spot["lng"]) for spot in spots])
+
+    def distance(self, from_id: str, to_id: str) -> float:
+        return self.distances[self.index[from_id]][self.index[to_id]]
+
+    def path_length(self, ids: Sequence[str]) -> float:
+        return round(sum(self.distance(a, b) for a, b in zip(ids, ids[1:])), 2)
+
+    def order(self, ids: Sequence[str]) -> List[str]:
+        """``ids`` reordered into the shortest route found between them."""
+        rows = [self.distances[self.index[spot_id]] for spot_id in ids]
+        local = [[row[self.index[spot_id]] for spot_id in ids] for row in rows]
+        return [ids[stop] for stop in order_stops(range(len(ids)), local)]
+
+
+def _path_length(path: Sequence[int], distances: List[List[float]]) -> float:
+    return sum(distances[a][b] for a, b in zip(path, path[1:]))
+
+
+def _nearest_neighbour(
+    start: int, stops: Sequence[int], distances: List[List[float]]
+) -> List[int]:
+    path = [start]
+    remaining = [stop for stop in stops if stop != start]
+    while remaining:
+        row = distances[path[-1]]
+        nearest = min(remaining, key=lambda stop: row[stop])
+        remaining.remove(nearest)
+        path.append(nearest)
+    return path
+
+
+def _two_opt(path: List[int], distances: List[List[float]]) -> List[int]:
+    """Reverse segments of the open path while that shortens it."""
+    improved = True
+    while improved:
+        improved = False
+        for i in range(len(path) - 1):
+            for j in range(i + 1, len(path)):
+                before = distances[path[i - 1]][path[i]] if i else 0.0
+                after = distances[path[j]][path[j + 1]] if j + 1 < len(path) else 0.0
+                new_before = distances[path[i - 1]][path[j]] if i else 0.0
+                new_after = distances[path[i]][path[j + 1]] if j + 1 < len(path) else 0.0
+                if new_before + new_after < before + after - 1e-9:
+                    path[i : j + 1] = reversed(path[i : j + 1])
+                    improved = True
+    return path
+
+
+def order_stops(stops: Sequence[int], distances: List[List[float]]) -> List[int]:
+    """Shortest open path found over ``stops`` (indices into ``distances``).
+
+    Every stop is tried as the start of a nearest-neighbour tour, each tour
+    is refined with 2-opt, and the shortest wins; ties keep the input order.
+    """
+    if len(stops) < 3:
+        return list(stops)
+    best = list(stops)
+    best_length = _path_length(best, distances)
+    for start in stops:
+        path = _two_opt(_nearest_neighbour(start, stops, distances), distances)
+        length = _path_length(path, distances)
+        if length < best_length - 1e-9:
+            best, best_length = path, length
+    return best
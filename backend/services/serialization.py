@@ -0,0 +1,49 @@
+"""JSON encoding for responses the backend built itself.
+
+FastAPI normally turns a returned model back into Python objects, validates
+them against ``response_model`` and then encodes them with ``json.dumps``,
+which costs more than planning the itinerary did. Models built by this
+backend are already typed, so ``ModelResponse`` serializes them straight
+to bytes with pydantic-core. ``FastJSONResponse`` does the same for plain
+dicts and uses orjson when it is installed.
+"""
+
+import json
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse, Response
+
+try:  # Optional: faster encoding of plain dicts and stream events.
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON, matching Starlette's ``JSONResponse`` output."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with ``dumps``."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ModelResponse(Response):
+    """A pydantic model serialized without revalidation.
+
+    Return it from a route that keeps its ``response_model`` for the
+    OpenAPI schema. FastAPI passes ``Response`` objects through untouched.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
@@ -0,0 +1,202 @@
+"""Server-side chat sessions: conversation context kept between turns.
+
+A session remembers what earlier turns resolved (the destination, the
+spots mentioned, the traveller's interests and the last reply's sources)
+so a follow-up message can leave them out. Sessions hold ids, not data
+records, so they stay valid across data refreshes.
+
+All sessions share one LRU bounded three ways: a session count, an idle
+TTL and a byte budget. Each session's footprint is estimated when it is
+stored, and its lists are capped, so no single chat can grow without
+limit. Stored sessions are never mutated; a turn stores a new one.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SESSION_CAPACITY = int(os.getenv("TRAVEL_CHAT_SESSIONS", "10000"))
+SESSION_TTL = float(os.getenv("TRAVEL_CHAT_SESSION_TTL", "1800"))
+SESSION_MAX_BYTES = int(os.getenv("TRAVEL_CHAT_SESSION_BYTES", str(32 * 1024 * 1024)))
+SESSION_ID_MAX_LENGTH = 64
+# Most recent spots and interests remembered per session.
+SESSION_SPOTS = 5
+SESSION_INTERESTS = 12
+SESSION_INTEREST_LENGTH = 48
+
+
+def _footprint(value: Any) -> int:
+    """Approximate bytes held by ``value`` and the containers inside it."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_footprint(key) + _footprint(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_footprint(item) for item in value)
+    return size
+
+
+@dataclass(frozen=True)
+class ChatSession:
+    """What earlier turns of one conversation resolved."""
+
+    session_id: str
+    destination_id: Optional[str] = None
+    # Spots mentioned so far, most recent last.
+    spot_ids: Tuple[str, ...] = ()
+    interests: Tuple[str, ...] = ()
+    sources: Tuple[Dict[str, str], ...] = ()
+    turns: int = 0
+
+    @property
+    def last_spot_id(self) -> Optional[str]:
+        return self.spot_ids[-1] if self.spot_ids else None
+
+    def advance(
+        self,
+        destination_id: str,
+        spot_id: Optional[str],
+        interests: List[str],
+        sources: List[Dict[str, str]],
+    ) -> "ChatSession":
+        """The session after one more turn."""
+        spot_ids = self.spot_ids if destination_id == self.destination_id else ()
+        if spot_id is not None:
+            spot_ids = tuple(seen for seen in spot_ids if seen != spot_id) + (spot_id,)
+        return ChatSession(
+            session_id=self.session_id,
+            destination_id=destination_id,
+            spot_ids=spot_ids[-SESSION_SPOTS:],
+            interests=tuple(
+                interest[:SESSION_INTEREST_LENGTH] for interest in interests[:SESSION_INTERESTS]
+            ),
+            sources=tuple(sources),
+            turns=self.turns + 1,
+        )
+
+    def footprint(self) -> int:
+        return sys.getsizeof(self) + sum(_footprint(getattr(self, f.name)) for f in fields(self))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "sessionId": self.session_id,
+            "destinationId": self.destination_id,
+            "spotIds": list(self.spot_ids),
+            "interests": list(self.interests),
+            "sources": list(self.sources),
+            "turns": self.turns,
+        }
+
+
+class SessionStore:
+    """Thread-safe LRU of chat sessions with an idle TTL and a byte budget.
+
+    Reading a session refreshes it, so the LRU order is also idle order:
+    expired sessions are always at the cold end and are swept from there
+    on every access. A store evicts from the same end while it holds more
+    than ``capacity`` sessions or more than ``max_bytes`` of footprint.
+    """
+
+    def __init__(
+        self,
+        capacity: int = SESSION_CAPACITY,
+        ttl: float = SESSION_TTL,
+        max_bytes: int = SESSION_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = max(0, capacity)
+        self.ttl = ttl
+        self.max_bytes = max(0, max_bytes)
+        self._clock = clock
+        self._lock = Lock()
+        # session id -> (last used, footprint, session)
+        self._entries: "OrderedDict[str, Tuple[float, int, ChatSession]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expire(self, now: float) -> None:
+        while self._entries:
+            session_id, (last_used, size, _) = next(iter(self._entries.items()))
+            if last_used + self.ttl > now:
+                return
+            del self._entries[session_id]
+            self.bytes -= size
+            self.expirations += 1
+
+    def get(self, session_id: str) -> Optional[ChatSession]:
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            _, size, session = entry
+            self._entries[session_id] = (now, size, session)
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return session
+
+    def put(self, session: ChatSession) -> None:
+        if not self.capacity:
+            return
+        size = session.footprint()
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            previous = self._entries.pop(session.session_id, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[session.session_id] = (now, size, session)
+            self.bytes += size
+            while len(self._entries) > self.capacity or (
+                self.bytes > self.max_bytes and len(self._entries) > 1
+            ):
+                _, (_, evicted, _) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def discard(self, session_id: str) -> bool:
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is None:
+                return False
+            self.bytes -= entry[1]
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire(self._clock())
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "ttlSeconds": self.ttl,
+                "bytes": self.bytes,
+                "maxBytes": self.max_bytes,
+                "avgSessionBytes": self.bytes // len(self._entries) if self._entries else 0,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+CHAT_SESSIONS = SessionStore()
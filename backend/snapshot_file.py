@@ -0,0 +1,104 @@
+"""Pre-compiled binary data snapshots for fast cold starts.
+
+File layout::
+
+    MAGIC (8 bytes) | header length (uint32, little endian) | header JSON | sections
+
+The header records the format version, the fingerprint of every source file
+the snapshot was compiled from, and the ``[offset, length]`` of one section
+per collection. Each section is a pickle of the collection *and* its indexes,
+so loading skips JSON parsing, record construction and index builds.
+
+The file stays memory-mapped for the life of a ``CompiledSnapshot`` and each
+section is unpickled straight from the mapping, on demand, without an
+intermediate copy; records restore their slots directly instead of re-running
+``__init__``. Replacing the file on disk does not disturb an open mapping.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import pickle
+import struct
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional
+
+MAGIC = b"YGSNAP\x00\x03"
+FORMAT_VERSION = 3
+_LENGTH = struct.Struct("<I")
+_PREFIX_SIZE = len(MAGIC) + _LENGTH.size
+
+
+class SnapshotFormatError(ValueError):
+    """Raised when a snapshot file is not one this build can read."""
+
+
+def write(path: Path, sections: Dict[str, Any], sources: Dict[str, Dict[str, Any]]) -> int:
+    """Atomically write one pickled section per entry; returns the file size."""
+    blobs = {
+        name: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        for name, value in sections.items()
+    }
+    offsets: Dict[str, Any] = {}
+    cursor = 0
+    for name, blob in blobs.items():
+        offsets[name] = [cursor, len(blob)]
+        cursor += len(blob)
+    header = json.dumps(
+        {"format": FORMAT_VERSION, "sources": sources, "sections": offsets}
+    ).encode("utf-8")
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tmp_path.open("wb") as handle:
+        handle.write(MAGIC)
+        handle.write(_LENGTH.pack(len(header)))
+        handle.write(header)
+        for blob in blobs.values():
+            handle.write(blob)
+    os.replace(tmp_path, path)
+    return path.stat().st_size
+
+
+class CompiledSnapshot:
+    """Open, memory-mapped snapshot whose sections load independently."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = Lock()
+        with path.open("rb") as handle:
+            self._mapped: Optional[mmap.mmap] = mmap.mmap(
+                handle.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        try:
+            prefix = self._mapped[:_PREFIX_SIZE]
+            if len(prefix) < _PREFIX_SIZE or prefix[: len(MAGIC)] != MAGIC:
+                raise SnapshotFormatError(f"{path} is not a compiled data snapshot")
+            header_length = _LENGTH.unpack_from(prefix, len(MAGIC))[0]
+            header = json.loads(self._mapped[_PREFIX_SIZE : _PREFIX_SIZE + header_length])
+            if header.get("format") != FORMAT_VERSION:
+                raise SnapshotFormatError(
+                    f"Snapshot format {header.get('format')} unsupported (expected {FORMAT_VERSION})"
+                )
+        except Exception:
+            self.close()
+            raise
+        self.sources: Dict[str, Dict[str, Any]] = header["sources"]
+        self._sections: Dict[str, Any] = header["sections"]
+        self._base = _PREFIX_SIZE + header_length
+
+    def load(self, name: str) -> Any:
+        offset, length = self._sections[name]
+        start = self._base + offset
+        with self._lock:
+            if self._mapped is None:
+                raise SnapshotFormatError(f"{self.path} was closed")
+            with memoryview(self._mapped) as view:
+                return pickle.loads(view[start : start + length])
+
+    def close(self) -> None:
+        with self._lock:
+            if self._mapped is not None:
+                self._mapped.close()
+                self._mapped = None
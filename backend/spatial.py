@@ -0,0 +1,153 @@
+"""Grid spatial index over spot coordinates.
+
+Points are bucketed into fixed-size lat/lng cells (a flat geohash), so a
+bounding box or radius query only visits the handful of cells it overlaps
+instead of every spot. Each point carries the destination id and position
+of its spot so the record itself can be fetched from whichever shard or
+table holds it.
+"""
+
+from __future__ import annotations
+
+import heapq
+from math import asin, cos, floor, radians, sin, sqrt
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+EARTH_RADIUS_KM = 6371
+KM_PER_DEGREE = 111.32
+
+# ~5.5 km cells: a city-scale radius query touches a few dozen at most.
+DEFAULT_CELL_DEGREES = 0.05
+
+
+class SpotPoint(NamedTuple):
+    lat: float
+    lng: float
+    destination_id: str
+    spot_id: str
+    position: int
+
+
+def haversine(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    d_lat = radians(lat2 - lat1)
+    d_lng = radians(lng2 - lng1)
+    a = sin(d_lat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lng / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * asin(sqrt(min(1.0, a)))
+
+
+class SpatialIndex:
+    """Immutable grid of ``SpotPoint`` built once per data version."""
+
+    def __init__(
+        self,
+        points: Iterable[SpotPoint],
+        cell: float = DEFAULT_CELL_DEGREES,
+        sources: Optional[Dict[str, Tuple[int, int]]] = None,
+    ) -> None:
+        self.cell = cell
+        # (mtime_ns, size) of each file the points came from, for staleness checks.
+        self.sources = sources or {}
+        self._cells: Dict[Tuple[int, int], List[SpotPoint]] = {}
+        self.size = 0
+        for point in points:
+            self._cells.setdefault(self._key(point.lat, point.lng), []).append(point)
+            self.size += 1
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _key(self, lat: float, lng: float) -> Tuple[int, int]:
+        return floor(lat / self.cell), floor(lng / self.cell)
+
+    def _scan(
+        self, min_lat: float, min_lng: float, max_lat: float, max_lng: float
+    ) -> Iterator[SpotPoint]:
+        low_row, low_col = self._key(min_lat, min_lng)
+        high_row, high_col = self._key(max_lat, max_lng)
+        if (high_row - low_row + 1) * (high_col - low_col + 1) > len(self._cells):
+            # Box spans more cells than are occupied: walk the occupied ones.
+            for (row, col), points in self._cells.items():
+                if low_row <= row <= high_row and low_col <= col <= high_col:
+                    yield from points
+            return
+        for row in range(low_row, high_row + 1):
+            for col in range(low_col, high_col + 1):
+                yield from self._cells.get((row, col), ())
+
+    def within_bbox(
+        self, min_lat: float, min_lng: float, max_lat: float, max_lng: float, limit: int
+    ) -> List[SpotPoint]:
+        """Points inside the box, ordered by destination and spot position."""
+        hits = [
+            point
+            for point in self._scan(min_lat, min_lng, max_lat, max_lng)
+            if min_lat <= point.lat <= max_lat and min_lng <= point.lng <= max_lng
+        ]
+        hits.sort(key=lambda point: (point.destination_id, point.position))
+        return hits[:limit]
+
+    def nearest(
+        self, lat: float, lng: float, radius_km: float, k: int
+    ) -> List[Tuple[float, SpotPoint]]:
+        """Up to ``k`` (distance km, point) pairs within ``radius_km``, closest first."""
+        lat_span = radius_km / KM_PER_DEGREE
+        lng_span = radius_km / (KM_PER_DEGREE * max(cos(radians(lat)), 0.01))
+        candidates = (
+            (haversine(lat, lng, point.lat, point.lng), point)
+            for point in self._scan(lat - lat_span, lng - lng_span, lat + lat_span, lng + lng_span)
+        )
+        return heapq.nsmallest(
+            k,
+            ((distance, point) for distance, point in candidates if distance <= radius_km),
+            key=lambda pair: (pair[0], pair[1].destination_id, pair[1].position),
+        )
+
+
+def _resolve(snapshot: Any, point: SpotPoint) -> Optional[Mapping[str, Any]]:
+    records = snapshot.spots_for(point.destination_id)
+    if point.position < len(records) and records[point.position]["id"] == point.spot_id:
+        return records[point.position]
+    # The shard moved on since the index was built; fall back to its id index.
+    return snapshot.spot_index_for(point.destination_id).get(point.spot_id.lower())
+
+
+def spots_in_bbox(
+    snapshot: Any,
+    index: SpatialIndex,
+    min_lat: float,
+    min_lng: float,
+    max_lat: float,
+    max_lng: float,
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """Spot records (with ``destinationId``) inside the box."""
+    results = []
+    for point in index.within_bbox(min_lat, min_lng, max_lat, max_lng, limit):
+        spot = _resolve(snapshot, point)
+        if spot is not None:
+            results.append({**spot, "destinationId": point.destination_id})
+    return results
+
+
+def spots_nearby(
+    snapshot: Any, index: SpatialIndex, lat: float, lng: float, radius_km: float, k: int
+) -> List[Dict[str, Any]]:
+    """Closest spot records with ``destinationId`` and ``distanceKm`` added."""
+    results = []
+    for distance, point in index.nearest(lat, lng, radius_km, k):
+        spot = _resolve(snapshot, point)
+        if spot is not None:
+            results.append(
+                {**spot, "destinationId": point.destination_id, "distanceKm": round(distance, 2)}
+            )
+    return results
@@ -0,0 +1,128 @@
+"""Columnar view of a spot collection for batched itinerary scoring.
+
+Built once per spot collection at load time: every distinct (lowercased)
+tag gets a bit position, each spot's tags become a bitmask, and the fields
+``_score_spot`` reads (crowd score, free entry, hidden gem) become parallel
+arrays. Interest overlap is then a popcount of ``mask & interest_mask``
+and a whole collection is scored in a few NumPy operations. Without NumPy
+the same encoding is kept in plain lists and Python ints.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, Iterator, List, Mapping, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional speed-up
+    np = None
+
+WORD_BITS = 64
+WORD_MASK = (1 << WORD_BITS) - 1
+
+# Below this many spots NumPy's per-call overhead outweighs the loop it saves.
+VECTORIZE_MIN_SPOTS = 64
+
+# Traveler types that weigh crowds more heavily (see ``_score_spot``).
+CROWD_AVERSE = frozenset({"couple", "family"})
+
+
+class SpotColumns:
+    """Tag bitmasks plus crowd / free / hidden-gem columns for a spot list."""
+
+    def __init__(self, spots: Sequence[Mapping[str, Any]]) -> None:
+        self.bits: Dict[str, int] = {}
+        masks: List[int] = []
+        crowd: List[float] = []
+        free: List[bool] = []
+        gem: List[bool] = []
+        for spot in spots:
+            mask = 0
+            for tag in spot.get("tags", ()):
+                mask |= 1 << self.bits.setdefault(tag.lower(), len(self.bits))
+            masks.append(mask)
+            crowd.append(spot.get("crowdScore", 5))
+            free.append("free" in spot.get("entryFee", "").lower())
+            gem.append(bool(spot.get("isHiddenGem")))
+        self.size = len(masks)
+        self.words = max(1, -(-len(self.bits) // WORD_BITS))
+        if (
+            np is not None
+            and hasattr(np, "bitwise_count")
+            and self.size >= VECTORIZE_MIN_SPOTS
+        ):
+            self.masks: Any = np.empty((self.size, self.words), dtype=np.uint64)
+            for word in range(self.words):
+                shift = word * WORD_BITS
+                self.masks[:, word] = np.fromiter(
+                    ((mask >> shift) & WORD_MASK for mask in masks), dtype=np.uint64, count=self.size
+                )
+            self.crowd: Any = np.array(crowd, dtype=np.float64)
+            self.free: Any = np.array(free, dtype=bool)
+            self.gem: Any = np.array(gem, dtype=bool)
+            self.vectorized = True
+        else:
+            self.masks, self.crowd, self.free, self.gem = masks, crowd, free, gem
+            self.vectorized = False
+
+    def __len__(self) -> int:
+        return self.size
+
+    def interest_mask(self, interests: Sequence[str]) -> int:
+        """Bits of the interests any spot is tagged with; others can't overlap."""
+        mask = 0
+        for interest in interests:
+            bit = self.bits.get(interest)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def overlaps(self, interests: Sequence[str]) -> Any:
+        """Per-spot count of shared interests (array or list)."""
+        mask = self.interest_mask(interests)
+        if not self.vectorized:
+            return [(spot_mask & mask).bit_count() for spot_mask in self.masks]
+        words = np.array(
+            [(mask >> (word * WORD_BITS)) & WORD_MASK for word in range(self.words)],
+            dtype=np.uint64,
+        )
+        return np.bitwise_count(self.masks & words).sum(axis=1, dtype=np.int64)
+
+    def ranked(self, interests: Sequence[str], traveler_type: str, budget: str) -> Iterator[int]:
+        """Positions of spots sharing an interest, best ``_score_spot`` first.
+
+        Ties keep catalog order, matching a stable descending sort.
+        """
+        overlap = self.overlaps(interests)
+        crowd_base = 10 if traveler_type.lower() in CROWD_AVERSE else 12
+        low_budget = budget == "low"
+        if self.vectorized:
+            candidates = np.flatnonzero(overlap)
+            if not len(candidates):
+                return iter(())
+            scores = (
+                50
+                + overlap[candidates] * 12
+                + (crowd_base - self.crowd[candidates])
+                + (self.free[candidates] * 5 if low_budget else 0)
+                + self.gem[candidates] * 15
+            )
+            order = np.argsort(-scores, kind="stable")
+            return iter(candidates[order].tolist())
+        heap = [
+            (
+                -(
+                    50
+                    + count * 12
+                    + (crowd_base - self.crowd[position])
+                    + (5 if low_budget and self.free[position] else 0)
+                    + (15 if self.gem[position] else 0)
+                ),
+                position,
+            )
+            for position, count in enumerate(overlap)
+            if count
+        ]
+        heapq.heapify(heap)
+        return (heapq.heappop(heap)[1] for _ in range(len(heap)))
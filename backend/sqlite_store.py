@@ -0,0 +1,755 @@
+"""SQLite storage backend for the travel data.
+
+``SQLiteDataStore`` offers the same interface as ``DataStore`` but keeps the
+records in an on-disk database (WAL mode) instead of RAM, so memory stays
+flat as the scraped feeds grow and every uvicorn worker shares one copy.
+Admin filters and pagination run as indexed SQL queries.
+
+The database is filled from the JSON files by ``import_json`` (run on first
+start, by ``refresh`` and by ``scripts/import_sqlite.py``). Hidden gem tags
+and the data version live in the database too, so a tag applied through one
+worker is seen by all of them.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock, local
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from weakref import WeakSet
+
+from . import spatial
+from .data_loader import (
+    DATA_DIR,
+    LEGACY_SPOTS_DESTINATION,
+    RECORD_TYPES,
+    SCRAPED_FEED_KEYS,
+    SCRAPED_SOURCES,
+    SEARCH_FEEDS,
+    SOURCE_FILES,
+    Lazy,
+    SourceState,
+    _index_destinations,
+    _index_spots,
+    _normalize_destination_key,
+    _read_file,
+    _tag_key,
+    next_catalog_version,
+)
+from .search import SearchDocument, SearchIndex
+from .spatial import SpatialIndex, SpotPoint
+from .spot_columns import SpotColumns
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    name TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS destinations (
+    position INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS spots (
+    source TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id_key TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (source, position)
+);
+CREATE INDEX IF NOT EXISTS spots_name ON spots (source, name_key);
+CREATE INDEX IF NOT EXISTS spots_id ON spots (source, id_key);
+CREATE TABLE IF NOT EXISTS scraped (
+    feed TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    destination_id TEXT,
+    destination TEXT,
+    timestamp TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (feed, position)
+);
+CREATE INDEX IF NOT EXISTS scraped_id ON scraped (id);
+CREATE INDEX IF NOT EXISTS scraped_destination_id ON scraped (feed, destination_id, position);
+CREATE INDEX IF NOT EXISTS scraped_destination ON scraped (feed, destination, position);
+CREATE INDEX IF NOT EXISTS scraped_timestamp ON scraped (feed, timestamp);
+CREATE TABLE IF NOT EXISTS scraped_tags (
+    tag TEXT NOT NULL,
+    feed TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (tag, feed, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS hidden_gems (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    destination_id TEXT NOT NULL,
+    item_id TEXT NOT NULL
+);
+-- Databases created before the unique index may hold repeated tags.
+DELETE FROM hidden_gems WHERE seq NOT IN (
+    SELECT MIN(seq) FROM hidden_gems GROUP BY destination_id, item_id
+);
+CREATE UNIQUE INDEX IF NOT EXISTS hidden_gems_item ON hidden_gems (destination_id, item_id);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('version', '1');
+INSERT OR IGNORE INTO meta (key, value) VALUES ('catalog_version', '1');
+"""
+
+# Seconds a process reuses its snapshot before checking whether another
+# process changed the database; its own writes are seen at once.
+VERSION_POLL_SECONDS = float(os.getenv("TRAVEL_DATA_DB_POLL", "1"))
+
+_FEED_ORDER = {name: rank for rank, (name, _) in enumerate(SCRAPED_SOURCES)}
+_SOURCE_TYPES = dict(SCRAPED_SOURCES)
+
+
+def _decode(name: str, data: str) -> Any:
+    return RECORD_TYPES[name](json.loads(data))
+
+
+def _encode(row: Dict[str, Any]) -> str:
+    return json.dumps(row, ensure_ascii=False)
+
+
+class SQLiteSnapshot:
+    """Read view of the database for one data version.
+
+    The catalog, spots, hidden gem tags and the spatial and search indexes
+    are loaded once per snapshot and stay fixed. Scraped feeds are queried
+    on each call so they never need to fit in RAM; those reads see the live
+    database, so a snapshot held across an import returns the new rows.
+    """
+
+    shards = None
+
+    def __init__(self, store: "SQLiteDataStore", version: int, catalog_version: int) -> None:
+        self._store = store
+        self.version = version
+        self.catalog_version = catalog_version
+        self._destinations = Lazy(self._load_destinations)
+        self._tagged = Lazy(store._load_tagged)
+        self._spots: Dict[str, List[Any]] = {}
+        self._indexes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._columns: Dict[str, SpotColumns] = {}
+        self._spots_lock = Lock()
+        self._spatial = Lazy(self._load_spatial)
+        self._search = Lazy(self._load_search)
+
+    def snapshot(self) -> "SQLiteSnapshot":
+        return self
+
+    def _query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[sqlite3.Row]:
+        return self._store._connection().execute(sql, params).fetchall()
+
+    def _load_destinations(self) -> Tuple[List[Any], Dict[str, Any]]:
+        rows = self._query("SELECT data FROM destinations ORDER BY position")
+        records = [_decode("destinations", row["data"]) for row in rows]
+        return records, _index_destinations(records)
+
+    def _load_spatial(self) -> SpatialIndex:
+        shards = {
+            row["name"][len("spots/") :]
+            for row in self._query("SELECT name FROM sources WHERE name LIKE 'spots/%'")
+        }
+        points = []
+        for row in self._query("SELECT source, position, data FROM spots"):
+            if row["source"] == "spots":
+                if LEGACY_SPOTS_DESTINATION in shards:
+                    continue
+                destination_id = LEGACY_SPOTS_DESTINATION
+            else:
+                destination_id = row["source"][len("spots/") :]
+            spot = json.loads(row["data"])
+            if spot.get("lat") is not None and spot.get("lng") is not None:
+                points.append(
+                    SpotPoint(spot["lat"], spot["lng"], destination_id, spot["id"], row["position"])
+                )
+        return SpatialIndex(points)
+
+    def _load_search(self) -> SearchIndex:
+        # Posts are read once for the build; the index keeps (feed, id), which
+        # still names the same post if the feed is re-imported meanwhile.
+        def posts() -> Iterator[Tuple[SearchDocument, Dict[str, Any]]]:
+            for name, source in SCRAPED_SOURCES:
+                if name not in SEARCH_FEEDS:
+                    continue
+                for row in self._query(
+                    "SELECT id, destination_id, destination, data FROM scraped"
+                    " WHERE feed = ? ORDER BY position",
+                    (name,),
+                ):
+                    destination = row["destination_id"] or row["destination"]
+                    document = SearchDocument(source, destination, (name, row["id"]))
+                    yield document, json.loads(row["data"])
+
+        return SearchIndex(posts())
+
+    def residency(self) -> Dict[str, bool]:
+        return {
+            "spots": LEGACY_SPOTS_DESTINATION in self._spots,
+            "destinations": self._destinations.resident,
+            "tagged_hidden_gems": self._tagged.resident,
+            "spatial_index": self._spatial.resident,
+            "search_index": self._search.resident,
+        }
+
+    # ---- Catalog and spots ----
+
+    @property
+    def destinations(self) -> List[Dict[str, Any]]:
+        return self._destinations.get()[0]
+
+    @property
+    def destination_index(self) -> Dict[str, Dict[str, Any]]:
+        return self._destinations.get()[1]
+
+    @property
+    def tagged_hidden_gems(self) -> Dict[str, Tuple[str, ...]]:
+        return self._tagged.get()
+
+    def list_destinations(self) -> List[Dict[str, Any]]:
+        return self.destinations
+
+    def get_destination(self, identifier: str) -> Optional[Dict[str, Any]]:
+        if not identifier:
+            return None
+        return self.destination_index.get(_normalize_destination_key(identifier))
+
+    def _spot_source(self, destination_id: str) -> Optional[str]:
+        shard = f"spots/{destination_id}"
+        if self._query("SELECT 1 FROM sources WHERE name = ?", (shard,)):
+            return shard
+        if destination_id == LEGACY_SPOTS_DESTINATION:
+            return "spots"
+        return None
+
+    def spots_for(self, destination_id: str) -> List[Dict[str, Any]]:
+        """Spots for one destination; empty when it has no spot data yet."""
+        with self._spots_lock:
+            cached = self._spots.get(destination_id)
+        if cached is not None:
+            return cached
+        source = self._spot_source(destination_id)
+        rows = (
+            self._query("SELECT data FROM spots WHERE source = ? ORDER BY position", (source,))
+            if source
+            else []
+        )
+        spots = [_decode("spots", row["data"]) for row in rows]
+        with self._spots_lock:
+            return self._spots.setdefault(destination_id, spots)
+
+    def spot_index_for(self, destination_id: str) -> Dict[str, Dict[str, Any]]:
+        with self._spots_lock:
+            cached = self._indexes.get(destination_id)
+        if cached is not None:
+            return cached
+        index = _index_spots(self.spots_for(destination_id))
+        with self._spots_lock:
+            return self._indexes.setdefault(destination_id, index)
+
+    def spot_columns_for(self, destination_id: str) -> SpotColumns:
+        with self._spots_lock:
+            cached = self._columns.get(destination_id)
+        if cached is not None:
+            return cached
+        columns = SpotColumns(self.spots_for(destination_id))
+        with self._spots_lock:
+            return self._columns.setdefault(destination_id, columns)
+
+    @property
+    def spots(self) -> List[Dict[str, Any]]:
+        return self.spots_for(LEGACY_SPOTS_DESTINATION)
+
+    def spots_in_bbox(
+        self, min_lat: float, min_lng: float, max_lat: float, max_lng: float, limit: int = 500
+    ) -> List[Dict[str, Any]]:
+        return spatial.spots_in_bbox(
+            self, self._spatial.get(), min_lat, min_lng, max_lat, max_lng, limit
+        )
+
+    def spots_nearby(
+        self, lat: float, lng: float, radius_km: float = 10.0, k: int = 10
+    ) -> List[Dict[str, Any]]:
+        return spatial.spots_nearby(self, self._spatial.get(), lat, lng, radius_km, k)
+
+    def get_spot_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        key = name.strip().lower()
+        rows = self._query(
+            "SELECT data FROM spots WHERE source = 'spots' AND (name_key = ? OR id_key = ?)"
+            " ORDER BY position LIMIT 1",
+            (key, key),
+        )
+        return _decode("spots", rows[0]["data"]) if rows else None
+
+    # ---- Scraped feeds ----
+
+    def _feed(
+        self, name: str, where: str = "", params: Tuple[Any, ...] = (), page: str = ""
+    ) -> List[Any]:
+        rows = self._query(
+            f"SELECT data FROM scraped WHERE feed = ?{where} ORDER BY position{page}",
+            (name, *params),
+        )
+        return [_decode(name, row["data"]) for row in rows]
+
+    @property
+    def blog_posts(self) -> List[Dict[str, Any]]:
+        return self._feed("blog_posts")
+
+    @property
+    def insta_posts(self) -> List[Dict[str, Any]]:
+        return self._feed("insta_posts")
+
+    @property
+    def alerts(self) -> List[Dict[str, Any]]:
+        return self._feed("alerts")
+
+    @property
+    def scraped_items(self) -> List[Dict[str, Any]]:
+        """Flatten scraped content for admin UI."""
+        return [
+            {**item, "sourceType": source}
+            for name, source in SCRAPED_SOURCES
+            for item in self._feed(name)
+        ]
+
+    def get_scraped_item(self, item_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT feed, data FROM scraped WHERE id = ? ORDER BY position", (item_id,)
+        )
+        if not rows:
+            return None
+        # Same precedence as the in-memory id index: earlier feeds win.
+        row = min(rows, key=lambda row: _FEED_ORDER[row["feed"]])
+        return {**_decode(row["feed"], row["data"]), "sourceType": _SOURCE_TYPES[row["feed"]]}
+
+    def scraped_for_destination(self, destination: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Feed records whose destinationId or destination equals ``destination``."""
+        return self.query_scraped(destination=destination)
+
+    def query_scraped(
+        self,
+        destination: Optional[str] = None,
+        tag: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """``DataSnapshot.query_scraped`` with filters and paging done in SQL."""
+        where = ""
+        params: Tuple[Any, ...] = ()
+        if destination:
+            where += " AND (destination_id = ? OR destination = ?)"
+            params += (destination, destination)
+        if tag:
+            where += " AND (feed, position) IN (SELECT feed, position FROM scraped_tags WHERE tag = ?)"
+            params += (_tag_key(tag),)
+        if since:
+            where += " AND timestamp >= ?"
+            params += (since,)
+        paged = limit is not None or offset
+        page = " LIMIT ? OFFSET ?" if paged else ""
+        page_params = (limit if limit is not None else -1, offset) if paged else ()
+        result: Dict[str, Any] = {}
+        totals: Dict[str, int] = {}
+        for name, key in SCRAPED_FEED_KEYS.items():
+            result[key] = self._feed(name, where, params + page_params, page)
+            if paged:
+                totals[key] = self._query(
+                    f"SELECT COUNT(*) FROM scraped WHERE feed = ?{where}", (name, *params)
+                )[0][0]
+        if paged:
+            result["total"] = totals
+        return result
+
+    def insta_post_geotagged(self, place: str) -> Optional[Dict[str, Any]]:
+        """First Instagram post geotagged with ``place``."""
+        # LIKE narrows the scan to candidate rows; the exact check is in Python.
+        escaped = place.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        for row in self._query(
+            "SELECT data FROM scraped WHERE feed = 'insta_posts' AND data LIKE ? ESCAPE '\\'"
+            " ORDER BY position",
+            (f"%{escaped}%",),
+        ):
+            post = _decode("insta_posts", row["data"])
+            if place in post.get("geoTags", []):
+                return post
+        return None
+
+    def search_posts(
+        self, query: str, destination: Optional[str] = None, k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """``DataSnapshot.search_posts``; matched posts are fetched by id.
+
+        Posts removed by an import since the index was built are skipped.
+        """
+        results = []
+        for hit in self._search.get().search(query, destination, k):
+            name, item_id = hit.document.ref
+            rows = self._query(
+                "SELECT data FROM scraped WHERE id = ? AND feed = ? ORDER BY position LIMIT 1",
+                (item_id, name),
+            )
+            if rows:
+                post = _decode(name, rows[0]["data"])
+                results.append(
+                    {**post, "sourceType": hit.document.source, "score": round(hit.score, 4)}
+                )
+        return results
+
+    def alerts_for(self, destination_id: str) -> List[Dict[str, Any]]:
+        return self._feed(
+            "alerts", " AND (destination_id = ? OR destination = ?)", (destination_id, destination_id)
+        )
+
+
+# Connections must not cross a fork: children (batch workers) open their own.
+_STORES: "WeakSet[SQLiteDataStore]" = WeakSet()
+
+
+def _forget_connections() -> None:
+    for store in list(_STORES):
+        store._local = local()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_connections)
+
+
+class SQLiteDataStore:
+    """``DataStore`` backed by a SQLite database shared between processes.
+
+    Each thread gets its own connection. Writes (``import_json``,
+    ``mark_hidden_gem``) run in ``BEGIN IMMEDIATE`` transactions and bump the
+    stored data version, which ``snapshot()`` checks so every worker notices
+    changes made by the others. The check runs at most every
+    ``poll_interval`` seconds; writes made through this store are picked
+    up by the next ``snapshot()``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        data_dir: Path = DATA_DIR,
+        auto_import: bool = True,
+        poll_interval: float = VERSION_POLL_SECONDS,
+    ) -> None:
+        self.path = path
+        self.data_dir = data_dir
+        self.poll_interval = poll_interval
+        self._local = local()
+        self._lock = Lock()
+        self._snapshot: Optional[SQLiteSnapshot] = None
+        # Database catalog version -> the process-wide one handed to snapshots.
+        self._catalog: Tuple[int, int] = (0, 0)
+        self._checked_at = float("-inf")
+        self._writes = 0
+        _STORES.add(self)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connection()
+        connection.executescript(SCHEMA)
+        if auto_import and not connection.execute("SELECT 1 FROM sources LIMIT 1").fetchone():
+            self.import_json()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        with self._lock:
+            self._writes += 1
+            self._checked_at = float("-inf")
+
+    def _load_tagged(self) -> Dict[str, Tuple[str, ...]]:
+        tagged: Dict[str, Tuple[str, ...]] = {}
+        for row in self._connection().execute(
+            "SELECT destination_id, item_id FROM hidden_gems ORDER BY seq"
+        ):
+            tagged[row["destination_id"]] = tagged.get(row["destination_id"], ()) + (row["item_id"],)
+        return tagged
+
+    def _versions(self) -> Dict[str, int]:
+        return {
+            row["key"]: int(row["value"])
+            for row in self._connection().execute(
+                "SELECT key, value FROM meta WHERE key IN ('version', 'catalog_version')"
+            )
+        }
+
+    @property
+    def version(self) -> int:
+        return self.snapshot().version
+
+    def snapshot(self) -> SQLiteSnapshot:
+        """Current view; reused until some process bumps the data version."""
+        now = time.monotonic()
+        with self._lock:
+            if self._snapshot is not None and now - self._checked_at < self.poll_interval:
+                return self._snapshot
+            writes = self._writes
+        versions = self._versions()
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != versions["version"]:
+                if self._catalog[0] != versions["catalog_version"]:
+                    self._catalog = (versions["catalog_version"], next_catalog_version())
+                self._snapshot = SQLiteSnapshot(self, versions["version"], self._catalog[1])
+            if self._writes == writes:
+                # Not trusted for the next poll if a write raced the query.
+                self._checked_at = now
+            return self._snapshot
+
+    def residency(self) -> Dict[str, bool]:
+        return self.snapshot().residency()
+
+    def warm(self) -> None:
+        snapshot = self.snapshot()
+        snapshot.destinations
+        snapshot.tagged_hidden_gems
+        snapshot._spatial.get()
+        snapshot._search.get()
+
+    def stats(self) -> Dict[str, Any]:
+        connection = self._connection()
+        return {
+            "backend": "sqlite",
+            "path": str(self.path),
+            "rows": {
+                table: connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("destinations", "spots", "scraped", "hidden_gems")
+            },
+        }
+
+    # ---- Import ----
+
+    def _source_paths(self) -> Dict[str, Path]:
+        paths = {name: self.data_dir / relative for name, relative in SOURCE_FILES.items()}
+        shard_dir = self.data_dir / "spots"
+        if shard_dir.is_dir():
+            for path in sorted(shard_dir.glob("*.json")):
+                paths[f"spots/{path.stem}"] = path
+        return paths
+
+    def _stored_states(self, connection: sqlite3.Connection) -> Dict[str, SourceState]:
+        return {
+            row["name"]: SourceState(row["mtime_ns"], row["size"], row["digest"])
+            for row in connection.execute("SELECT name, mtime_ns, size, digest FROM sources")
+        }
+
+    def changed_sources(self) -> Tuple[Tuple[str, int, int], ...]:
+        """Cheap stat-only probe: source files that differ from the import."""
+        stored = self._stored_states(self._connection())
+        changed = []
+        for name, path in self._source_paths().items():
+            if not path.exists():
+                continue
+            stat = path.stat()
+            state = stored.get(name)
+            if state is None or state.mtime_ns != stat.st_mtime_ns or state.size != stat.st_size:
+                changed.append((name, stat.st_mtime_ns, stat.st_size))
+        shards = {name for name in self._source_paths() if name.startswith("spots/")}
+        changed.extend(
+            (name, 0, 0) for name in stored if name.startswith("spots/") and name not in shards
+        )
+        return tuple(sorted(changed))
+
+    def import_json(self, force: bool = False, clear_tags: bool = False) -> List[str]:
+        """Load JSON sources whose content differs from the database.
+
+        Returns the sources that were (re)imported or removed. Files missing
+        from disk keep their imported rows, except spot shards, which are
+        dropped with their file. ``force`` re-imports everything; with
+        ``force`` or ``clear_tags`` hidden gem tags are cleared too.
+        """
+        with self._write() as connection:
+            stored = self._stored_states(connection)
+            paths = self._source_paths()
+            changed = [
+                name for name in stored if name.startswith("spots/") and name not in paths
+            ]
+            for name in changed:
+                connection.execute("DELETE FROM spots WHERE source = ?", (name,))
+                connection.execute("DELETE FROM sources WHERE name = ?", (name,))
+            for name, path in paths.items():
+                if not path.exists():
+                    continue
+                previous = stored.get(name)
+                stat = path.stat()
+                if (
+                    not force
+                    and previous is not None
+                    and (previous.mtime_ns, previous.size) == (stat.st_mtime_ns, stat.st_size)
+                ):
+                    continue
+                raw, state = _read_file(path)
+                if force or previous is None or previous.digest != state.digest:
+                    self._import_rows(connection, name, json.loads(raw))
+                    changed.append(name)
+                connection.execute(
+                    "INSERT OR REPLACE INTO sources (name, mtime_ns, size, digest) VALUES (?, ?, ?, ?)",
+                    (name, state.mtime_ns, state.size, state.digest),
+                )
+            cleared = 0
+            if force or clear_tags:
+                cleared = connection.execute("DELETE FROM hidden_gems").rowcount
+            if changed or force or cleared:
+                self._bump_version(connection, catalog=bool(changed or force))
+        if changed:
+            # Refresh planner statistics so the feed indexes get used.
+            self._connection().execute("PRAGMA optimize")
+        return sorted(changed)
+
+    def _import_rows(
+        self, connection: sqlite3.Connection, name: str, rows: List[Dict[str, Any]]
+    ) -> None:
+        if name == "destinations":
+            connection.execute("DELETE FROM destinations")
+            connection.executemany(
+                "INSERT INTO destinations (position, id, data) VALUES (?, ?, ?)",
+                [(position, row["id"], _encode(row)) for position, row in enumerate(rows)],
+            )
+        elif name == "spots" or name.startswith("spots/"):
+            connection.execute("DELETE FROM spots WHERE source = ?", (name,))
+            connection.executemany(
+                "INSERT INTO spots (source, position, id_key, name_key, data) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (name, position, row["id"].lower(), row["name"].lower(), _encode(row))
+                    for position, row in enumerate(rows)
+                ],
+            )
+        else:
+            connection.execute("DELETE FROM scraped WHERE feed = ?", (name,))
+            connection.execute("DELETE FROM scraped_tags WHERE feed = ?", (name,))
+            connection.executemany(
+                "INSERT INTO scraped (feed, position, id, destination_id, destination, timestamp, data)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        name,
+                        position,
+                        row["id"],
+                        row.get("destinationId"),
+                        row.get("destination"),
+                        row.get("timestamp"),
+                        _encode(row),
+                    )
+                    for position, row in enumerate(rows)
+                ],
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO scraped_tags (tag, feed, position) VALUES (?, ?, ?)",
+                [
+                    (_tag_key(tag), name, position)
+                    for position, row in enumerate(rows)
+                    for tag in row.get("tags") or ()
+                ],
+            )
+
+    def _bump_version(self, connection: sqlite3.Connection, catalog: bool = False) -> None:
+        """Bump the data version and, for data (not tag) changes, the catalog's."""
+        for key in ("version", "catalog_version") if catalog else ("version",):
+            connection.execute(
+                "UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = ?", (key,)
+            )
+
+    def refresh(self, force: bool = False, keep_tags: bool = False) -> List[str]:
+        """Re-import changed JSON files and, unless ``keep_tags``, clear tags."""
+        return self.import_json(force=force, clear_tags=not keep_tags)
+
+    # ---- DataStore API ----
+
+    @property
+    def spots(self) -> List[Dict[str, Any]]:
+        return self.snapshot().spots
+
+    @property
+    def blog_posts(self) -> List[Dict[str, Any]]:
+        return self.snapshot().blog_posts
+
+    @property
+    def insta_posts(self) -> List[Dict[str, Any]]:
+        return self.snapshot().insta_posts
+
+    @property
+    def alerts(self) -> List[Dict[str, Any]]:
+        return self.snapshot().alerts
+
+    @property
+    def destinations(self) -> List[Dict[str, Any]]:
+        return self.snapshot().destinations
+
+    @property
+    def tagged_hidden_gems(self) -> Dict[str, Tuple[str, ...]]:
+        return self.snapshot().tagged_hidden_gems
+
+    @property
+    def scraped_items(self) -> List[Dict[str, Any]]:
+        return self.snapshot().scraped_items
+
+    def list_destinations(self) -> List[Dict[str, Any]]:
+        return self.snapshot().list_destinations()
+
+    def get_destination(self, identifier: str) -> Optional[Dict[str, Any]]:
+        return self.snapshot().get_destination(identifier)
+
+    def get_spot_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.snapshot().get_spot_by_name(name)
+
+    def mark_hidden_gem(
+        self, item_id: str, destination_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Tag a destination so itineraries elevate hidden gems.
+
+        Unlike the in-memory store, which appends every tag, a repeated tag
+        of the same item is stored once and leaves the data version alone.
+        """
+        current = self.snapshot()
+        candidate = current.get_scraped_item(item_id)
+        if not candidate:
+            raise ValueError(f"No scraped item with id '{item_id}'")
+        target_destination = destination_id or candidate.get("destinationId")
+        if not target_destination and candidate.get("destination"):
+            target_destination = candidate["destination"]
+        destination = current.get_destination(target_destination) if target_destination else None
+        if not destination:
+            raise ValueError(
+                "Destination not resolved for hidden gem tagging; provide destinationId."
+            )
+        dest_id = destination["id"]
+        with self._write() as connection:
+            inserted = connection.execute(
+                "INSERT OR IGNORE INTO hidden_gems (destination_id, item_id) VALUES (?, ?)",
+                (dest_id, item_id),
+            ).rowcount
+            if inserted:
+                self._bump_version(connection)
+        return {
+            "taggedItemId": item_id,
+            "destinationId": dest_id,
+            "note": "Hidden gem boost applied to itinerary scoring.",
+        }
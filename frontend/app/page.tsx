@@ -1,6 +1,6 @@
 "use client";
 
-import { useEffect, useMemo, useState } from "react";
+import { useEffect, useMemo, useRef, useState } from "react";
 import { TripForm } from "@/components/TripForm";
 import { ItineraryCard } from "@/components/ItineraryCard";
 import { AlertsPanel } from "@/components/AlertsPanel";
@@ -29,10 +29,18 @@ export default function HomePage() {
   const [destinationSnapshot, setDestinationSnapshot] = useState<DestinationSnapshot | null>(null);
   const [alerts, setAlerts] = useState<Alert[]>([]);
   const [itinerary, setItinerary] = useState<ItineraryResponse | null>(null);
+  const [streamedDays, setStreamedDays] = useState<DayPlan[]>([]);
   const [loadingItinerary, setLoadingItinerary] = useState(false);
   const [chatOpen, setChatOpen] = useState(false);
   const [chatMessages, setChatMessages] = useState<ChatMessage[]>([]);
   const [chatLoading, setChatLoading] = useState(false);
+  // Server-side chat session: follow-ups can refer back to earlier turns.
+  const chatSessionId = useRef(
+    typeof crypto !== "undefined" && "randomUUID" in crypto
+      ? crypto.randomUUID()
+      : `chat-${Date.now()}-${Math.random().toString(36).slice(2)}`
+  );
+  const chatAbort = useRef<AbortController | null>(null);
   const [scrapedFeed, setScrapedFeed] = useState<ScrapedFeed | null>(null);
   const [taggingId, setTaggingId] = useState<string | null>(null);
   const [adminStatus, setAdminStatus] = useState<string | undefined>();
@@ -110,9 +118,12 @@ export default function HomePage() {
   }) => {
     setLoadingItinerary(true);
     setError(null);
+    setItinerary(null);
+    setStreamedDays([]);
     try {
       setLastFormInterests(formState.interests);
-      const response = await fetch(`${API_BASE}/api/itinerary`, {
+      // Days arrive one NDJSON line at a time so the first renders before the rest are built.
+      const response = await fetch(`${API_BASE}/api/itinerary/stream`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
@@ -124,12 +135,36 @@ export default function HomePage() {
           month: formState.month,
         }),
       });
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         const errorData = await response.json().catch(() => ({ detail: "Failed to generate itinerary" }));
         throw new Error(errorData.detail || `Server error: ${response.status}`);
       }
-      const data = await response.json();
-      setItinerary(data);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      const days: DayPlan[] = [];
+      let meta: { destination: string; month?: string } = { destination: "" };
+      let buffered = "";
+      for (;;) {
+        const { done, value } = await reader.read();
+        buffered += decoder.decode(value, { stream: !done });
+        const lines = buffered.split("\n");
+        buffered = done ? "" : lines.pop() ?? "";
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const event = JSON.parse(line);
+          if (event.type === "meta") {
+            meta = event.data;
+          } else if (event.type === "day") {
+            days.push(event.data);
+            setStreamedDays([...days]);
+          } else if (event.type === "summary") {
+            setItinerary({ destination: meta.destination, month: meta.month, days, summary: event.data });
+          } else if (event.type === "error") {
+            throw new Error(event.data.detail);
+          }
+        }
+        if (done) break;
+      }
     } catch (err) {
       const message = err instanceof Error ? err.message : "Failed to generate itinerary. Please try again.";
       setError(message);
@@ -155,14 +190,22 @@ export default function HomePage() {
   };
 
   const handleChatSend = async (message: string) => {
-    setChatMessages((prev) => [...prev, { role: "user", text: message }]);
+    setChatMessages((prev) => [...prev, { role: "user", text: message }, { role: "assistant", text: "" }]);
     setChatLoading(true);
+    // Closing the chat aborts the request, which cancels the reply server-side.
+    const controller = new AbortController();
+    chatAbort.current = controller;
+    const showReply = (text: string) =>
+      setChatMessages((prev) => [...prev.slice(0, -1), { role: "assistant", text }]);
     try {
-      const response = await fetch(`${API_BASE}/api/chat`, {
+      // Reply text arrives one NDJSON delta at a time, then a final "done" event.
+      const response = await fetch(`${API_BASE}/api/chat/stream`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
+        signal: controller.signal,
         body: JSON.stringify({
           message,
+          sessionId: chatSessionId.current,
           context: {
             ...(itinerary?.summary ?? {}),
             destinationId:
@@ -172,26 +215,48 @@ export default function HomePage() {
           },
         }),
       });
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error(`Chat error: ${response.status}`);
       }
-      const data = await response.json();
-      setChatMessages((prev) => [
-        ...prev,
-        { role: "assistant", text: data.reply || "Sorry, I couldn't process that request." },
-      ]);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let reply = "";
+      let buffered = "";
+      for (;;) {
+        const { done, value } = await reader.read();
+        buffered += decoder.decode(value, { stream: !done });
+        const lines = buffered.split("\n");
+        buffered = done ? "" : lines.pop() ?? "";
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const event = JSON.parse(line);
+          if (event.type === "delta") {
+            reply += event.data.text;
+            showReply(reply);
+          } else if (event.type === "done") {
+            showReply(event.data.reply || "Sorry, I couldn't process that request.");
+          } else if (event.type === "error") {
+            throw new Error(event.data.detail);
+          }
+        }
+        if (done) break;
+      }
     } catch (err) {
+      if (controller.signal.aborted) return;
       const errorMessage = err instanceof Error ? err.message : "Failed to send message";
-      setChatMessages((prev) => [
-        ...prev,
-        { role: "assistant", text: `Error: ${errorMessage}. Please try again.` },
-      ]);
+      showReply(`Error: ${errorMessage}. Please try again.`);
       console.error("Chat error:", err);
     } finally {
+      if (chatAbort.current === controller) chatAbort.current = null;
       setChatLoading(false);
     }
   };
 
+  const handleChatClose = () => {
+    chatAbort.current?.abort();
+    setChatOpen(false);
+  };
+
   const handleTagHiddenGem = async (itemId: string) => {
     setTaggingId(itemId);
     setAdminStatus(undefined);
@@ -216,7 +281,7 @@ export default function HomePage() {
     }
   };
 
-  const heroItinerary = useMemo(() => itinerary?.days ?? [], [itinerary]);
+  const heroItinerary = useMemo(() => itinerary?.days ?? streamedDays, [itinerary, streamedDays]);
 
   return (
     <main className="mx-auto max-w-6xl space-y-12 px-4 py-10">
@@ -296,15 +361,14 @@ export default function HomePage() {
             </div>
           </header>
 
-          {loadingItinerary && <LoadingSkeleton />}
           {!loadingItinerary && heroItinerary.length === 0 && (
             <p className="text-sm text-slate-400">
               Generate a plan to unlock day-by-day strategy, crowd intel, and food pairings.
             </p>
           )}
 
-          {!loadingItinerary &&
-            heroItinerary.map((day: DayPlan) => <ItineraryCard key={day.day} day={day} />)}
+          {heroItinerary.map((day: DayPlan) => <ItineraryCard key={day.day} day={day} />)}
+          {loadingItinerary && <LoadingSkeleton />}
 
           {itinerary && (
             <section className="glass-panel rounded-3xl p-6 shadow-card">
@@ -363,7 +427,7 @@ export default function HomePage() {
 
       <ChatModal
         open={chatOpen}
-        onClose={() => setChatOpen(false)}
+        onClose={handleChatClose}
         onSend={handleChatSend}
         messages={chatMessages}
         loading={chatLoading}
@@ -0,0 +1,94 @@
+"""Benchmark /api/itinerary/batch against sequential single-itinerary calls.
+
+Usage: python scripts/bench_batch.py [--items N] [--duplicates F] [--workers 0,2,4]
+
+Builds N itinerary requests across the catalog (a fraction F of them
+repeats of earlier ones, as in a group booking), then times N POSTs to
+/api/itinerary against one POST to /api/itinerary/batch for each worker
+count (with a freshly started pool, then reusing it). The itinerary cache is
+cleared before every run so each one builds from scratch, and every batch
+result is checked against the single call.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend import main  # noqa: E402
+from backend.services.batch import ItineraryBatcher  # noqa: E402
+from backend.services.itinerary import ITINERARY_CACHE  # noqa: E402
+
+INTERESTS = ["trekking", "food", "culture", "photography", "relaxation", "nature"]
+
+
+def _requests(count: int, duplicates: float) -> list:
+    rng = random.Random(count)
+    destinations = [d["id"] for d in main.DATA_STORE.snapshot().destinations]
+    requests = []
+    for _ in range(count):
+        if requests and rng.random() < duplicates:
+            requests.append(dict(rng.choice(requests)))
+            continue
+        requests.append(
+            {
+                "destination": rng.choice(destinations),
+                "days": rng.randint(1, 7),
+                "budget": rng.choice(["low", "medium", "high"]),
+                "traveler_type": rng.choice(["solo", "couple", "family", "friends"]),
+                "interests": rng.sample(INTERESTS, rng.randint(1, 3)),
+                "optimize_route": rng.random() < 0.3,
+            }
+        )
+    return requests
+
+
+def run(items: int, duplicates: float, worker_counts: list) -> None:
+    client = TestClient(main.app)
+    requests = _requests(items, duplicates)
+
+    ITINERARY_CACHE.clear()
+    start = time.perf_counter()
+    singles = [client.post("/api/itinerary", json=request).json() for request in requests]
+    sequential = time.perf_counter() - start
+    print(
+        f"sequential: {items} calls {sequential * 1000:8.1f} ms"
+        f"  ({items / sequential:7.1f} itineraries/s)"
+    )
+
+    for workers in worker_counts:
+        main.itinerary_batcher.shutdown()
+        main.itinerary_batcher = ItineraryBatcher(main.DATA_STORE, workers=workers)
+        # The first run includes starting the pool; the second reuses it.
+        for pool_state in ("cold", "warm"):
+            ITINERARY_CACHE.clear()
+            start = time.perf_counter()
+            body = client.post("/api/itinerary/batch", json={"requests": requests}).json()
+            elapsed = time.perf_counter() - start
+            for single, result in zip(singles, body["results"]):
+                if result["itinerary"]["days"] != single["days"]:
+                    raise SystemExit(f"workers={workers}: item {result['index']} differs")
+            summary = body["summary"]
+            print(
+                f"batch workers={workers} {pool_state}: {elapsed * 1000:8.1f} ms"
+                f"  ({items / elapsed:7.1f} itineraries/s, {sequential / elapsed:.1f}x)"
+                f"  unique={summary['unique']} built={summary['built']}"
+            )
+    main.itinerary_batcher.shutdown()
+    print(f"batch results identical to single calls ({os.cpu_count()} CPUs)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=400)
+    parser.add_argument("--duplicates", type=float, default=0.25)
+    parser.add_argument("--workers", default=f"0,2,{os.cpu_count() or 1}")
+    args = parser.parse_args()
+    run(args.items, args.duplicates, [int(value) for value in args.workers.split(",")])
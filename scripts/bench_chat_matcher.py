@@ -0,0 +1,90 @@
+"""Benchmark the compiled chat matcher against per-spot substring checks.
+
+Usage: python scripts/bench_chat_matcher.py [--sizes 15,1000,10000] [--messages M]
+
+For each spot count, builds a synthetic destination, compiles its matcher
+(intents, every catalog destination and the spots) and scans the same
+random messages two ways: the old chain of ``in`` checks for each intent
+plus a scan over every spot name and id, and one ``match_message`` pass.
+Checks that both agree on the intents and the detected spot, and reports
+the time per message and the one-off compile time.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.data_loader import DATA_STORE  # noqa: E402
+from backend.services.chat import INTENT_KEYWORDS, compile_matcher, match_message  # noqa: E402
+
+WORDS = "old mall ridge temple lake view falls fort market cafe point trail peak garden".split()
+FILLER = (
+    "is it worth going to {spot} today or should we pick another option given the "
+    "traffic and a chance of rain near the ridge"
+)
+
+
+def _spots(count: int, rng: random.Random):
+    return [
+        {"id": f"spot-{n}", "name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {n}"}
+        for n in range(count)
+    ]
+
+
+def _linear(spots, text: str):
+    intents = {
+        intent
+        for intent, keywords in INTENT_KEYWORDS
+        if any(keyword in text for keyword in keywords)
+    }
+    for position, spot in enumerate(spots):
+        if spot["name"].lower() in text or spot["id"].lower() in text:
+            return intents, position
+    return intents, None
+
+
+def run(sizes, message_count: int) -> None:
+    rng = random.Random(7)
+    destinations = DATA_STORE.snapshot().destinations
+    print(f"{'spots':>7}{'linear':>12}{'matcher':>12}{'speedup':>9}{'compile':>11}")
+    for size in sizes:
+        spots = _spots(size, rng)
+        snapshot = SimpleNamespace(destinations=destinations, spots_for=lambda _: spots)
+        start = time.perf_counter()
+        matcher = compile_matcher(snapshot, {"id": "bench"})
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        messages = [
+            FILLER.format(spot=rng.choice(spots)["name"] if rng.random() < 0.7 else "somewhere").lower()
+            for _ in range(message_count)
+        ]
+        for text in messages:
+            match = match_message(matcher, text)
+            assert (match.intents, match.spot_position) == _linear(spots, text), text
+
+        start = time.perf_counter()
+        for text in messages:
+            _linear(spots, text)
+        linear_us = (time.perf_counter() - start) / message_count * 1e6
+        start = time.perf_counter()
+        for text in messages:
+            match_message(matcher, text)
+        matcher_us = (time.perf_counter() - start) / message_count * 1e6
+        print(
+            f"{size:>7}{linear_us:>10.1f}µs{matcher_us:>10.1f}µs"
+            f"{linear_us / matcher_us:>8.1f}x{compile_ms:>9.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="15,1000,10000")
+    parser.add_argument("--messages", type=int, default=500)
+    args = parser.parse_args()
+    run([int(size) for size in args.sizes.split(",")], args.messages)
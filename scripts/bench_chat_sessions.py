@@ -0,0 +1,101 @@
+"""Exercise the chat session store with many concurrent conversations.
+
+Usage: python scripts/bench_chat_sessions.py [--sessions 20000] [--turns 3] [--max-kb 2048]
+
+Opens ``--sessions`` conversations against a store capped at a tenth of
+that many sessions and ``--max-kb`` of estimated footprint, interleaving
+their turns. Checks that the store stays inside both bounds, that its byte
+accounting matches a recount of the resident sessions, and that follow-up
+turns resolve the earlier turn's spot. Reports the time per turn
+with and without a session and the memory tracemalloc attributes to the
+resident sessions.
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.data_loader import DATA_STORE  # noqa: E402
+from backend.services.chat import ChatService  # noqa: E402
+from backend.services.sessions import SessionStore  # noqa: E402
+
+OPENERS = ["Is Kufri crowded today?", "tell me about jakhu temple", "Is the Mall Road busy?"]
+FOLLOW_UPS = ["is it busy now?", "any alternate option?", "weather this week?"]
+CONTEXT = {"destinationId": "shimla", "interests": ["nature", "food", "culture"]}
+
+
+def _converse(service: ChatService, ids, turns: int, rng: random.Random) -> int:
+    sessions = service.sessions
+    calls = 0
+    for turn in range(turns):
+        rng.shuffle(ids)
+        for session_id in ids:
+            if turn == 0:
+                service.respond(rng.choice(OPENERS), CONTEXT, session_id)
+            else:
+                service.respond(rng.choice(FOLLOW_UPS), None, session_id)
+            calls += 1
+            assert len(sessions) <= sessions.capacity and sessions.bytes <= sessions.max_bytes
+    return calls
+
+
+def run(session_count: int, turns: int, max_kb: int) -> None:
+    rng = random.Random(5)
+    sessions = SessionStore(capacity=max(1, session_count // 10), ttl=3600, max_bytes=max_kb * 1024)
+    service = ChatService(DATA_STORE, sessions)
+    service.respond("warm up", CONTEXT)
+
+    start = time.perf_counter()
+    for _ in range(2000):
+        service.respond(rng.choice(OPENERS), CONTEXT)
+    stateless_us = (time.perf_counter() - start) / 2000 * 1e6
+
+    ids = [f"chat-{n}" for n in range(session_count)]
+    start = time.perf_counter()
+    calls = _converse(service, ids, turns, rng)
+    session_us = (time.perf_counter() - start) / calls * 1e6
+
+    # Same conversations again into an empty store, under tracemalloc.
+    sessions.clear()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    _converse(service, ids, turns, rng)
+    gc.collect()
+    traced = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    resident = [entry[2] for entry in sessions._entries.values()]
+    assert sessions.bytes == sum(session.footprint() for session in resident)
+    service.respond("Is Kufri crowded today?", CONTEXT, "follow-up")
+    reply = service.respond("is it crowded?", None, "follow-up")
+    assert reply.reply.startswith("Kufri"), reply.reply
+
+    stats = sessions.stats()
+    print(f"stateless turn         {stateless_us:8.1f} µs")
+    print(f"session turn           {session_us:8.1f} µs")
+    print(
+        f"resident sessions      {stats['size']:8d} / {stats['capacity']}"
+        f"   evictions {stats['evictions']}"
+    )
+    print(
+        f"accounted bytes        {stats['bytes']:8d} / {stats['maxBytes']}"
+        f"   ({stats['avgSessionBytes']} B/session)"
+    )
+    print(f"tracemalloc growth     {traced:8d} B")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20000)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--max-kb", type=int, default=2048)
+    args = parser.parse_args()
+    run(args.sessions, args.turns, args.max_kb)
@@ -0,0 +1,111 @@
+"""Thundering-herd check for single-flight request coalescing.
+
+Usage: python scripts/bench_coalescing.py [--herd N] [--rounds R]
+
+Fires N identical requests at once, R times with an empty itinerary cache
+each round:
+
+* sync: N threads call ``generate_itinerary_cached`` together (the path
+  the threadpool, batch and LLM fallback use), against N threads calling
+  ``generate_itinerary_local`` with no coalescing;
+* async: N concurrent POST /api/itinerary and GET /api/destination/{slug}
+  through the ASGI app.
+
+Reports how many builds actually ran and the wall time per round.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Barrier
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+
+from backend import main  # noqa: E402
+from backend.data_loader import DATA_STORE  # noqa: E402
+from backend.services.itinerary import (  # noqa: E402
+    ITINERARY_CACHE,
+    ITINERARY_FLIGHTS,
+    ItineraryRequest,
+    generate_itinerary_cached,
+    generate_itinerary_local,
+)
+
+BODY = {
+    "destination": "shimla",
+    "days": 7,
+    "budget": "low",
+    "traveler_type": "solo",
+    "interests": ["trekking", "food"],
+    "optimize_route": True,
+}
+
+
+def _herd(herd: int, rounds: int, build) -> float:
+    request = ItineraryRequest(**BODY)
+    elapsed = 0.0
+    with ThreadPoolExecutor(herd) as pool:
+        for _ in range(rounds):
+            ITINERARY_CACHE.clear()
+            barrier = Barrier(herd)
+
+            def call():
+                barrier.wait()
+                return build(DATA_STORE, request)
+
+            start = time.perf_counter()
+            results = list(pool.map(lambda _: call(), range(herd)))
+            elapsed += time.perf_counter() - start
+            assert all(result.days == results[0].days for result in results)
+    return elapsed / rounds * 1000
+
+
+async def _async_herd(herd: int, rounds: int) -> float:
+    transport = httpx.ASGITransport(app=main.app)
+    elapsed = 0.0
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(rounds):
+            ITINERARY_CACHE.clear()
+            start = time.perf_counter()
+            responses = await asyncio.gather(
+                *(client.post("/api/itinerary", json=BODY) for _ in range(herd)),
+                *(client.get("/api/destination/shimla") for _ in range(herd)),
+            )
+            elapsed += time.perf_counter() - start
+            assert all(response.status_code == 200 for response in responses)
+    return elapsed / rounds * 1000
+
+
+def run(herd: int, rounds: int) -> None:
+    plain_ms = _herd(herd, rounds, generate_itinerary_local)
+    before = ITINERARY_FLIGHTS.stats()
+    coalesced_ms = _herd(herd, rounds, generate_itinerary_cached)
+    after = ITINERARY_FLIGHTS.stats()
+    builds = after["executions"] - before["executions"]
+    print(
+        f"sync  herd={herd}: uncoalesced {plain_ms:8.1f} ms ({herd * rounds} builds)"
+        f"  coalesced {coalesced_ms:8.1f} ms ({builds} builds,"
+        f" {after['coalesced'] - before['coalesced']} shared)"
+    )
+
+    async_ms = asyncio.run(_async_herd(herd, rounds))
+    stats = main.REQUEST_FLIGHTS.stats()
+    print(
+        f"async herd={herd} itinerary + {herd} destination: {async_ms:8.1f} ms per round"
+        f"  ({stats['executions']} computations for {2 * herd * rounds} requests,"
+        f" {stats['coalesced']} coalesced)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--herd", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    run(args.herd, args.rounds)
@@ -0,0 +1,108 @@
+"""Benchmark route-optimized spot days against the fixed slot order.
+
+Usage: python scripts/bench_route.py [--spots N] [--runs R]
+
+Plans every interest combination for 1-7 days over the Shimla spots (or
+N synthetic spots scattered around them) with and without route
+optimization, and reports total travel distance and time per plan. Also
+times the distance-matrix build, vectorized vs pure Python.
+"""
+
+import argparse
+import itertools
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.data_loader import DATA_STORE  # noqa: E402
+from backend.records import Spot  # noqa: E402
+from backend.services import routing  # noqa: E402
+from backend.services.itinerary import (  # noqa: E402
+    ItineraryRequest,
+    RouteMatrix,
+    _build_spot_days,
+    compile_profile,
+)
+
+INTERESTS = ["trekking", "photography", "culture", "nature", "food", "relaxation"]
+
+
+def _synthetic_spots(base, count: int):
+    rng = random.Random(7)
+    spots = []
+    for idx in range(count):
+        template = base[idx % len(base)]
+        spots.append(
+            Spot(
+                {
+                    **template,
+                    "id": f"{template['id']}-{idx}",
+                    "lat": template["lat"] + rng.uniform(-0.05, 0.05),
+                    "lng": template["lng"] + rng.uniform(-0.05, 0.05),
+                }
+            )
+        )
+    return spots
+
+
+def _plan_km(days) -> float:
+    return sum(seg.travelDistanceKm for day in days for seg in day.segments)
+
+
+def main(spot_count: int, runs: int) -> None:
+    snapshot = DATA_STORE.snapshot()
+    destination = snapshot.get_destination("shimla")
+    base = snapshot.spots_for("shimla")
+    spots = _synthetic_spots(base, spot_count) if spot_count else base
+    compiled = compile_profile(destination)
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        route = RouteMatrix(spots)
+    matrix_ms = (time.perf_counter() - start) / runs * 1000
+    numpy_module, routing.np = routing.np, None
+    start = time.perf_counter()
+    RouteMatrix(spots)
+    python_ms = (time.perf_counter() - start) * 1000
+    routing.np = numpy_module
+
+    requests = [
+        ItineraryRequest(
+            destination="shimla",
+            days=days,
+            budget="low",
+            traveler_type="solo",
+            interests=list(combo),
+        )
+        for days in range(1, 8)
+        for combo in itertools.combinations(INTERESTS, 2)
+    ]
+    totals = {}
+    for label, matrix in (("fixed order", None), ("optimized", route)):
+        km = 0.0
+        start = time.perf_counter()
+        for _ in range(runs):
+            for request in requests:
+                days = _build_spot_days(
+                    request, destination, spots, request.interests, [], compiled, matrix
+                )
+                km += _plan_km(days)
+        elapsed = (time.perf_counter() - start) / (runs * len(requests))
+        totals[label] = km / runs
+        print(f"  {label:<12} {km / runs:10.1f} km over {len(requests)} plans  {elapsed * 1e6:8.1f} us/plan")
+    saved = 1 - totals["optimized"] / totals["fixed order"] if totals["fixed order"] else 0.0
+    print(f"  route optimization saves {saved:.1%} of travel distance")
+    vectorized = "numpy" if routing.np is not None else "python (numpy missing)"
+    print(f"  distance matrix for {len(spots)} spots: {matrix_ms:.2f} ms {vectorized}, {python_ms:.2f} ms pure python")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spots", type=int, default=0, help="synthetic spot count (0 = Shimla data)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.spots, args.runs)
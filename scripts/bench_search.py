@@ -0,0 +1,128 @@
+"""Benchmark the BM25 post index on a synthetic feed.
+
+Usage: python scripts/bench_search.py [--posts 500000] [--queries 200]
+
+Generates blog/Instagram-like posts over the catalog's destinations (a
+Zipf-ish vocabulary, so common words have long posting lists), builds a
+``SearchIndex`` and reports build time plus per-query latency (median and
+p95) for global and destination-filtered top-10 queries. First checks the
+index against brute-force BM25 scoring on a small feed, then checks that
+MaxScore-pruned global queries return the same hits as exhaustive scoring.
+"""
+
+import argparse
+import random
+import sys
+import time
+from itertools import accumulate
+from math import log
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend import search  # noqa: E402
+from backend.data_loader import DATA_STORE  # noqa: E402
+from backend.search import FIELD_WEIGHTS, SearchDocument, SearchIndex, tokenize  # noqa: E402
+
+VOCABULARY = [f"word{n}" for n in range(20000)]
+PLACES = ["kufri", "mall", "ridge", "jakhu", "falls", "baga", "fort", "lake", "valley", "market"]
+TAGS = ["hidden-gem", "food", "trekking", "photography", "crowd-update", "nature", "culture"]
+
+
+def _posts(count: int, rng: random.Random):
+    destinations = [destination["id"] for destination in DATA_STORE.snapshot().destinations]
+    cumulative = list(accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+    for n in range(count):
+        words = rng.choices(VOCABULARY, cum_weights=cumulative, k=40) + rng.sample(PLACES, 2)
+        post = {
+            "id": f"post-{n}",
+            "title": " ".join(rng.sample(PLACES, 2)) if n % 3 == 0 else None,
+            "content": " ".join(words),
+            "tags": rng.sample(TAGS, 2),
+            "geoTags": [rng.choice(PLACES).title()],
+        }
+        source = "blog" if n % 3 == 0 else "instagram"
+        yield SearchDocument(source, rng.choice(destinations), post), post
+
+
+def _brute_force(posts, query: str, destination, k: int):
+    lengths, frequencies = [], []
+    for _, post in posts:
+        counts, length = {}, 0.0
+        for name, weight in FIELD_WEIGHTS:
+            value = post.get(name)
+            text = value if isinstance(value, str) else " ".join(value or ())
+            for token in tokenize(text):
+                counts[token] = counts.get(token, 0.0) + weight
+                length += weight
+        lengths.append(length)
+        frequencies.append(counts)
+    average = sum(lengths) / len(posts)
+    scores = []
+    for doc, ((document, _), counts) in enumerate(zip(posts, frequencies)):
+        if destination is not None and document.destination != destination:
+            continue
+        score = 0.0
+        for term in set(tokenize(query)):
+            if term in counts:
+                df = sum(1 for other in frequencies if term in other)
+                idf = log(1 + (len(posts) - df + 0.5) / (df + 0.5))
+                tf = counts[term]
+                norm = search.K1 * (1 - search.B + search.B * lengths[doc] / average)
+                score += idf * tf * (search.K1 + 1) / (tf + norm)
+        if score:
+            scores.append((-score, doc))
+    return [doc for _, doc in sorted(scores)[:k]]
+
+
+def check(rng: random.Random) -> None:
+    posts = list(_posts(2000, rng))
+    index = SearchIndex(posts)
+    ids = {id(document): doc for doc, (document, _) in enumerate(posts)}
+    for query, destination in [("kufri falls word3", None), ("jakhu word10 food", posts[0][0].destination)]:
+        got = [ids[id(hit.document)] for hit in index.search(query, destination, 10)]
+        assert got == _brute_force(posts, query, destination, 10), query
+    print("index matches brute-force BM25 on 2000 posts")
+
+
+def _latencies(index: SearchIndex, queries, destination_for) -> str:
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, destination_for(), 10)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return f"median {timings[len(timings) // 2]:6.2f} ms   p95 {timings[int(len(timings) * 0.95)]:6.2f} ms"
+
+
+def run(post_count: int, query_count: int) -> None:
+    rng = random.Random(11)
+    check(rng)
+    posts = list(_posts(post_count, rng))
+    start = time.perf_counter()
+    index = SearchIndex(posts)
+    print(f"built {len(index)} posts, {len(index.terms)} terms in {time.perf_counter() - start:.1f}s")
+
+    destinations = [destination["id"] for destination in DATA_STORE.snapshot().destinations]
+    queries = [
+        " ".join(rng.sample(PLACES, 1) + rng.sample(VOCABULARY[:200], 2) + rng.sample(TAGS, 1))
+        for _ in range(query_count)
+    ]
+    pruned = [index.search(query, None, 10) for query in queries]
+    threshold, search.PRUNE_MIN_POSTINGS = search.PRUNE_MIN_POSTINGS, float("inf")
+    try:
+        assert pruned == [index.search(query, None, 10) for query in queries]
+    finally:
+        search.PRUNE_MIN_POSTINGS = threshold
+    print("pruned global queries match exhaustive scoring")
+    print(f"global top-10         {_latencies(index, queries, lambda: None)}")
+    print(f"per-destination top-10 {_latencies(index, queries, lambda: rng.choice(destinations))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    run(args.posts, args.queries)
@@ -0,0 +1,89 @@
+"""Benchmark response construction and serialization per 7-day itinerary.
+
+Usage: python scripts/bench_serialization.py [--runs R]
+
+For a spot-backed (Shimla) and a catalog-backed (Goa) itinerary, times:
+
+* plan: building the days and summary (``generate_itinerary_local``);
+* validate: re-running full pydantic validation over the same response,
+  the cost the builders paid before they switched to ``model_construct``;
+* fastapi: what ``response_model=ItineraryResponse`` plus ``JSONResponse``
+  did with a returned model (dump, validate, ``jsonable_encoder``,
+  ``json.dumps``);
+* fast: ``ModelResponse``, pydantic-core straight to bytes.
+
+Both encodings are checked to decode to the same document. The speedup is
+(validate + fastapi) / fast.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from backend.data_loader import DATA_STORE  # noqa: E402
+from backend.services.itinerary import (  # noqa: E402
+    ItineraryRequest,
+    ItineraryResponse,
+    generate_itinerary_local,
+)
+from backend.services.serialization import ModelResponse  # noqa: E402
+
+FIELD = create_model_field("Response_create_itinerary", ItineraryResponse, mode="serialization")
+
+
+def _per_call_us(fn, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    return (time.perf_counter() - start) / runs * 1e6
+
+
+async def _fastapi_us(response: ItineraryResponse, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        content = await serialize_response(field=FIELD, response_content=response)
+        JSONResponse(content)
+    return (time.perf_counter() - start) / runs * 1e6
+
+
+def run(runs: int) -> None:
+    print(f"{'destination':<12}{'plan':>10}{'validate':>11}{'fastapi':>10}{'fast':>9}{'speedup':>9}")
+    for destination in ("shimla", "goa"):
+        request = ItineraryRequest(
+            destination=destination,
+            days=7,
+            budget="medium",
+            traveler_type="couple",
+            interests=["food", "culture", "nature"],
+        )
+        response = generate_itinerary_local(DATA_STORE, request)
+        dumped = response.model_dump()
+
+        old = JSONResponse(asyncio.run(serialize_response(field=FIELD, response_content=response)))
+        assert json.loads(ModelResponse(response).body) == json.loads(old.body)
+
+        plan_us = _per_call_us(lambda: generate_itinerary_local(DATA_STORE, request), runs)
+        validate_us = _per_call_us(lambda: ItineraryResponse.model_validate(dumped), runs)
+        fastapi_us = asyncio.run(_fastapi_us(response, runs))
+        fast_us = _per_call_us(lambda: ModelResponse(response), runs)
+        print(
+            f"{destination:<12}{plan_us:>8.0f}µs{validate_us:>9.0f}µs{fastapi_us:>8.0f}µs"
+            f"{fast_us:>7.0f}µs{(validate_us + fastapi_us) / fast_us:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.runs)
@@ -0,0 +1,121 @@
+"""Check and benchmark the heap spot selector against the reference scan.
+
+Usage: python scripts/bench_spot_selection.py [--cases N] [--sizes 10000,100000]
+
+First verifies that SpotSelector picks exactly what _select_spots_reference
+picks over N random catalogs (ties, duplicate ids, untagged spots, more
+days than spots), then times both on synthetic catalogs of each size.
+"""
+
+import argparse
+import random
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.records import Spot  # noqa: E402
+from backend.spot_columns import SpotColumns  # noqa: E402
+from backend.services.itinerary import (  # noqa: E402
+    TIME_SLOTS,
+    ItineraryRequest,
+    SpotSelector,
+    _select_spots_reference,
+)
+
+TAGS = [
+    "trekking",
+    "photography",
+    "culture",
+    "nature",
+    "food",
+    "relaxation",
+    "Heritage",
+    "shopping",
+]
+FEES = ["Free", "₹50", "Free entry", "₹200"]
+
+
+def _catalog(rng: random.Random, size: int, id_pool: int) -> list:
+    return [
+        Spot(
+            {
+                "id": f"spot-{rng.randrange(id_pool)}",
+                "name": f"Spot {idx}",
+                "lat": 31.0 + rng.random(),
+                "lng": 77.0 + rng.random(),
+                "crowdScore": rng.randint(1, 10),
+                "entryFee": rng.choice(FEES),
+                "isHiddenGem": rng.random() < 0.1,
+                "tags": rng.sample(TAGS, rng.randint(0, 3)),
+            }
+        )
+        for idx in range(size)
+    ]
+
+
+def _request(rng: random.Random, days: int) -> ItineraryRequest:
+    return ItineraryRequest(
+        destination="bench",
+        days=days,
+        budget=rng.choice(["low", "medium", "high"]),
+        traveler_type=rng.choice(["solo", "couple", "family", "friends"]),
+        interests=rng.sample([tag.lower() for tag in TAGS], rng.randint(1, 3)),
+    )
+
+
+def _heap_days(spots, interests, request, columns=None):
+    selector = SpotSelector(spots, interests, request.traveler_type, request.budget, columns)
+    return [
+        [selector.pick(slot_idx) for slot_idx in range(len(TIME_SLOTS))]
+        for _ in range(request.days)
+    ]
+
+
+def check(cases: int) -> None:
+    rng = random.Random(2024)
+    for case in range(cases):
+        size = rng.randint(1, 40)
+        spots = _catalog(rng, size, id_pool=max(1, size - rng.randint(0, 5)))
+        request = _request(rng, rng.randint(1, 7))
+        interests = list(dict.fromkeys(request.interests))
+        expected = _select_spots_reference(spots, interests, request)
+        actual = _heap_days(spots, interests, request)
+        if [[id(s) for s in day] for day in expected] != [[id(s) for s in day] for day in actual]:
+            raise SystemExit(f"case {case}: selections differ ({size} spots, {request})")
+    print(f"equivalence: {cases} random catalogs, identical picks")
+
+
+def bench(size: int) -> None:
+    rng = random.Random(size)
+    spots = _catalog(rng, size, id_pool=size)
+    request = _request(rng, 7)
+    interests = list(dict.fromkeys(request.interests))
+    # Columns are built when the shard loads, not per request.
+    columns = SpotColumns(spots)
+    timings = {}
+    for label, select in (
+        ("reference", _select_spots_reference),
+        ("heap", partial(_heap_days, columns=columns)),
+    ):
+        start = time.perf_counter()
+        select(spots, interests, request)
+        timings[label] = time.perf_counter() - start
+    print(
+        f"{size:>8,} spots, 7 days: reference {timings['reference'] * 1000:9.1f} ms"
+        f"  heap {timings['heap'] * 1000:8.1f} ms"
+        f"  ({timings['reference'] / timings['heap']:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--sizes", default="10000,100000")
+    args = parser.parse_args()
+    check(args.cases)
+    for size in (int(value) for value in args.sizes.split(",")):
+        bench(size)
@@ -0,0 +1,83 @@
+"""Benchmark DataStore cold start: JSON parsing vs a compiled snapshot.
+
+Usage: python scripts/bench_startup.py [--scale N] [--runs R]
+
+Each run is a fresh interpreter importing backend.data_loader and warming
+DATA_STORE, i.e. the cost of a cold start with every collection resident. ``--scale`` writes a temporary data dir where every
+file is replicated N times (ids suffixed) to approximate production volume.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.data_loader import DATA_DIR, SOURCE_FILES  # noqa: E402
+
+PROBE = (
+    "import time; start = time.perf_counter(); "
+    "import backend.data_loader as loader; loader.DATA_STORE.warm(); "
+    "print(time.perf_counter() - start, loader.DATA_STORE.version)"
+)
+
+
+def _scaled_copy(target: Path, scale: int) -> None:
+    for relative in SOURCE_FILES.values():
+        rows = json.loads((DATA_DIR / relative).read_text(encoding="utf-8"))
+        scaled = []
+        for copy in range(scale):
+            for row in rows:
+                clone = dict(row)
+                if copy:
+                    clone["id"] = f"{row['id']}-{copy}"
+                    if "name" in clone:
+                        clone["name"] = f"{row['name']} {copy}"
+                scaled.append(clone)
+        path = target / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(scaled, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def _time_import(data_dir: Path, snapshot: Path, runs: int) -> float:
+    env = {**os.environ, "TRAVEL_DATA_DIR": str(data_dir), "TRAVEL_DATA_SNAPSHOT": str(snapshot)}
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=ROOT, env=env, check=True, capture_output=True, text=True
+        ).stdout.split()
+        samples.append(float(output[0]))
+    return statistics.median(samples)
+
+
+def main(scale: int, runs: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "data"
+        _scaled_copy(data_dir, scale)
+        snapshot = data_dir / "snapshot.bin"
+        env = {**os.environ, "TRAVEL_DATA_DIR": str(data_dir), "TRAVEL_DATA_SNAPSHOT": str(snapshot)}
+        subprocess.run(
+            [sys.executable, str(ROOT / "scripts" / "build_snapshot.py"), str(snapshot)],
+            cwd=ROOT, env=env, check=True, capture_output=True,
+        )
+        json_bytes = sum((data_dir / relative).stat().st_size for relative in SOURCE_FILES.values())
+        snapshot_bytes = snapshot.stat().st_size
+        json_time = _time_import(data_dir, data_dir / "missing.bin", runs)
+        snapshot_time = _time_import(data_dir, snapshot, runs)
+    print(f"scale x{scale}: {json_bytes:,} B of JSON, {snapshot_bytes:,} B snapshot")
+    print(f"  json     {json_time * 1000:8.1f} ms (median of {runs})")
+    print(f"  snapshot {snapshot_time * 1000:8.1f} ms ({json_time / snapshot_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.scale, args.runs)
@@ -0,0 +1,22 @@
+"""Compile the JSON data files into a binary snapshot for fast cold starts.
+
+Usage: python scripts/build_snapshot.py [output]
+
+Defaults to TRAVEL_DATA_SNAPSHOT (DATA_DIR/snapshot.bin). The API adopts the
+snapshot automatically while it matches the JSON sources it was built from.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.data_loader import SNAPSHOT_PATH, DataStore  # noqa: E402
+
+
+if __name__ == "__main__":
+    output = Path(sys.argv[1]) if len(sys.argv) > 1 else SNAPSHOT_PATH
+    store = DataStore(snapshot_path=None)
+    size = store.compile_snapshot(output)
+    print(f"Wrote {size:,} byte snapshot to {output}")
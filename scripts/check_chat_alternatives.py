@@ -0,0 +1,49 @@
+"""Check that chat alternatives never suggest the spot being swapped out.
+
+Usage: python scripts/check_chat_alternatives.py
+
+Asks for an alternate to "Chadwick Falls", a Shimla hidden gem with no
+interests given (the case that used to answer "Swap X for X"), then does
+the same for every Shimla spot.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend import main  # noqa: E402
+
+CONTEXT = {"destinationId": "shimla"}
+
+
+def _check(label: str, condition: bool) -> None:
+    print(f"  {'ok' if condition else 'FAILED'}  {label}")
+    if not condition:
+        raise SystemExit(1)
+
+
+def _alternative(name: str) -> str:
+    response = main.chat_service.respond(f"alternate to {name}", CONTEXT)
+    return response.sources[0]["id"]
+
+
+def run() -> None:
+    spots = main.DATA_STORE.snapshot().spots_for("shimla")
+    by_name = {spot["name"]: spot["id"] for spot in spots}
+    print("alternatives")
+    response = main.chat_service.respond("alternate to Chadwick Falls", CONTEXT)
+    _check(
+        "alternate to Chadwick Falls suggests another spot",
+        response.sources[0]["id"] != by_name["Chadwick Falls"]
+        and "for Chadwick Falls" not in response.reply,
+    )
+    _check(
+        "no Shimla spot is suggested as its own alternative",
+        all(_alternative(name) != spot_id for name, spot_id in by_name.items()),
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,186 @@
+"""Exercise streamed chat replies over NDJSON, SSE and WebSocket.
+
+Usage: python scripts/check_chat_stream.py
+
+Checks, in order: that the default sentence-chunk stream joins back to the
+``/api/chat`` reply with the same sources and confidence; the SSE framing;
+that a slow reader paces a mocked token model instead of letting it run
+ahead; that a client disconnecting mid-reply closes the model; and, over
+the WebSocket, a full reply, ``cancel`` mid-reply, a new message replacing
+the reply in progress and a malformed frame.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend import main  # noqa: E402
+from backend.services.chat import ChatResponse, sentence_chunks  # noqa: E402
+
+REQUEST = {"message": "Is Kufri crowded today?", "context": {"destinationId": "shimla"}}
+
+
+class MockModel:
+    """Streams the grounding reply word by word, recording what it produced."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.produced = 0
+        self.closed = 0
+
+    async def __call__(self, message: str, grounding: ChatResponse):
+        try:
+            for word in grounding.reply.split(" "):
+                await asyncio.sleep(self.delay)
+                self.produced += 1
+                yield word + " "
+        finally:
+            self.closed += 1
+
+
+def _check(label: str, condition: bool) -> None:
+    print(f"  {'ok' if condition else 'FAILED'}  {label}")
+    if not condition:
+        raise SystemExit(1)
+
+
+def check_http(client: TestClient) -> None:
+    reply = client.post("/api/chat", json=REQUEST).json()
+    stream = client.post("/api/chat/stream", json=REQUEST)
+    lines = [json.loads(line) for line in stream.text.splitlines()]
+    deltas = [line["data"]["text"] for line in lines if line["type"] == "delta"]
+    done = lines[-1]
+    _check("several sentence deltas, then done", len(deltas) > 1 and done["type"] == "done")
+    _check(
+        "deltas join back to the /api/chat reply",
+        "".join(deltas) == reply["reply"] == done["data"]["reply"],
+    )
+    _check(
+        "done carries the same sources and confidence",
+        done["data"]["sources"] == reply["sources"]
+        and done["data"]["confidence"] == reply["confidence"],
+    )
+    response = client.post("/api/chat/stream", json=REQUEST, headers={"Accept": "text/event-stream"})
+    _check(
+        "SSE framing when accepted",
+        response.headers["content-type"].startswith("text/event-stream")
+        and response.text.startswith("event: delta\ndata: "),
+    )
+
+
+async def check_backpressure() -> None:
+    model = MockModel()
+    seen = ahead = 0
+    events = main.chat_service.stream(REQUEST["message"], REQUEST["context"], model=model)
+    async for event, _ in events:
+        if event == "delta":
+            seen += 1
+            await asyncio.sleep(0.002)
+            ahead = max(ahead, model.produced - seen)
+    _check("a slow reader paces the model (nothing produced ahead)", ahead == 0 and model.closed == 1)
+
+
+async def check_disconnect() -> None:
+    model = MockModel(delay=0.01)
+    main.chat_service.model = model
+    sent = []
+    body = json.dumps(REQUEST).encode()
+    requests = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop(0)
+        # The client goes away once the first chunk has been sent.
+        while not any(message.get("body") for message in sent):
+            await asyncio.sleep(0.001)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/chat/stream",
+        "raw_path": b"/api/chat/stream",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"host", b"test")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    start = time.perf_counter()
+    await main.app(scope, receive, send)
+    await asyncio.sleep(0.05)
+    words = len(main.chat_service.respond(REQUEST["message"], REQUEST["context"]).reply.split(" "))
+    _check(
+        "disconnect mid-reply closes the model early",
+        model.closed == 1 and model.produced < words and time.perf_counter() - start < words * 0.01,
+    )
+
+
+def _events(socket, until: str):
+    events = []
+    while not events or events[-1]["type"] != until:
+        events.append(json.loads(socket.receive_bytes()))
+    return events
+
+
+def check_websocket(client: TestClient) -> None:
+    model = MockModel(delay=0.02)
+    main.chat_service.model = model
+    with client.websocket_connect("/api/chat/ws") as socket:
+        socket.send_text(json.dumps(REQUEST))
+        events = _events(socket, "done")
+        _check("full reply streamed over the socket", events[-1]["data"]["reply"].startswith("Kufri"))
+
+        socket.send_text(json.dumps(REQUEST))
+        socket.receive_bytes()
+        socket.send_text(json.dumps({"type": "cancel"}))
+        events = _events(socket, "cancelled")
+        _check(
+            "cancel stops the reply and closes the model",
+            model.closed == 2 and all(event["type"] != "done" for event in events),
+        )
+
+        socket.send_text(json.dumps(REQUEST))
+        socket.receive_bytes()
+        socket.send_text(json.dumps(dict(REQUEST, message="road closure?")))
+        _events(socket, "cancelled")
+        events = _events(socket, "done")
+        road = main.chat_service.respond("road closure?", REQUEST["context"]).reply
+        _check(
+            "a new message replaces the reply in progress",
+            events[-1]["data"]["reply"].strip() == road,
+        )
+
+        socket.send_text("not json")
+        _check("malformed frame answered with an error", json.loads(socket.receive_bytes())["type"] == "error")
+        socket.send_text(json.dumps({"context": {}}))
+        _check("invalid request answered with an error", json.loads(socket.receive_bytes())["type"] == "error")
+
+
+def run() -> None:
+    client = TestClient(main.app)
+    print("http")
+    check_http(client)
+    print("pacing and cancellation")
+    asyncio.run(check_backpressure())
+    asyncio.run(check_disconnect())
+    print("websocket")
+    check_websocket(client)
+    main.chat_service.model = sentence_chunks
+
+
+if __name__ == "__main__":
+    run()
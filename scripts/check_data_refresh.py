@@ -0,0 +1,221 @@
+"""Check what a data refresh publishes and what pinned snapshots keep.
+
+Usage: python scripts/check_data_refresh.py
+
+Runs against a temporary copy of data/ with one spot shard. Checks that a
+plain refresh (and ``/api/admin/refresh``) clears hidden gem tags unless
+``keepTags`` is set, and that a request pinned to a snapshot keeps reading
+the spot shard it loaded after the file changes and a refresh publishes
+the new one; a refresh that finds nothing to do must not disturb it either.
+Tagging the same item twice in the SQLite backend must store one tag and
+bump the version once, and opening an older database drops its repeats.
+Tagging one destination must leave other cached itineraries in place.
+A collection first read after its file changed must come from the file,
+not from a compiled snapshot taken before the edit.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+WORKDIR = Path(tempfile.mkdtemp(prefix="travel-data-"))
+shutil.copytree(
+    ROOT / "data", WORKDIR / "data", ignore=shutil.ignore_patterns("*.db", "snapshot.bin")
+)
+os.environ["TRAVEL_DATA_DIR"] = str(WORKDIR / "data")
+os.environ["TRAVEL_DATA_BACKEND"] = "memory"
+sys.path.insert(0, str(ROOT))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend import main  # noqa: E402
+from backend.data_loader import DataStore  # noqa: E402
+from backend.services.itinerary import (  # noqa: E402
+    ITINERARY_CACHE,
+    ItineraryRequest,
+    generate_itinerary_cached,
+    route_matrix,
+)
+from backend.sqlite_store import SQLiteDataStore  # noqa: E402
+
+SHARD = WORKDIR / "data" / "spots" / "goa.json"
+SPOT = {"id": "goa-fort", "name": "Old Fort", "description": "Ramparts.", "tags": ["culture"]}
+
+
+def _check(label: str, condition: bool) -> None:
+    print(f"  {'ok' if condition else 'FAILED'}  {label}")
+    if not condition:
+        raise SystemExit(1)
+
+
+def _write_shard(name: str) -> None:
+    SHARD.write_text(json.dumps([dict(SPOT, name=name)]))
+    # Make sure the stat fingerprint moves even on coarse mtime clocks.
+    stamp = time.time_ns() + 1_000_000_000
+    os.utime(SHARD, ns=(stamp, stamp))
+
+
+def check_tags() -> None:
+    store = main.DATA_STORE
+    client = TestClient(main.app)
+    item = store.snapshot().blog_posts[0]["id"]
+    store.mark_hidden_gem(item)
+    version = store.version
+    _check("a tag is visible before the refresh", bool(store.snapshot().tagged_hidden_gems))
+    store.refresh(keep_tags=True)
+    _check("keep_tags keeps tags", bool(store.snapshot().tagged_hidden_gems))
+    response = client.post("/api/admin/refresh", params={"keepTags": "true"}).json()
+    _check(
+        "?keepTags=true keeps tags",
+        bool(store.snapshot().tagged_hidden_gems) and response["dataVersion"] == version,
+    )
+    response = client.post("/api/admin/refresh").json()
+    _check(
+        "plain /api/admin/refresh clears tags and bumps the version",
+        not store.snapshot().tagged_hidden_gems and response["dataVersion"] == version + 1,
+    )
+
+
+def _check_retag(label: str, store: SQLiteDataStore) -> None:
+    item = store.snapshot().blog_posts[0]["id"]
+    store.mark_hidden_gem(item)
+    version = store.version
+    store.mark_hidden_gem(item)
+    tags = sum(map(len, store.snapshot().tagged_hidden_gems.values()))
+    _check(f"{label}: re-tagging stores one tag", tags == 1)
+    _check(f"{label}: re-tagging keeps the version", store.version == version)
+
+
+def check_duplicate_tags() -> None:
+    path = WORKDIR / "travel.db"
+    _check_retag("sqlite", SQLiteDataStore(path, data_dir=WORKDIR / "data"))
+
+    # A database from before the unique index, holding a repeated tag.
+    with sqlite3.connect(path) as connection:
+        connection.execute("DROP INDEX hidden_gems_item")
+        connection.execute(
+            "INSERT INTO hidden_gems (destination_id, item_id)"
+            " SELECT destination_id, item_id FROM hidden_gems"
+        )
+    store = SQLiteDataStore(path, data_dir=WORKDIR / "data")
+    tags = sum(map(len, store.snapshot().tagged_hidden_gems.values()))
+    _check("sqlite: opening an older database drops repeated tags", tags == 1)
+
+    # Another worker's store notices the write once its poll interval ends.
+    other = SQLiteDataStore(path, data_dir=WORKDIR / "data", poll_interval=0.2)
+    version = other.version
+    store.mark_hidden_gem(store.snapshot().insta_posts[0]["id"])
+    _check("sqlite: the writing store sees its own write at once", store.version == version + 1)
+    _check("sqlite: other stores reuse their snapshot until the poll", other.version == version)
+    time.sleep(0.25)
+    _check("sqlite: other stores see the write after the poll", other.version == version + 1)
+
+
+def _request(destination: str, traveler_type: str = "solo") -> ItineraryRequest:
+    return ItineraryRequest(
+        destination=destination,
+        days=2,
+        budget="medium",
+        traveler_type=traveler_type,
+        interests=["culture"],
+    )
+
+
+def check_tag_caching() -> None:
+    store = main.DATA_STORE
+    snapshot = store.snapshot()
+    post = snapshot.blog_posts[0]
+    tagged = snapshot.get_destination(post.get("destinationId") or post["destination"])["id"]
+    other = next(d["id"] for d in snapshot.destinations if d["id"] != tagged)
+    generate_itinerary_cached(store, _request(tagged))
+    generate_itinerary_cached(store, _request(other))
+
+    store.mark_hidden_gem(post["id"])
+    hits, invalidations = ITINERARY_CACHE.hits, ITINERARY_CACHE.invalidations
+    generate_itinerary_cached(store, _request(other))
+    _check(
+        "tagging keeps other destinations cached",
+        ITINERARY_CACHE.hits == hits + 1 and ITINERARY_CACHE.invalidations == invalidations,
+    )
+    generate_itinerary_cached(store, _request(tagged))
+    _check("the tagged destination is rebuilt", ITINERARY_CACHE.hits == hits + 1)
+    response = generate_itinerary_cached(store, _request(other, " Solo "))
+    _check(
+        "traveler type is normalized in the key and echoed in the summary",
+        ITINERARY_CACHE.hits == hits + 2 and response.summary["travelerType"] == " Solo ",
+    )
+
+
+def check_shared_caches() -> None:
+    first, second = DataStore(snapshot_path=None), DataStore(snapshot_path=None)
+    _check(
+        "stores get distinct catalog versions",
+        first.snapshot().catalog_version != second.snapshot().catalog_version,
+    )
+    destination = first.snapshot().destinations[0]["id"]
+    generate_itinerary_cached(second, _request(destination))
+    generate_itinerary_cached(first, _request(destination))
+    hits = ITINERARY_CACHE.hits
+    generate_itinerary_cached(first, _request(destination))
+    _check("the older store's itineraries are still cached", ITINERARY_CACHE.hits == hits + 1)
+    spots = first.snapshot().spots_for(destination)
+    route = route_matrix(second.snapshot(), destination, spots)
+    _check(
+        "an older snapshot builds its own route",
+        route_matrix(first.snapshot(), destination, spots) is not route,
+    )
+
+
+def check_shards() -> None:
+    SHARD.parent.mkdir(exist_ok=True)
+    _write_shard("Old Fort")
+    store = DataStore(snapshot_path=None)
+    pinned = store.snapshot()
+    _check("shard loads for the pinned snapshot", pinned.spots_for("goa")[0]["name"] == "Old Fort")
+    store.refresh(keep_tags=True)
+    _check("a no-op refresh leaves the pinned shard", pinned.spots_for("goa")[0]["name"] == "Old Fort")
+
+    _write_shard("New Fort")
+    changed = store.refresh(keep_tags=True)
+    _check("the changed shard is reported", changed == ["spots/goa"])
+    _check("the pinned snapshot keeps its shard", pinned.spots_for("goa")[0]["name"] == "Old Fort")
+    latest = store.snapshot()
+    _check("the new snapshot reads the new file", latest.spots_for("goa")[0]["name"] == "New Fort")
+
+
+def check_compiled_sources() -> None:
+    compiled = WORKDIR / "snapshot.bin"
+    DataStore(snapshot_path=None).compile_snapshot(compiled)
+    store = DataStore(snapshot_path=compiled)
+    alerts_file = WORKDIR / "data" / "scraped" / "alerts.json"
+    alerts = json.loads(alerts_file.read_text())
+    alerts.append(dict(alerts[0], id="alert-check-refresh", title="Check refresh"))
+    alerts_file.write_text(json.dumps(alerts))
+    store.refresh(keep_tags=True)
+    titles = [alert["title"] for alert in store.snapshot().alerts]
+    _check("an unread collection edited after startup loads the file", "Check refresh" in titles)
+
+
+def run() -> None:
+    try:
+        print("hidden gem tags")
+        check_tags()
+        check_duplicate_tags()
+        check_tag_caching()
+        check_shared_caches()
+        print("spot shards")
+        check_shards()
+        print("compiled snapshot")
+        check_compiled_sources()
+    finally:
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run()
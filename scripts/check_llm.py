@@ -0,0 +1,175 @@
+"""Exercise the async LLM itinerary path against the local mock server.
+
+Usage: python scripts/check_llm.py
+
+Starts scripts/mock_llm_server.py in-process and checks, in order: a
+normal completion, retries through 503s, the hedged local fallback when
+the deadline is missed (and that it comes back at the deadline, not after
+the upstream finishes), the unhedged error, that the concurrency
+limit holds under a burst of requests, and the persistent response cache
+(synonym/order-insensitive hits, surviving a restart, LRU eviction, no
+stray local plan when the lookup fails, and keys that move with the spots
+and alerts in the prompt).
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from mock_llm_server import MockLLMServer  # noqa: E402
+
+from backend.data_loader import DATA_STORE  # noqa: E402
+from backend.services.itinerary import (  # noqa: E402
+    ItineraryRequest,
+    _llm_messages,
+    generate_itinerary_local,
+    generate_itinerary_with_llm,
+    llm_cache_key,
+)
+from backend.services.llm import LLMClient, LLMError  # noqa: E402
+from backend.services.llm_cache import LLMResponseCache  # noqa: E402
+
+REQUEST = ItineraryRequest(
+    destination="shimla",
+    days=3,
+    budget="low",
+    traveler_type="solo",
+    interests=["trekking", "food"],
+    use_llm=True,
+)
+
+
+def _check(label: str, condition: bool) -> None:
+    print(f"  {'ok' if condition else 'FAILED'}  {label}")
+    if not condition:
+        raise SystemExit(1)
+
+
+async def check_client(server: MockLLMServer) -> None:
+    local = generate_itinerary_local(DATA_STORE, REQUEST)
+
+    client = LLMClient(api_key="test", base_url=server.base_url, deadline=2.0)
+    response = await generate_itinerary_with_llm(DATA_STORE, REQUEST, client, cache=None)
+    _check("completion served", response.summary["generator"] == "llm")
+    _check("one LLM day per requested day", len(response.days) == REQUEST.days)
+    _check("summary kept from the local plan", response.summary["budget"] == local.summary["budget"])
+
+    server.reset(fail_first=2)
+    response = await generate_itinerary_with_llm(DATA_STORE, REQUEST, client, cache=None)
+    _check("two 503s retried, then served", response.summary["generator"] == "llm")
+    _check("three attempts reached the server", server.requests == 3)
+
+    server.reset(latency=1.0)
+    slow = LLMClient(api_key="test", base_url=server.base_url, deadline=0.3)
+    start = time.perf_counter()
+    response = await generate_itinerary_with_llm(
+        DATA_STORE, REQUEST, slow, hedge=True, cache=None
+    )
+    elapsed = time.perf_counter() - start
+    _check("hedged: local plan served on a missed deadline", response.summary["generator"] == "local")
+    _check("hedged: local days match", response.days == local.days)
+    _check(f"hedged: answered at the deadline ({elapsed:.2f}s)", elapsed < 0.6)
+
+    try:
+        await generate_itinerary_with_llm(DATA_STORE, REQUEST, slow, hedge=False, cache=None)
+        _check("unhedged: deadline raises LLMError", False)
+    except LLMError:
+        _check("unhedged: deadline raises LLMError", True)
+
+    server.reset(latency=0.05)
+    limited = LLMClient(api_key="test", base_url=server.base_url, deadline=10.0, concurrency=4)
+    start = time.perf_counter()
+    responses = await asyncio.gather(
+        *(
+            generate_itinerary_with_llm(DATA_STORE, REQUEST, limited, cache=None)
+            for _ in range(20)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    _check("burst of 20 all served", all(r.summary["generator"] == "llm" for r in responses))
+    _check(f"at most 4 in flight upstream (saw {server.max_in_flight})", server.max_in_flight <= 4)
+    _check(f"burst queued into 5 waves ({elapsed:.2f}s)", elapsed >= 0.25)
+
+    for each in (client, slow, limited):
+        await each.aclose()
+
+
+async def check_cache(server: MockLLMServer, path: Path) -> None:
+    client = LLMClient(api_key="test", base_url=server.base_url, deadline=2.0)
+    cache = LLMResponseCache(path, capacity=2, ttl=3600)
+    server.reset()
+    first = await generate_itinerary_with_llm(DATA_STORE, REQUEST, client, cache=cache)
+    variant = REQUEST.model_copy(update={"interests": ["Food", "trek", "hiking"]})
+    second = await generate_itinerary_with_llm(DATA_STORE, variant, client, cache=cache)
+    _check("miss goes upstream", first.summary["llmSource"] == "upstream")
+    _check("reordered synonyms hit the cache", second.summary["llmSource"] == "cache")
+    _check("cached days served", second.days == first.days)
+    _check("summary echoes the caller's interests", second.summary["interests"] == variant.interests)
+    _check("one upstream call for both", server.requests == 1)
+
+    restarted = LLMResponseCache(path, capacity=2, ttl=3600)
+    third = await generate_itinerary_with_llm(DATA_STORE, REQUEST, client, cache=restarted)
+    _check("hit survives a restart", third.summary["llmSource"] == "cache")
+
+    for destination in ("goa", "manali"):
+        other = REQUEST.model_copy(update={"destination": destination})
+        await generate_itinerary_with_llm(DATA_STORE, other, client, cache=restarted)
+    fourth = await generate_itinerary_with_llm(DATA_STORE, REQUEST, client, cache=restarted)
+    stats = restarted.stats()
+    _check("least recently used entry evicted at capacity", fourth.summary["llmSource"] == "upstream")
+    _check(f"hit rate reported ({stats['hitRate']})", stats["hits"] == 1 and stats["size"] == 2)
+
+    class BrokenCache(LLMResponseCache):
+        def get(self, key: str) -> None:
+            raise OSError("disk I/O error")
+
+    tasks = len(asyncio.all_tasks())
+    try:
+        await generate_itinerary_with_llm(
+            DATA_STORE, REQUEST, client, cache=BrokenCache(path, capacity=2, ttl=3600)
+        )
+    except OSError:
+        pass
+    _check("a failed cache lookup leaves no local plan running", len(asyncio.all_tasks()) == tasks)
+    await client.aclose()
+
+
+def _with_trip(messages: list, **changes: object) -> list:
+    trip = {**json.loads(messages[-1]["content"]), **changes}
+    return messages[:-1] + [{**messages[-1], "content": json.dumps(trip, ensure_ascii=False)}]
+
+
+def check_cache_key() -> None:
+    snapshot = DATA_STORE.snapshot()
+    destination = snapshot.get_destination(REQUEST.destination)
+    messages = _llm_messages(snapshot, REQUEST, destination)
+    trip = json.loads(messages[-1]["content"])
+    def key(**changes: object) -> str:
+        return llm_cache_key(destination, _with_trip(messages, **changes), "model")
+
+    original = llm_cache_key(destination, messages, "model")
+    _check("same prompt, same key", key() == original)
+    _check("reordered spots change the key", key(spots=trip["spots"][::-1]) != original)
+    _check("a new alert changes the key", key(alerts=trip["alerts"] + ["Landslide"]) != original)
+
+
+async def run(server: MockLLMServer) -> None:
+    await check_client(server)
+    with tempfile.TemporaryDirectory() as tmp:
+        await check_cache(server, Path(tmp) / "llm_cache.db")
+    check_cache_key()
+
+
+if __name__ == "__main__":
+    mock = MockLLMServer().start()
+    print(f"mock LLM at {mock.base_url}")
+    asyncio.run(run(mock))
+    mock.shutdown()
+    print("LLM path checks passed")
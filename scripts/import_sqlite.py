@@ -0,0 +1,29 @@
+"""Import the JSON data files into the SQLite backend database.
+
+Usage: python scripts/import_sqlite.py [database] [--force]
+
+Defaults to TRAVEL_DATA_DB (DATA_DIR/travel.db). Only files whose content
+changed since the last import are loaded; ``--force`` reloads everything and
+clears hidden gem tags. Serve it with TRAVEL_DATA_BACKEND=sqlite.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.data_loader import DATABASE_PATH  # noqa: E402
+from backend.sqlite_store import SQLiteDataStore  # noqa: E402
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("database", nargs="?", type=Path, default=DATABASE_PATH)
+    parser.add_argument("--force", action="store_true", help="re-import every file")
+    args = parser.parse_args()
+    store = SQLiteDataStore(args.database, auto_import=False)
+    changed = store.import_json(force=args.force)
+    print(f"Imported {', '.join(changed) or 'nothing (up to date)'} into {args.database}")
+    print(f"Data version {store.version}: {store.stats()['rows']}")
@@ -0,0 +1,74 @@
+"""Compare per-collection memory of plain dicts vs slotted records.
+
+Usage: python scripts/memory_report.py [--scale N]
+
+Each collection is parsed from DATA_DIR and measured twice with tracemalloc:
+once as the json.load dicts the store used to hold, once as record objects.
+``--scale`` parses each file N times to approximate a larger feed.
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.data_loader import DATA_DIR, RECORD_TYPES, SOURCE_FILES  # noqa: E402
+
+
+def _measure(build: Callable[[], List[Any]]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        held = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del held
+    return size
+
+
+def report(scale: int) -> None:
+    print(f"{'collection':<14}{'records':>9}{'dict B':>12}{'record B':>12}{'B/rec before':>14}{'B/rec after':>13}{'saved':>8}")
+    total_before = total_after = 0
+    for name, relative in SOURCE_FILES.items():
+        raw = (DATA_DIR / relative).read_bytes()
+        record_type = RECORD_TYPES[name]
+        count = len(json.loads(raw)) * scale
+
+        def as_dicts() -> List[Any]:
+            rows: List[Any] = []
+            for _ in range(scale):
+                rows.extend(json.loads(raw))
+            return rows
+
+        def as_records() -> List[Any]:
+            rows: List[Any] = []
+            for _ in range(scale):
+                rows.extend(record_type.from_list(json.loads(raw)))
+            return rows
+
+        before = _measure(as_dicts)
+        after = _measure(as_records)
+        total_before += before
+        total_after += after
+        print(
+            f"{name:<14}{count:>9}{before:>12,}{after:>12,}"
+            f"{before // max(count, 1):>14,}{after // max(count, 1):>13,}"
+            f"{1 - after / before:>8.0%}"
+        )
+    print(f"{'total':<14}{'':>9}{total_before:>12,}{total_after:>12,}{'':>27}{1 - total_after / total_before:>8.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1, help="parse each file N times")
+    args = parser.parse_args()
+    report(args.scale)
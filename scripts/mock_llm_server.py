@@ -0,0 +1,142 @@
+"""Local stand-in for an OpenAI-compatible chat completions endpoint.
+
+Usage: python scripts/mock_llm_server.py [--port 8100] [--latency S] [--fail-first N]
+
+Answers POST /v1/chat/completions with a JSON itinerary built from the
+trip in the last user message (one segment per time slot, cycling through
+the offered spots). ``--latency`` delays every reply and ``--fail-first``
+makes the first N requests return 503, for exercising deadlines and
+retries. Point the backend at it with
+TRAVEL_LLM_BASE_URL=http://127.0.0.1:8100/v1 and any OPENAI_API_KEY.
+"""
+
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from typing import Any, Dict
+
+SLOTS = [("Morning", "08:00", 3.0), ("Afternoon", "13:00", 3.0), ("Evening", "18:00", 2.5)]
+
+
+def mock_itinerary(trip: Dict[str, Any]) -> Dict[str, Any]:
+    spots = trip.get("spots") or [{"id": "mock-spot", "name": "Old town", "lat": 0.0, "lng": 0.0}]
+    days = []
+    for day in range(trip["days"]):
+        segments = []
+        for slot_idx, (slot, start, duration) in enumerate(SLOTS):
+            spot = spots[(day * len(SLOTS) + slot_idx) % len(spots)]
+            segments.append(
+                {
+                    "timeOfDay": slot,
+                    "startTime": start,
+                    "durationHours": duration,
+                    "spotId": spot["id"],
+                    "title": spot["name"],
+                    "description": f"{slot} at {spot['name']}.",
+                    "coordinates": {"lat": spot["lat"], "lng": spot["lng"]},
+                    "entryFee": spot.get("entryFee", "Free"),
+                    "travelDistanceKm": 0.0 if slot_idx == 0 else 2.0,
+                    "travelSuggestion": "Short cab hop",
+                    "foodStop": "Local dhaba",
+                    "interestMatchScore": 8,
+                    "notes": "Planned by the mock LLM.",
+                }
+            )
+        days.append(
+            {
+                "day": day + 1,
+                "theme": f"Day {day + 1} in {trip['destination']}",
+                "segments": segments,
+                "whyPlan": {"costEstimate": trip["budget"], "safety": "No alerts"},
+            }
+        )
+    return {"days": days}
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0, fail_first: int = 0) -> None:
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.fail_first = fail_first
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def start(self) -> "MockLLMServer":
+        Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def reset(self, latency: float = 0.0, fail_first: int = 0) -> None:
+        """New settings and counters, once replies abandoned by clients finish."""
+        while self.in_flight:
+            time.sleep(0.01)
+        with self.lock:
+            self.latency, self.fail_first = latency, fail_first
+            self.requests = self.max_in_flight = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockLLMServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _reply(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except ConnectionError:
+            pass  # the client gave up (deadline) before the reply was ready
+
+    def do_POST(self) -> None:
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            failing = server.requests <= server.fail_first
+        try:
+            time.sleep(server.latency)
+            if not self.path.endswith("/chat/completions"):
+                self._reply(404, {"error": "not found"})
+            elif failing:
+                self._reply(503, {"error": {"message": "mock overload"}})
+            else:
+                trip = json.loads(request["messages"][-1]["content"])
+                content = json.dumps(mock_itinerary(trip))
+                self._reply(
+                    200,
+                    {
+                        "model": request.get("model"),
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                    },
+                )
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--fail-first", type=int, default=0)
+    args = parser.parse_args()
+    server = MockLLMServer(args.port, args.latency, args.fail_first)
+    print(f"mock LLM listening on {server.base_url}")
+    server.serve_forever()